@@ -0,0 +1,210 @@
+"""
+Headless performance benchmark.
+
+Seeds a throwaway database with populate_dummy_data (N years, fixed seed),
+then times every zero-argument model getter, every view's construction and
+load_data/refresh_data, and the database-level read paths. Results are
+appended to bench_output.txt with the commit hash so runs can be compared
+across commits. Model and view timings need database.manager; without it
+they are skipped and the database-level timings still run.
+
+    QT_QPA_PLATFORM=offscreen python benchmark.py --years 10 --scale 5
+"""
+import argparse
+import importlib
+import inspect
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from PyQt6.QtWidgets import QApplication
+
+
+BENCH_DB = "bench_ledger.db"
+BENCH_OUTPUT = "bench_output.txt"
+
+MODELS = [
+    ("models.transaction", "TransactionModel"),
+    ("models.finance", "AssetModel"),
+    ("models.finance", "LoanModel"),
+    ("models.finance", "SavingsModel"),
+    ("models.finance", "InsuranceModel"),
+    ("models.inventory", "InventoryModel"),
+    ("models.person", "PersonModel"),
+    ("models.automation", "AutomationModel"),
+    ("models.event", "EventModel"),
+    ("models.goal", "GoalModel"),
+    ("models.health", "HealthModel"),
+    ("models.fitness", "FitnessModel"),
+    ("models.digital_life", "DigitalSubscriptionModel"),
+    ("models.digital_life", "DigitalAccountModel"),
+    ("models.digital_life", "DigitalAssetModel"),
+]
+
+VIEWS = [
+    ("ui.views.dashboard_view", "DashboardView"),
+    ("ui.views.finance_view", "FinanceView"),
+    ("ui.views.inventory_view", "InventoryView"),
+    ("ui.views.time_view", "TimeView"),
+    ("ui.views.project_view", "ProjectView"),
+    ("ui.views.library_view", "LibraryView"),
+    ("ui.views.vault_view", "VaultView"),
+    ("ui.views.meal_view", "MealView"),
+    ("ui.views.digital_life_view", "DigitalLifeView"),
+    ("ui.views.health_view", "HealthView"),
+    ("ui.views.fitness_view", "FitnessView"),
+    ("ui.views.people_view", "PeopleView"),
+    ("ui.views.goal_view", "GoalView"),
+    ("ui.views.insights_view", "InsightsView"),
+    ("ui.views.event_view", "EventView"),
+    ("ui.views.settings_view", "SettingsView"),
+]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Timings:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+
+    def time(self, label, fn, *args):
+        """Best of `repeat` runs, in ms. Failures are recorded, not raised."""
+        best = None
+        try:
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                fn(*args)
+                elapsed = (time.perf_counter() - start) * 1000
+                best = elapsed if best is None else min(best, elapsed)
+        except Exception as e:
+            print(f"[FAIL] {label}: {e}")
+            self.results.append((label, None))
+            return
+        print(f"[PASS] {label}: {best:.1f} ms")
+        self.results.append((label, best))
+
+
+def _load(module_name, class_name):
+    try:
+        return getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as e:
+        print(f"[SKIP] {module_name}.{class_name}: {e}")
+        return None
+
+
+def _zero_arg_getters(obj):
+    for name, method in inspect.getmembers(obj, inspect.ismethod):
+        if not name.startswith("get_"):
+            continue
+        params = inspect.signature(method).parameters.values()
+        if all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params):
+            yield name, method
+
+
+def bench_models(db, timings):
+    for module_name, class_name in MODELS:
+        cls = _load(module_name, class_name)
+        if cls is None:
+            continue
+        model = cls(db)
+        for name, method in _zero_arg_getters(model):
+            timings.time(f"model {class_name}.{name}", method)
+
+
+def bench_views(db, timings):
+    for module_name, class_name in VIEWS:
+        cls = _load(module_name, class_name)
+        if cls is None:
+            continue
+        views = []
+        timings.time(f"view {class_name}()", lambda: views.append(cls(db)))
+        if not views:
+            continue
+        view = views[-1]
+        for method in ("load_data", "refresh_data"):
+            if hasattr(view, method):
+                timings.time(f"view {class_name}.{method}", getattr(view, method))
+
+
+def bench_database(db_path, timings):
+    import sqlite3
+
+    from database import aggregates, depreciation, search, timeseries
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    depreciation.register(conn)
+    timings.time("db aggregates.monthly_totals", aggregates.monthly_totals, conn)
+    timings.time("db aggregates.category_totals", aggregates.category_totals, conn,
+                 datetime.now().strftime("%Y-01"))
+    timings.time("db depreciation.total_value", depreciation.total_value, conn)
+    timings.time("db search 'coffee'", search.search, conn, "coffee")
+    timings.time("db timeseries Weight (lttb)", timeseries.get_series, conn, "Weight")
+    conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time model getters and view loads on seeded data.")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db", default=BENCH_DB, help="throwaway database to seed")
+    parser.add_argument("--output", default=BENCH_OUTPUT, help="file the results are appended to")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded database afterwards")
+    args = parser.parse_args(argv)
+
+    print(">>> STARTING BENCHMARK <<<")
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    import populate_dummy_data
+    from database.migrations import migrate
+
+    start = time.perf_counter()
+    populate_dummy_data.main(args.db, years=args.years, scale=args.scale, seed=args.seed)
+    seed_seconds = time.perf_counter() - start
+
+    import sqlite3
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    conn.close()
+
+    timings = Timings(args.repeat)
+    DatabaseManager = _load("database.manager", "DatabaseManager")
+    if DatabaseManager is not None:
+        db = DatabaseManager(args.db)
+        bench_models(db, timings)
+        bench_views(db, timings)
+    bench_database(args.db, timings)
+
+    header = (
+        f"== benchmark {datetime.now().isoformat(timespec='seconds')} rev {git_revision()} "
+        f"(years={args.years} scale={args.scale} seed={args.seed}, seeded in {seed_seconds:.1f} s)"
+    )
+    lines = [header]
+    for label, ms in timings.results:
+        lines.append(f"{label:60s} {'FAILED' if ms is None else f'{ms:9.1f} ms'}")
+    with open(args.output, "a") as f:
+        f.write("\n".join(lines) + "\n")
+
+    print(">>> BENCHMARK COMPLETE <<<")
+    if not args.keep and os.path.exists(args.db):
+        os.remove(args.db)
+    app.quit()
+    return timings.results
+
+
+if __name__ == "__main__":
+    main()
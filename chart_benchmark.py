@@ -0,0 +1,83 @@
+"""
+Headless chart refresh benchmark.
+
+Compares the old refresh pattern (clear the figure, rebuild axes and artists,
+full draw) with ChartCanvas' in-place updates for each chart type, and
+appends the per-refresh latency to bench_output.txt.
+
+    QT_QPA_PLATFORM=offscreen python chart_benchmark.py
+"""
+import random
+import sys
+import time
+from datetime import datetime
+
+from PyQt6.QtWidgets import QApplication
+
+
+REFRESHES = 30
+LINE_POINTS = 365
+BAR_COUNT = 12
+
+
+def _line_data():
+    xs = list(range(LINE_POINTS))
+    return xs, [random.uniform(50, 150) for _ in xs]
+
+
+def _bar_data():
+    return [f"C{i}" for i in range(BAR_COUNT)], [random.uniform(0, 1000) for _ in range(BAR_COUNT)]
+
+
+def bench_rebuild(canvas, kind):
+    start = time.perf_counter()
+    for _ in range(REFRESHES):
+        canvas.figure.clear()
+        ax = canvas.figure.add_subplot(111)
+        if kind == "line":
+            ax.plot(*_line_data())
+        else:
+            labels, heights = _bar_data()
+            ax.bar(range(len(heights)), heights)
+            ax.set_xticks(range(len(labels)))
+            ax.set_xticklabels(labels)
+        canvas.draw()
+    return (time.perf_counter() - start) / REFRESHES * 1000
+
+
+def bench_in_place(canvas, kind):
+    start = time.perf_counter()
+    for _ in range(REFRESHES):
+        if kind == "line":
+            canvas.set_line("series", *_line_data())
+        else:
+            canvas.set_bars("series", *_bar_data())
+        canvas.refresh(force=True)
+        canvas.draw()
+    return (time.perf_counter() - start) / REFRESHES * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    from ui.components.chart_canvas import ChartCanvas
+
+    lines = [f"== charts {datetime.now().isoformat(timespec='seconds')} ({REFRESHES} refreshes)"]
+    for kind in ("line", "bar"):
+        before = bench_rebuild(ChartCanvas(), kind)
+        after = bench_in_place(ChartCanvas(), kind)
+        lines.append(f"{kind:5s} rebuild {before:7.1f} ms/refresh   in-place {after:7.1f} ms/refresh")
+
+    hidden = ChartCanvas()
+    hidden.set_line("series", *_line_data())
+    skipped = not hidden.refresh()
+    lines.append(f"hidden chart refresh skipped: {skipped}")
+
+    report = "\n".join(lines)
+    print(report)
+    with open("bench_output.txt", "a") as f:
+        f.write(report + "\n")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
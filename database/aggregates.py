@@ -0,0 +1,145 @@
+"""
+Monthly transaction aggregates.
+
+transaction_monthly_totals holds SUM(amount) and COUNT(*) per
+(month, category, type). Triggers on transactions keep it in step with every
+insert, update and delete, so dashboard totals, insights charts and
+budget-vs-actual read a handful of rows per month instead of scanning the
+whole ledger.
+
+Rebuild an existing database from scratch with:
+
+    python -m database.aggregates life_ledger.db
+"""
+import sqlite3
+import sys
+
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS transaction_monthly_totals (
+        month TEXT NOT NULL,        -- 'YYYY-MM'
+        category TEXT NOT NULL,
+        type TEXT NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (month, category, type)
+    ) WITHOUT ROWID""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO transaction_monthly_totals (month, category, type, total, count)
+        VALUES (substr(NEW.date, 1, 7), NEW.category, NEW.type, NEW.amount, 1)
+        ON CONFLICT (month, category, type) DO UPDATE
+        SET total = total + excluded.total, count = count + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        UPDATE transaction_monthly_totals
+        SET total = total - OLD.amount, count = count - 1
+        WHERE month = substr(OLD.date, 1, 7) AND category = OLD.category AND type = OLD.type;
+        DELETE FROM transaction_monthly_totals
+        WHERE month = substr(OLD.date, 1, 7) AND category = OLD.category AND type = OLD.type
+          AND count <= 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_update
+    AFTER UPDATE OF date, amount, category, type ON transactions
+    BEGIN
+        UPDATE transaction_monthly_totals
+        SET total = total - OLD.amount, count = count - 1
+        WHERE month = substr(OLD.date, 1, 7) AND category = OLD.category AND type = OLD.type;
+        DELETE FROM transaction_monthly_totals
+        WHERE month = substr(OLD.date, 1, 7) AND category = OLD.category AND type = OLD.type
+          AND count <= 0;
+        INSERT INTO transaction_monthly_totals (month, category, type, total, count)
+        VALUES (substr(NEW.date, 1, 7), NEW.category, NEW.type, NEW.amount, 1)
+        ON CONFLICT (month, category, type) DO UPDATE
+        SET total = total + excluded.total, count = count + 1;
+    END""",
+]
+
+
+def create_schema(conn):
+    """Create the summary table and its triggers, then fill it from transactions."""
+    for sql in SCHEMA:
+        conn.execute(sql)
+    _refill(conn)
+
+
+def _refill(conn):
+    conn.execute("DELETE FROM transaction_monthly_totals")
+    conn.execute("""
+        INSERT INTO transaction_monthly_totals (month, category, type, total, count)
+        SELECT substr(date, 1, 7), category, type, SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY substr(date, 1, 7), category, type
+    """)
+
+
+def rebuild_monthly_totals(conn):
+    """Recompute every aggregate row from transactions in one transaction."""
+    with conn:
+        _refill(conn)
+
+
+def monthly_totals(conn, start_month=None, end_month=None):
+    """
+    Income/expense totals per month: [{'month', 'income', 'expense', 'count'}].
+
+    Months are 'YYYY-MM' strings; both bounds are inclusive and optional.
+    """
+    query = """
+        SELECT month,
+               SUM(CASE WHEN type = 'INCOME' THEN total ELSE 0 END) AS income,
+               SUM(CASE WHEN type = 'EXPENSE' THEN total ELSE 0 END) AS expense,
+               SUM(count) AS count
+        FROM transaction_monthly_totals
+        WHERE month >= ? AND month <= ?
+        GROUP BY month
+        ORDER BY month
+    """
+    rows = conn.execute(query, (start_month or "0000-00", end_month or "9999-99")).fetchall()
+    return [
+        {"month": month, "income": income, "expense": expense, "count": count}
+        for month, income, expense, count in rows
+    ]
+
+
+def category_totals(conn, start_month, end_month=None, trans_type="EXPENSE"):
+    """{category: total} for one type over a month range (inclusive)."""
+    query = """
+        SELECT category, SUM(total)
+        FROM transaction_monthly_totals
+        WHERE type = ? AND month >= ? AND month <= ?
+        GROUP BY category
+        ORDER BY SUM(total) DESC
+    """
+    rows = conn.execute(query, (trans_type, start_month, end_month or start_month))
+    return {category: total for category, total in rows}
+
+
+def budget_vs_actual(conn, month):
+    """[{'category', 'limit', 'spent', 'remaining'}] for every budget in `month`."""
+    query = """
+        SELECT b.category, b.monthly_limit, COALESCE(t.total, 0)
+        FROM budgets b
+        LEFT JOIN transaction_monthly_totals t
+          ON t.category = b.category AND t.type = 'EXPENSE' AND t.month = ?
+        ORDER BY b.category
+    """
+    return [
+        {"category": category, "limit": limit, "spent": spent, "remaining": limit - spent}
+        for category, limit, spent in conn.execute(query, (month,))
+    ]
+
+
+if __name__ == "__main__":
+    from database.migrations import migrate
+
+    for path in sys.argv[1:] or ["life_ledger.db"]:
+        conn = sqlite3.connect(path)
+        migrate(conn)
+        rebuild_monthly_totals(conn)
+        count = conn.execute("SELECT COUNT(*) FROM transaction_monthly_totals").fetchone()[0]
+        conn.close()
+        print(f"{path}: rebuilt {count} monthly aggregate rows")
@@ -0,0 +1,190 @@
+"""
+Due-date alerts for everything in the ledger that renews, expires or is due.
+
+upcoming_items is one view over subscription renewals, digital asset and
+insurance renewals, loan and debt due dates, document and pantry expiry and
+contact birthdays, with a notify_days lead time per kind. Every branch has a
+(partial) index on its date column and SQLite pushes the due_date filter
+into each branch, so "what is coming up" is a handful of index range scans:
+
+    SELECT * FROM upcoming_items WHERE due_date BETWEEN ? AND ? ORDER BY due_date
+
+AlertScheduler keeps the pending notifications in a heap ordered by the day
+they should fire, so a caller (ui.components.alert_timer) only has to wake
+up when the earliest one is due. Alerts are written to system_alerts with a
+dedup_key under a unique index, so restarts and reloads never repeat one.
+"""
+import heapq
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+
+
+# (table, kind, title expr, due date expr, notify days, extra condition)
+SOURCES = [
+    ("digital_subscriptions", "Subscription renewal", "name", "next_renewal", 7, "is_active = 1"),
+    ("digital_assets", "Asset renewal", "name", "renewal_date", 30, "is_active = 1"),
+    ("insurance", "Insurance renewal", "name", "renewal_date", 30, None),
+    ("loans", "Loan payment due", "name", "due_date", 7, None),
+    ("debts", "Debt due", "COALESCE(description, 'Debt')", "due_date", 3, "is_settled = 0"),
+    ("documents", "Document expiry", "name", "expiry_date", 30, None),
+    ("pantry_items", "Pantry item expiry", "name", "expiry_date", 2, None),
+]
+
+# Birthdays recur: the due date is the next anniversary, computed per row.
+# Contacts are few, so this branch is a plain scan.
+_NEXT_BIRTHDAY = (
+    "CASE WHEN date(strftime('%Y', 'now', 'localtime') || substr(birthday, 5)) >= date('now', 'localtime') "
+    "THEN date(strftime('%Y', 'now', 'localtime') || substr(birthday, 5)) "
+    "ELSE date((strftime('%Y', 'now', 'localtime') + 1) || substr(birthday, 5)) END"
+)
+BIRTHDAY_NOTIFY_DAYS = 7
+
+
+def _index_sql(table, due, condition):
+    where = f" WHERE {condition}" if condition else ""
+    return f"CREATE INDEX IF NOT EXISTS idx_{table}_{due}_upcoming ON {table} ({due}){where}"
+
+
+def _branch_sql(table, kind, title, due, notify_days, condition):
+    where = f"{due} IS NOT NULL AND {due} != ''"
+    if condition:
+        where += f" AND {condition}"
+    return (f"SELECT '{table}' AS source_table, id AS source_id, '{kind}' AS kind, {title} AS title, "
+            f"{due} AS due_date, {notify_days} AS notify_days FROM {table} WHERE {where}")
+
+
+def _view_sql():
+    branches = [_branch_sql(*source) for source in SOURCES]
+    branches.append(
+        f"SELECT 'contacts' AS source_table, id AS source_id, 'Birthday' AS kind, name AS title, "
+        f"{_NEXT_BIRTHDAY} AS due_date, {BIRTHDAY_NOTIFY_DAYS} AS notify_days "
+        f"FROM contacts WHERE birthday IS NOT NULL AND length(birthday) = 10"
+    )
+    return "CREATE VIEW IF NOT EXISTS upcoming_items AS\n" + "\nUNION ALL\n".join(branches)
+
+
+def create_schema(conn):
+    from database.migrations import add_column
+
+    add_column(conn, "system_alerts", "dedup_key", "TEXT")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_system_alerts_dedup ON system_alerts (dedup_key) "
+        "WHERE dedup_key IS NOT NULL"
+    )
+    for table, _kind, _title, due, _days, condition in SOURCES:
+        conn.execute(_index_sql(table, due, condition))
+    conn.execute(_view_sql())
+
+
+def _today(today):
+    if today is None:
+        return date.today()
+    if isinstance(today, str):
+        return datetime.strptime(today[:10], "%Y-%m-%d").date()
+    return today
+
+
+def upcoming(conn, days=30, today=None):
+    """Everything due in the next `days` days, soonest first, as dicts."""
+    start = _today(today)
+    cursor = conn.execute(
+        "SELECT * FROM upcoming_items WHERE due_date BETWEEN ? AND ? ORDER BY due_date, kind",
+        (start.isoformat(), (start + timedelta(days=days)).isoformat()),
+    )
+    names = [d[0] for d in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+
+def dedup_key(item):
+    return f"{item['source_table']}:{item['source_id']}:{item['due_date']}"
+
+
+class AlertScheduler:
+    """
+    Heap of pending notifications keyed by the day they should fire.
+
+    reload() rebuilds it from upcoming_items (call it after writes to any
+    source table), including overdue items that were never alerted, e.g.
+    because the app was closed when they fell due; fire_due() writes every
+    alert whose day has come and next_due() tells the caller when to wake
+    up next.
+    """
+
+    def __init__(self):
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def reload(self, conn, today=None):
+        start = _today(today)
+        self._heap = []
+        cursor = conn.execute(
+            """
+            SELECT * FROM upcoming_items WHERE due_date >= :today
+            UNION ALL
+            SELECT * FROM upcoming_items u
+            WHERE due_date < :today AND NOT EXISTS (
+                SELECT 1 FROM system_alerts a
+                WHERE a.dedup_key = u.source_table || ':' || u.source_id || ':' || u.due_date
+            )
+            """,
+            {"today": start.isoformat()},
+        )
+        names = [d[0] for d in cursor.description]
+        for row in cursor:
+            item = dict(zip(names, row))
+            try:
+                due = datetime.strptime(item["due_date"][:10], "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            notify_on = due - timedelta(days=item["notify_days"])
+            self._heap.append((notify_on, dedup_key(item), item))
+        heapq.heapify(self._heap)
+
+    def next_due(self):
+        """The day the earliest pending alert fires, or None."""
+        return self._heap[0][0] if self._heap else None
+
+    def has_due(self, today=None):
+        """True when fire_due() has something to write."""
+        return bool(self._heap) and self._heap[0][0] <= _today(today)
+
+    def fire_due(self, conn, today=None, in_transaction=False):
+        """
+        Write every alert due by `today`; returns how many were new. Pass
+        in_transaction=True when the caller already holds a transaction
+        (e.g. ConnectionPool.write_transaction).
+        """
+        start = _today(today)
+        due = []
+        while self._heap and self._heap[0][0] <= start:
+            due.append(heapq.heappop(self._heap))
+        if not due:
+            return 0
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with nullcontext() if in_transaction else conn:
+            # rowcount skips ignored duplicates and rows written by triggers
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO system_alerts (title, message, severity, created_at, dedup_key) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(item["kind"], _message(item, start), _severity(item, start), created_at, key)
+                 for _notify_on, key, item in due],
+            )
+        return cursor.rowcount
+
+
+def _days_left(item, today):
+    return (datetime.strptime(item["due_date"][:10], "%Y-%m-%d").date() - today).days
+
+
+def _message(item, today):
+    days = _days_left(item, today)
+    if days < 0:
+        return f"{item['title']}: {item['kind'].lower()} was {item['due_date']} ({-days} days ago)"
+    when = "today" if days == 0 else "tomorrow" if days == 1 else f"in {days} days"
+    return f"{item['title']}: {item['kind'].lower()} {when} ({item['due_date']})"
+
+
+def _severity(item, today):
+    return "Warning" if _days_left(item, today) <= 1 else "Info"
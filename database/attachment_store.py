@@ -0,0 +1,235 @@
+"""
+Content-addressed store for attachments and document scans.
+
+Files are stored once under their SHA-256 digest (root/ab/abcdef...), so the
+same receipt attached to three transactions, or a scan uploaded twice, takes
+the space of one file. Hashing streams the file in fixed-size chunks, and
+large files are hashed through mmap so they are never read into memory.
+
+The blobs table records every stored digest; attachments.blob_hash and
+documents.blob_hash point at it. file_path keeps pointing at a readable file
+(now the stored blob), so code that only opens file_path keeps working.
+
+The store lives in DEFAULT_ROOT next to the database file (not the working
+directory), so every launch of the app finds the same blobs. Relative
+file_path values are resolved against that same directory. Copy existing
+loose files into the store (originals are kept unless asked otherwise) with:
+
+    python -m database.attachment_store life_ledger.db [--remove-originals]
+"""
+import argparse
+import hashlib
+import mimetypes
+import mmap
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+
+
+DEFAULT_ROOT = "attachment_store"  # directory name, created beside the database file
+CHUNK_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS blobs (
+        hash TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mime_type TEXT,
+        created_at TEXT NOT NULL
+    ) WITHOUT ROWID""",
+]
+
+BLOB_COLUMNS = (("attachments", "blob_hash"), ("documents", "blob_hash"))
+
+
+def create_schema(conn):
+    from database.migrations import add_column
+
+    for sql in SCHEMA:
+        conn.execute(sql)
+    for table, column in BLOB_COLUMNS:
+        add_column(conn, table, column, "TEXT")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})")
+
+
+def hash_file(path, chunk_size=CHUNK_SIZE, mmap_threshold=MMAP_THRESHOLD):
+    """SHA-256 hex digest of a file, in constant memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, size, chunk_size):
+                    digest.update(mapped[offset:offset + chunk_size])
+        else:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """Files on disk addressed by their SHA-256 digest."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def for_database(cls, db_path):
+        """The store beside `db_path`, wherever the process was started from."""
+        return cls(os.path.join(os.path.dirname(os.path.abspath(db_path)), DEFAULT_ROOT))
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def contains(self, digest):
+        return os.path.exists(self.path_for(digest))
+
+    def put(self, path):
+        """
+        Store a copy of `path`. Returns (digest, size, added); added is False
+        when identical content was already stored.
+        """
+        digest = hash_file(path)
+        target = self.path_for(digest)
+        size = os.path.getsize(path)
+        if os.path.exists(target):
+            return digest, size, False
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Copy next to the target, then rename: readers never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out, open(path, "rb") as src:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return digest, size, True
+
+    def verify(self, digest):
+        """True when the stored blob exists and still hashes to `digest`."""
+        return self.contains(digest) and hash_file(self.path_for(digest)) == digest
+
+    def remove(self, digest):
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _register_blob(conn, digest, size, original_name):
+    mime_type, _ = mimetypes.guess_type(original_name)
+    conn.execute(
+        "INSERT OR IGNORE INTO blobs (hash, size, mime_type, created_at) VALUES (?, ?, ?, ?)",
+        (digest, size, mime_type, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+    )
+
+
+def add_attachment(conn, store, path, related_table, related_id):
+    """Store `path` and attach it to a row; returns the attachment id."""
+    digest, size, _added = store.put(path)
+    file_name = os.path.basename(path)
+    with conn:
+        _register_blob(conn, digest, size, file_name)
+        cursor = conn.execute(
+            """INSERT INTO attachments (related_id, related_table, file_path, file_name, uploaded_at, blob_hash)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (related_id, related_table, store.path_for(digest), file_name,
+             datetime.now().strftime("%Y-%m-%d %H:%M:%S"), digest),
+        )
+    return cursor.lastrowid
+
+
+def set_document_file(conn, store, document_id, path):
+    """Store `path` as the scan of a document; returns its digest."""
+    digest, size, _added = store.put(path)
+    with conn:
+        _register_blob(conn, digest, size, os.path.basename(path))
+        conn.execute(
+            "UPDATE documents SET file_path = ?, blob_hash = ? WHERE id = ?",
+            (store.path_for(digest), digest, document_id),
+        )
+    return digest
+
+
+def database_dir(conn):
+    """Directory of the connection's main database file (the working directory for :memory:)."""
+    for _seq, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main" and path:
+            return os.path.dirname(path)
+    return os.getcwd()
+
+
+def ingest_loose_files(conn, store, remove_originals=False):
+    """
+    Copy files referenced by file_path into the store and point the rows at
+    the blobs. Relative paths are resolved against the database's directory;
+    rows whose file is missing are left alone.
+
+    The user's original files are kept unless remove_originals is True; then
+    an original is deleted only after every row pointing at it has been
+    repointed and its blob re-hashes correctly.
+    Returns {'stored', 'deduplicated', 'missing', 'removed'}.
+    """
+    counts = {"stored": 0, "deduplicated": 0, "missing": 0, "removed": 0}
+    originals = {}
+    base = database_dir(conn)
+    for table, _column in BLOB_COLUMNS:
+        rows = conn.execute(
+            f"SELECT id, file_path FROM {table} WHERE blob_hash IS NULL AND file_path IS NOT NULL AND file_path != ''"
+        ).fetchall()
+        for row_id, file_path in rows:
+            file_path = os.path.join(base, file_path)  # no-op for absolute paths
+            if not os.path.isfile(file_path):
+                counts["missing"] += 1
+                continue
+            digest, size, added = store.put(file_path)
+            counts["stored" if added else "deduplicated"] += 1
+            with conn:
+                _register_blob(conn, digest, size, os.path.basename(file_path))
+                conn.execute(
+                    f"UPDATE {table} SET file_path = ?, blob_hash = ? WHERE id = ?",
+                    (store.path_for(digest), digest, row_id),
+                )
+            originals[os.path.abspath(file_path)] = digest
+    if not remove_originals:
+        return counts
+    for original, digest in originals.items():
+        if original != os.path.abspath(store.path_for(digest)) and store.verify(digest):
+            os.remove(original)
+            counts["removed"] += 1
+    return counts
+
+
+def collect_garbage(conn, store):
+    """Delete blobs no attachment or document references; returns bytes freed."""
+    orphans = conn.execute("""
+        SELECT hash, size FROM blobs b
+        WHERE NOT EXISTS (SELECT 1 FROM attachments a WHERE a.blob_hash = b.hash)
+          AND NOT EXISTS (SELECT 1 FROM documents d WHERE d.blob_hash = b.hash)
+    """).fetchall()
+    with conn:
+        conn.executemany("DELETE FROM blobs WHERE hash = ?", [(digest,) for digest, _size in orphans])
+    for digest, _size in orphans:
+        store.remove(digest)
+    return sum(size for _digest, size in orphans)
+
+
+if __name__ == "__main__":
+    from database.migrations import migrate
+
+    parser = argparse.ArgumentParser(description="Copy loose attachment files into the blob store.")
+    parser.add_argument("db", nargs="*", default=["life_ledger.db"], help="database files")
+    parser.add_argument("--remove-originals", action="store_true",
+                        help="delete each original once its blob is stored and verified")
+    args = parser.parse_args()
+    for db_path in args.db:
+        conn = sqlite3.connect(db_path)
+        migrate(conn)
+        counts = ingest_loose_files(conn, BlobStore.for_database(db_path), args.remove_originals)
+        conn.close()
+        print(f"{db_path}: {counts['stored']} stored, {counts['deduplicated']} duplicates, "
+              f"{counts['missing']} missing, {counts['removed']} originals removed")
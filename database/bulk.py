@@ -0,0 +1,109 @@
+"""
+Bulk write helpers for high-volume inserts.
+
+Seeding and statement imports push hundreds or thousands of rows at a time.
+Going through one INSERT and one commit per row costs an fsync per row, so
+these helpers batch rows into a single executemany inside one transaction.
+
+Per-row work done by AFTER INSERT triggers is deferred as well: the search
+index and row change log triggers skip rows while a bulk insert into their
+table is running (see deferred_row_triggers), and the batch is then indexed
+and logged with one set-based statement each.
+"""
+import sqlite3
+from contextlib import contextmanager
+
+
+def connect(db_path):
+    """Open a connection suitable for bulk writes on an existing ledger file."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def _defer_key(table):
+    return f"defer_row_triggers:{table}"
+
+
+def unless_deferred(table):
+    """WHEN clause for an AFTER INSERT trigger that deferred_row_triggers() may suspend."""
+    return f"WHEN NOT EXISTS (SELECT 1 FROM ledger_meta WHERE key = '{_defer_key(table)}')"
+
+
+@contextmanager
+def deferred_row_triggers(conn, table):
+    """
+    Suspend the deferrable insert triggers of `table` for the block, then
+    index and log every row inserted meanwhile in one statement each.
+
+    The flag row lives in ledger_meta inside the caller's transaction (one is
+    begun if needed), so other connections never see it, and a rollback
+    drops it along with the rows. `table` must have an INTEGER PRIMARY KEY
+    id, so the new rows are exactly those above the current MAX(id).
+    """
+    from database import export, search
+
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    after_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+    conn.execute("INSERT INTO ledger_meta (key, value) VALUES (?, 1)", (_defer_key(table),))
+    yield
+    conn.execute("DELETE FROM ledger_meta WHERE key = ?", (_defer_key(table),))
+    search.index_rows_after(conn, table, after_id)
+    export.log_rows_after(conn, table, after_id)
+
+
+def insert_many(conn, table, columns, rows):
+    """
+    Insert every row of `rows` into `table` in one transaction.
+
+    `rows` is any iterable of tuples ordered like `columns`; generators are
+    consumed lazily by executemany. Returns the number of rows written. If any
+    row fails the whole batch is rolled back.
+    """
+    placeholders = ", ".join("?" for _ in columns)
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    with conn:
+        with deferred_row_triggers(conn, table):
+            cursor = conn.executemany(sql, rows)
+    return cursor.rowcount
+
+
+def execute_many(conn, query, params_seq):
+    """Run an arbitrary parameterised statement for every params tuple in one transaction."""
+    with conn:
+        cursor = conn.executemany(query, params_seq)
+    return cursor.rowcount
+
+
+# Column layouts used by the seed and import scripts, matching the ledger schema.
+TRANSACTION_COLUMNS = ("date", "amount", "category", "type", "description")
+HEALTH_METRIC_COLUMNS = ("type", "value", "unit", "date", "notes")
+FITNESS_LOG_COLUMNS = ("date", "activity_type", "duration_min", "calories", "distance_km", "notes")
+BODY_METRIC_COLUMNS = ("date", "weight_kg", "body_fat_pct", "muscle_mass_kg")
+TIME_LOG_COLUMNS = ("activity", "category", "date", "start_time", "end_time", "duration_minutes", "notes")
+
+
+def add_transactions_many(conn, rows):
+    """Bulk insert (date, amount, category, type, description) transaction rows."""
+    return insert_many(conn, "transactions", TRANSACTION_COLUMNS, rows)
+
+
+def add_health_metrics_many(conn, rows):
+    """Bulk insert (type, value, unit, date, notes) health metric rows."""
+    return insert_many(conn, "health_metrics", HEALTH_METRIC_COLUMNS, rows)
+
+
+def add_fitness_logs_many(conn, rows):
+    """Bulk insert (date, activity_type, duration_min, calories, distance_km, notes) fitness rows."""
+    return insert_many(conn, "fitness_logs", FITNESS_LOG_COLUMNS, rows)
+
+
+def add_body_metrics_many(conn, rows):
+    """Bulk insert (date, weight_kg, body_fat_pct, muscle_mass_kg) body metric rows."""
+    return insert_many(conn, "body_metrics", BODY_METRIC_COLUMNS, rows)
+
+
+def add_time_logs_many(conn, rows):
+    """Bulk insert (activity, category, date, start_time, end_time, duration_minutes, notes) time rows."""
+    return insert_many(conn, "time_logs", TIME_LOG_COLUMNS, rows)
@@ -0,0 +1,254 @@
+"""
+Table-aware LRU cache for read query results.
+
+Entries are keyed by (sql, params) and tagged with the tables the SELECT
+reads. A write to a table evicts every entry that depends on it, including
+entries over tables that triggers on it maintain (for example
+transactions -> transaction_monthly_totals) and views over it. Reads the
+parser can't attribute to known tables are not cached. Hit/miss counters
+show whether the cache is paying off for a given workload.
+"""
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+
+_NAME = r"[A-Za-z_][A-Za-z0-9_]*"
+_LITERALS = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/", re.DOTALL)
+_SOURCE = re.compile(r"\b(?:FROM|JOIN)\b", re.IGNORECASE)
+# One entry of a FROM list: name, optional alias, optional trailing comma
+_SOURCE_ITEM = re.compile(rf"\s*({_NAME})(\s*[.(])?(?:\s+(?:AS\s+)?{_NAME})?\s*(,)?", re.IGNORECASE)
+_CTE_NAME = re.compile(
+    rf"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*({_NAME})\s*(?:\([^)]*\))?\s+AS\s*(?:NOT\s+)?(?:MATERIALIZED\s+)?\(",
+    re.IGNORECASE,
+)
+_WRITE_TABLE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+([A-Za-z_][A-Za-z0-9_]*)",
+    re.IGNORECASE,
+)
+_TRIGGER_TABLE = re.compile(r"\bON\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+# The lookahead skips UPSERT clauses ("ON CONFLICT ... DO UPDATE SET")
+_TRIGGER_WRITES = re.compile(
+    r"(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(?!SET\b)([A-Za-z_][A-Za-z0-9_]*)",
+    re.IGNORECASE,
+)
+
+
+def tables_read(sql):
+    """
+    Lower-cased names of the tables and views a SELECT reads from, comma
+    joins included and CTE names left out. Returns None when a source can't
+    be attributed: quoted or schema-qualified names, table-valued functions.
+    """
+    sql = _LITERALS.sub("''", sql)
+    ctes = {name.lower() for name in _CTE_NAME.findall(sql)}
+    tables = set()
+    for match in _SOURCE.finditer(sql):
+        pos = match.end()
+        while True:
+            if sql[pos:].lstrip().startswith("("):
+                break   # subquery: its own FROM is picked up by the scan
+            item = _SOURCE_ITEM.match(sql, pos)
+            if item is None or item.group(2):
+                return None
+            tables.add(item.group(1).lower())
+            if not item.group(3):
+                break
+            pos = item.end()
+    return frozenset(tables - ctes)
+
+
+def table_written(sql):
+    """Lower-cased name of the table a write statement targets, or None."""
+    match = _WRITE_TABLE.match(sql)
+    return match.group(1).lower() if match else None
+
+
+def trigger_dependencies(conn):
+    """{table: {tables its triggers write}} read from sqlite_master."""
+    deps = {}
+    for (sql,) in conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger'"):
+        head, _, body = sql.partition("BEGIN")
+        match = _TRIGGER_TABLE.search(head)
+        if not match:
+            continue
+        targets = {name.lower() for name in _TRIGGER_WRITES.findall(body)}
+        deps.setdefault(match.group(1).lower(), set()).update(targets)
+    return deps
+
+
+def view_dependencies(conn):
+    """{view: tables and views it reads} from sqlite_master; None where unparseable."""
+    return {
+        name.lower(): tables_read(sql)
+        for name, sql in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'view'")
+    }
+
+
+def schema_names(conn):
+    """Lower-cased names of every table and view in the database."""
+    names = {row[0].lower() for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+    return names | {"sqlite_master", "sqlite_schema"}
+
+
+def expand_tables(tables, dependencies):
+    """`tables` plus every table their triggers write, transitively."""
+    pending = [t.lower() for t in tables]
+    seen = set()
+    while pending:
+        table = pending.pop()
+        if table in seen:
+            continue
+        seen.add(table)
+        pending.extend(dependencies.get(table, ()))
+    return seen
+
+
+class QueryCache:
+    """Size-bounded LRU of query results with table-level invalidation."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.discarded = 0
+        self._entries = OrderedDict()   # key -> (rows, tables)
+        self._by_table = {}             # table -> set of keys
+        self._generations = {}          # table -> invalidation count
+        self._epoch = 0                 # bumped by clear()
+        self._dependencies = {}
+        self._views = {}
+        self._known = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(sql, params):
+        if isinstance(params, Mapping):
+            return sql, tuple(sorted(params.items()))
+        return sql, tuple(params)
+
+    def set_dependencies(self, dependencies, views=None, known=None):
+        """
+        Register trigger fan-out and view definitions, as returned by
+        trigger_dependencies() and view_dependencies(). With `known` (see
+        schema_names()) reads of any other name are not cached.
+        """
+        with self._lock:
+            self._dependencies = dependencies
+            self._views = views or {}
+            self._known = known
+
+    def read_tables(self, sql):
+        """Tables a read depends on, views expanded to their base tables; None if uncacheable."""
+        names = tables_read(sql)
+        if not names:
+            return None
+        with self._lock:
+            views, known = self._views, self._known
+        tables = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in tables:
+                continue
+            if name in views:
+                if views[name] is None:
+                    return None
+                pending.extend(views[name])
+            elif known is not None and name not in known:
+                return None
+            tables.add(name)
+        return frozenset(tables)
+
+    def stamp(self, sql):
+        """
+        Take before running a read and hand to put(): rows read while one of
+        their tables was invalidated are then not cached. None if uncacheable.
+        """
+        tables = self.read_tables(sql)
+        if tables is None:
+            return None
+        with self._lock:
+            return tables, self._epoch, {t: self._generations.get(t, 0) for t in tables}
+
+    def get(self, key):
+        """Return a copy of the cached rows, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            rows = entry[0]
+        return [dict(row) for row in rows]
+
+    def put(self, key, rows, stamp=None):
+        if stamp is None:
+            stamp = self.stamp(key[0])
+            if stamp is None:
+                return
+        tables, epoch, generations = stamp
+        with self._lock:
+            if epoch != self._epoch or any(self._generations.get(t, 0) != g for t, g in generations.items()):
+                self.discarded += 1
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = ([dict(row) for row in rows], tables)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key):
+        _rows, tables = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def invalidate(self, *tables):
+        """Evict every entry that reads any of `tables` (or what their triggers write)."""
+        with self._lock:
+            for table in expand_tables(tables, self._dependencies):
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def invalidate_for(self, sql):
+        """Invalidate based on a write statement; unknown statements clear everything."""
+        table = table_written(sql)
+        if table is None:
+            self.clear()
+        else:
+            self.invalidate(table)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_table.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "discarded": self.discarded,
+            }
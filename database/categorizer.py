@@ -0,0 +1,220 @@
+"""
+Automatic transaction categorization.
+
+category_suggestions (description_keyword -> suggested_category) is compiled
+once into an Aho-Corasick automaton, so classifying a description costs one
+pass over its characters no matter how many keywords there are, and a whole
+import batch is classified in one sweep. Keywords only match whole words
+("bar" matches "Bar & Grill" but not "Barclays" or "crowbar"); when several
+match, the longest wins.
+
+Triggers bump a version counter in ledger_meta whenever the suggestion table
+changes; the compiled matcher is reused until that version moves.
+
+Transactions the importer categorized are listed in auto_categorized until the
+user changes their category, so learn_keywords() never learns from its own
+guesses.
+"""
+import re
+from collections import Counter, defaultdict, deque
+
+
+DEFAULT_CATEGORY = "Uncategorized"
+VERSION_KEY = "category_suggestions_version"
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS ledger_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )""",
+    f"""INSERT OR IGNORE INTO ledger_meta (key, value) VALUES ('{VERSION_KEY}', 0)""",
+] + [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_category_suggestions_version_{event.lower()}
+    AFTER {event} ON category_suggestions
+    BEGIN
+        UPDATE ledger_meta SET value = value + 1 WHERE key = '{VERSION_KEY}';
+    END"""
+    for event in ("INSERT", "UPDATE", "DELETE")
+]
+
+
+AUTO_CATEGORIZED_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS auto_categorized (
+        transaction_id INTEGER PRIMARY KEY
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_auto_categorized_update
+    AFTER UPDATE OF category ON transactions
+    WHEN NEW.category IS NOT OLD.category
+    BEGIN
+        DELETE FROM auto_categorized WHERE transaction_id = NEW.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_auto_categorized_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        DELETE FROM auto_categorized WHERE transaction_id = OLD.id;
+    END""",
+]
+
+
+def create_schema(conn):
+    for sql in SCHEMA:
+        conn.execute(sql)
+
+
+def create_auto_categorized(conn):
+    for sql in AUTO_CATEGORIZED_SCHEMA:
+        conn.execute(sql)
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over lower-cased keywords, matching whole words only."""
+
+    def __init__(self, keywords):
+        """`keywords` is an iterable of (keyword, category)."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [None]   # (keyword length, category) of the keyword ending at this state
+        self._next = [0]        # nearest state on the fail chain that ends a keyword
+        for keyword, category in keywords:
+            keyword = keyword.strip().lower()
+            if keyword:
+                self._add(keyword, category)
+        self._link()
+
+    def _add(self, keyword, category):
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._next.append(0)
+            state = nxt
+        self._output[state] = (len(keyword), category)
+
+    def _link(self):
+        # Breadth-first, so every fail target is finished before it is used.
+        # Depth-1 states keep the root as their fail link.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                target = self._fail[nxt]
+                self._next[nxt] = target if self._output[target] else self._next[target]
+
+    def __len__(self):
+        return sum(1 for out in self._output if out)
+
+    def match(self, text):
+        """Category of the longest keyword found as whole words in `text`, or None."""
+        best = None
+        state = 0
+        goto, fail, output, nxt = self._goto, self._fail, self._output, self._next
+        text = (text or "").lower()
+        last = len(text) - 1
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if end < last and char.isalnum() and text[end + 1].isalnum():
+                continue  # every keyword ending here stops mid-word
+            found = state if output[state] else nxt[state]
+            while found:
+                length, category = output[found]
+                start = end - length + 1
+                if (best is None or length > best[0]) and (
+                    start == 0 or not text[start].isalnum() or not text[start - 1].isalnum()
+                ):
+                    best = (length, category)
+                found = nxt[found]
+        return best[1] if best else None
+
+
+class Categorizer:
+    """Classifies descriptions, recompiling only when category_suggestions changes."""
+
+    def __init__(self, default=DEFAULT_CATEGORY):
+        self.default = default
+        self._version = None
+        self._matcher = None
+        self.compiles = 0
+
+    def _current_version(self, conn):
+        row = conn.execute("SELECT value FROM ledger_meta WHERE key = ?", (VERSION_KEY,)).fetchone()
+        return row[0] if row else None
+
+    def matcher(self, conn):
+        version = self._current_version(conn)
+        if self._matcher is None or version is None or version != self._version:
+            rows = conn.execute(
+                "SELECT description_keyword, suggested_category FROM category_suggestions"
+            ).fetchall()
+            self._matcher = KeywordMatcher(rows)
+            self._version = version
+            self.compiles += 1
+        return self._matcher
+
+    def classify(self, conn, description):
+        return self.matcher(conn).match(description) or self.default
+
+    def classify_many(self, conn, descriptions):
+        """Categories for a whole batch, compiling (at most) once up front."""
+        matcher = self.matcher(conn)
+        default = self.default
+        return [matcher.match(text) or default for text in descriptions]
+
+
+_WORD = re.compile(r"[a-z][a-z&'\-]{2,}")
+_STOP_WORDS = {
+    "the", "and", "for", "with", "from", "payment", "purchase", "pos", "card",
+    "debit", "credit", "online", "transfer", "inc", "ltd", "llc", "com", "www",
+}
+
+
+def learn_keywords(conn, min_support=3, min_confidence=0.9, ignore=(DEFAULT_CATEGORY, "Other")):
+    """
+    Learn new keywords from transactions the user has categorized; rows still
+    carrying the importer's own guess (auto_categorized) are skipped.
+
+    A word becomes a keyword when it appears in at least min_support
+    descriptions and at least min_confidence of those share one category.
+    Returns the [(keyword, category)] pairs added to category_suggestions.
+    """
+    counts = defaultdict(Counter)
+    placeholders = ", ".join("?" for _ in ignore)
+    rows = conn.execute(
+        f"SELECT description, category FROM transactions t "
+        f"WHERE description IS NOT NULL AND category NOT IN ({placeholders}) "
+        f"AND NOT EXISTS (SELECT 1 FROM auto_categorized a WHERE a.transaction_id = t.id)",
+        tuple(ignore),
+    )
+    for description, category in rows:
+        for word in set(_WORD.findall(description.lower())):
+            if word not in _STOP_WORDS:
+                counts[word][category] += 1
+
+    existing = {
+        row[0].lower() for row in conn.execute("SELECT description_keyword FROM category_suggestions")
+    }
+    learned = []
+    for word, by_category in counts.items():
+        total = sum(by_category.values())
+        category, hits = by_category.most_common(1)[0]
+        if word not in existing and total >= min_support and hits / total >= min_confidence:
+            learned.append((word, category))
+
+    if learned:
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO category_suggestions (description_keyword, suggested_category) VALUES (?, ?)",
+                learned,
+            )
+    return learned
@@ -0,0 +1,141 @@
+"""
+Closed-form inventory depreciation.
+
+An item's value is worked out when it is read, from purchase_price,
+purchase_date and its category's annual declining-balance rate:
+
+    value = purchase_price * (1 - rate) ** (years since purchase)
+
+so totals and net worth need no write pass at all. Items without a
+purchase_price have nothing to depreciate from and keep their entered
+current_value. When a stored value is wanted (exports, other tools reading
+current_value), store_current_values() refreshes every priced row with one
+UPDATE statement.
+"""
+import math
+from datetime import date, datetime
+
+
+DEFAULT_RATE = 0.10
+
+# Annual declining-balance rates per inventory category.
+DEFAULT_SCHEDULE = {
+    "Electronics": 0.20,
+    "Appliances": 0.15,
+    "Sports": 0.15,
+    "Vehicles": 0.15,
+    "Furniture": 0.10,
+    "Tools": 0.10,
+    "Clothing": 0.30,
+    "Jewelry": 0.0,
+    "Collectibles": 0.0,
+}
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS depreciation_rates (
+        category TEXT PRIMARY KEY,
+        annual_rate REAL NOT NULL CHECK (annual_rate >= 0 AND annual_rate < 1)
+    )""",
+]
+
+
+def create_schema(conn):
+    for sql in SCHEMA:
+        conn.execute(sql)
+    conn.executemany(
+        "INSERT OR IGNORE INTO depreciation_rates (category, annual_rate) VALUES (?, ?)",
+        DEFAULT_SCHEDULE.items(),
+    )
+
+
+def depreciate(purchase_price, purchase_date, rate, as_of):
+    """Value of an item bought for purchase_price on purchase_date, at as_of."""
+    if purchase_price is None:
+        return None
+    if not purchase_date or not rate:
+        return purchase_price
+    try:
+        bought = datetime.strptime(purchase_date[:10], "%Y-%m-%d").date()
+        when = datetime.strptime(as_of[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return purchase_price
+    years = max(0, (when - bought).days) / 365.25
+    return round(purchase_price * math.pow(1 - rate, years), 2)
+
+
+def register(conn):
+    """Make depreciate(price, purchase_date, rate, as_of) callable from SQL on `conn`."""
+    conn.create_function("depreciate", 4, depreciate, deterministic=True)
+
+
+# Rate for each inventory row: its category's rate, else the default.
+# Unpriced rows fall back to their stored current_value.
+_VALUE_SQL = f"""
+    COALESCE(depreciate(i.purchase_price, i.purchase_date,
+                        COALESCE(r.annual_rate, {DEFAULT_RATE}), ?),
+             i.current_value)
+"""
+_FROM_SQL = "FROM inventory i LEFT JOIN depreciation_rates r ON r.category = i.category"
+
+
+def _as_of(as_of):
+    if as_of is None:
+        return date.today().isoformat()
+    return as_of if isinstance(as_of, str) else as_of.isoformat()
+
+
+def items_with_values(conn, as_of=None):
+    """Inventory rows as dicts with 'value' computed for `as_of` (default today)."""
+    register(conn)
+    cursor = conn.execute(
+        f"SELECT i.*, {_VALUE_SQL} AS value {_FROM_SQL} ORDER BY i.name", (_as_of(as_of),)
+    )
+    names = [d[0] for d in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+
+def total_value(conn, as_of=None, category=None):
+    """Sum of depreciated values, optionally for one category."""
+    register(conn)
+    query = f"SELECT COALESCE(SUM({_VALUE_SQL}), 0) {_FROM_SQL}"
+    params = [_as_of(as_of)]
+    if category is not None:
+        query += " WHERE i.category = ?"
+        params.append(category)
+    return conn.execute(query, params).fetchone()[0]
+
+
+def category_totals(conn, as_of=None):
+    """{category: (purchase total, current total)} for the inventory summary."""
+    register(conn)
+    query = f"""
+        SELECT COALESCE(i.category, 'Other'), SUM(i.purchase_price), SUM({_VALUE_SQL})
+        {_FROM_SQL}
+        GROUP BY COALESCE(i.category, 'Other')
+    """
+    return {cat: (bought, now) for cat, bought, now in conn.execute(query, (_as_of(as_of),))}
+
+
+def store_current_values(conn, as_of=None):
+    """
+    Write today's values into inventory.current_value with a single UPDATE.
+    Rows without a purchase_price are left alone.
+    """
+    register(conn)
+    stamp = _as_of(as_of)
+    with conn:
+        cursor = conn.execute(
+            f"""
+            UPDATE inventory
+            SET current_value = depreciate(
+                    purchase_price, purchase_date,
+                    COALESCE((SELECT annual_rate FROM depreciation_rates r
+                              WHERE r.category = inventory.category), {DEFAULT_RATE}),
+                    ?),
+                last_depreciated = ?
+            WHERE purchase_price IS NOT NULL
+              AND (last_depreciated IS NULL OR last_depreciated < ?)
+            """,
+            (stamp, stamp, stamp),
+        )
+    return cursor.rowcount
@@ -0,0 +1,158 @@
+"""
+Query and view timing diagnostics.
+
+QueryStats collects per-statement timings and row counts, keeps a bounded log
+of slow statements together with their EXPLAIN QUERY PLAN, and records how
+long each view's refresh took. ConnectionPool feeds it every query when
+created with stats=..., views report their refreshes through time_view(), and
+the diagnostics panel in Settings reads snapshot() / export_json().
+
+The slow-query threshold comes from "slow_query_ms" in config.json.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+
+DEFAULT_SLOW_MS = 50.0
+_WHITESPACE = re.compile(r"\s+")
+
+
+def load_threshold(config_path="config.json", default=DEFAULT_SLOW_MS):
+    try:
+        with open(config_path) as f:
+            return float(json.load(f).get("slow_query_ms", default))
+    except (OSError, ValueError, TypeError):
+        return default
+
+
+def normalize_sql(sql):
+    """Collapse whitespace so the same statement groups under one key."""
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def explain_plan(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN detail lines for `sql`, or a one-line error."""
+    try:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    except sqlite3.Error as e:
+        return [f"error: {e}"]
+
+
+class QueryStats:
+    """Thread-safe statement and view timing collector."""
+
+    def __init__(self, slow_ms=None, slow_log_size=200):
+        self.slow_ms = load_threshold() if slow_ms is None else slow_ms
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._views = {}
+        self._slow = deque(maxlen=slow_log_size)
+
+    # ----- recording -----
+
+    def record(self, sql, elapsed_ms, rows=None, conn=None, params=()):
+        """
+        Account one statement. When it is slower than the threshold, its plan
+        is captured on `conn` (the connection that ran it) for the slow log.
+        """
+        key = normalize_sql(sql)
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                entry = self._statements[key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["rows"] += rows or 0
+        if elapsed_ms < self.slow_ms:
+            return
+        plan = explain_plan(conn, sql, params) if conn is not None else []
+        with self._lock:
+            self._slow.append({
+                "at": datetime.now().isoformat(timespec="seconds"),
+                "sql": key,
+                "ms": round(elapsed_ms, 2),
+                "rows": rows,
+                "plan": plan,
+            })
+
+    def record_view(self, name, elapsed_ms):
+        with self._lock:
+            entry = self._views.get(name)
+            if entry is None:
+                entry = self._views[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_ms"] = elapsed_ms
+
+    @contextmanager
+    def time_view(self, name):
+        """with stats.time_view("FinanceView"): self.refresh_data()"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_view(name, (time.perf_counter() - start) * 1000)
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._views.clear()
+            self._slow.clear()
+
+    # ----- reporting -----
+
+    def statements(self, order_by="total_ms", limit=None):
+        """[{sql, count, total_ms, avg_ms, max_ms, rows}], most expensive first."""
+        with self._lock:
+            rows = [
+                dict(entry, sql=sql, avg_ms=entry["total_ms"] / entry["count"])
+                for sql, entry in self._statements.items()
+            ]
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def views(self):
+        with self._lock:
+            rows = [
+                dict(entry, view=name, avg_ms=entry["total_ms"] / entry["count"])
+                for name, entry in self._views.items()
+            ]
+        rows.sort(key=lambda row: row["last_ms"], reverse=True)
+        return rows
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow)
+
+    def snapshot(self):
+        return {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "slow_ms": self.slow_ms,
+            "statements": self.statements(),
+            "views": self.views(),
+            "slow_queries": self.slow_queries(),
+        }
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+
+_shared = None
+
+
+def shared_stats():
+    """The process-wide collector used by the app's pool and views."""
+    global _shared
+    if _shared is None:
+        _shared = QueryStats()
+    return _shared
@@ -0,0 +1,365 @@
+"""
+Streaming export of ledger tables to XLSX and CSV.
+
+Rows are pulled from SQLite cursors in batches and handed straight to a csv
+writer or an openpyxl write-only worksheet, so memory stays flat whatever
+the table size. Tables are exported in parallel worker processes, each with
+its own read-only connection, and progress is reported back per batch.
+
+Incremental exports only contain rows changed since the previous export of
+the same name. Triggers record every insert, update and delete of an
+exported table in row_changes under an increasing sequence number, and
+export_runs remembers the sequence each named export reached. After each
+named export, changes every named export has already passed are pruned.
+Bulk inserts (database.bulk) skip the insert trigger and log the whole batch
+under one sequence number instead.
+
+    python -m database.export life_ledger.db exports/ --format xlsx --since-last accountant
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from queue import Empty
+
+from database.bulk import unless_deferred
+
+
+BATCH_SIZE = 2000
+SEQ_KEY = "row_change_seq"
+
+EXPORT_TABLES = (
+    "transactions", "recurring_transactions", "budgets", "debts", "loans",
+    "financial_assets", "savings_goals", "insurance", "inventory",
+    "digital_subscriptions", "digital_accounts", "digital_assets",
+    "health_metrics", "medications", "fitness_logs", "body_metrics",
+    "time_logs", "goals", "goal_logs", "events", "event_tasks",
+    "projects", "project_tasks", "contacts", "interactions", "notes",
+    "note_links", "books", "courses", "documents", "attachments",
+    "recipes", "meal_plans", "pantry_items", "category_suggestions",
+    "system_alerts",
+)
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS row_changes (
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (table_name, row_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_row_changes_seq ON row_changes (table_name, seq)",
+    """CREATE TABLE IF NOT EXISTS export_runs (
+        name TEXT PRIMARY KEY,
+        last_seq INTEGER NOT NULL,
+        exported_at TEXT NOT NULL
+    )""",
+    f"INSERT OR IGNORE INTO ledger_meta (key, value) VALUES ('{SEQ_KEY}', 0)",
+]
+
+
+def _triggers(table):
+    def record(event, ref, deleted):
+        when = unless_deferred(table) if event == "INSERT" else ""
+        return f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_{event.lower()}
+        AFTER {event} ON {table} {when}
+        BEGIN
+            UPDATE ledger_meta SET value = value + 1 WHERE key = '{SEQ_KEY}';
+            INSERT INTO row_changes (table_name, row_id, seq, deleted)
+            VALUES ('{table}', {ref}.id, (SELECT value FROM ledger_meta WHERE key = '{SEQ_KEY}'), {deleted})
+            ON CONFLICT (table_name, row_id) DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted;
+        END"""
+    return [record("INSERT", "NEW", 0), record("UPDATE", "NEW", 0), record("DELETE", "OLD", 1)]
+
+
+def create_schema(conn):
+    for sql in SCHEMA:
+        conn.execute(sql)
+    for table in EXPORT_TABLES:
+        for sql in _triggers(table):
+            conn.execute(sql)
+
+
+def recreate_triggers(conn):
+    """Replace triggers created by an older version of _triggers()."""
+    for table in EXPORT_TABLES:
+        for event in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_changes_{event}")
+        for sql in _triggers(table):
+            conn.execute(sql)
+
+
+def log_rows_after(conn, table, after_id):
+    """Record the rows of `table` with id > after_id as changed, under one new sequence number."""
+    if table not in EXPORT_TABLES:
+        return
+    conn.execute(f"UPDATE ledger_meta SET value = value + 1 WHERE key = '{SEQ_KEY}'")
+    conn.execute(f"""
+        INSERT INTO row_changes (table_name, row_id, seq, deleted)
+        SELECT ?, id, (SELECT value FROM ledger_meta WHERE key = '{SEQ_KEY}'), 0
+        FROM {table} WHERE id > ?
+        ON CONFLICT (table_name, row_id) DO UPDATE SET seq = excluded.seq, deleted = 0
+    """, (table, after_id))
+
+
+def current_seq(conn):
+    row = conn.execute("SELECT value FROM ledger_meta WHERE key = ?", (SEQ_KEY,)).fetchone()
+    return row[0] if row else 0
+
+
+def last_export_seq(conn, name):
+    row = conn.execute("SELECT last_seq FROM export_runs WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def prune_changes(conn):
+    """Drop row_changes entries at or below every named export's watermark; returns the count."""
+    return conn.execute(
+        "DELETE FROM row_changes WHERE seq <= (SELECT MIN(last_seq) FROM export_runs)"
+    ).rowcount
+
+
+# ----- queries -----
+
+def _select(table, since, until):
+    """(count sql, rows sql, params) for a full or incremental export."""
+    if since is None:
+        return f"SELECT COUNT(*) FROM {table}", f"SELECT * FROM {table} ORDER BY id", ()
+    changes = "FROM row_changes c WHERE c.table_name = ? AND c.seq > ? AND c.seq <= ?"
+    rows = f"""
+        SELECT CASE c.deleted WHEN 1 THEN 'deleted' ELSE 'changed' END AS change,
+               c.row_id AS row_id, t.*
+        FROM row_changes c LEFT JOIN {table} t ON t.id = c.row_id AND c.deleted = 0
+        WHERE c.table_name = ? AND c.seq > ? AND c.seq <= ?
+        ORDER BY c.row_id
+    """
+    return f"SELECT COUNT(*) {changes}", rows, (table, since, until)
+
+
+def _open_readonly(db_path):
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True)
+
+
+def _batches(cursor, size):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+
+# ----- writers -----
+
+def _write_csv(path, headers, batches, report):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for rows in batches:
+            writer.writerows(rows)
+            report(len(rows))
+
+
+def _append_sheet(workbook, title, headers, batches, report):
+    sheet = workbook.create_sheet(title=title[:31])   # Excel's sheet name limit
+    sheet.append(headers)
+    for rows in batches:
+        for row in rows:
+            sheet.append(row)
+        report(len(rows))
+
+
+def _export_table(db_path, table, out_path, fmt, since, until, batch_size, queue):
+    """Worker: stream one table into out_path, posting progress to queue."""
+    from openpyxl import Workbook
+
+    conn = _open_readonly(db_path)
+    try:
+        count_sql, rows_sql, params = _select(table, since, until)
+        total = conn.execute(count_sql, params).fetchone()[0]
+        done = 0
+
+        def report(n):
+            nonlocal done
+            done += n
+            if queue is not None:
+                queue.put((table, done, total))
+
+        if queue is not None:
+            queue.put((table, 0, total))
+        cursor = conn.execute(rows_sql, params)
+        headers = [d[0] for d in cursor.description]
+        batches = _batches(cursor, batch_size)
+        if fmt == "csv":
+            _write_csv(out_path, headers, batches, report)
+        else:
+            workbook = Workbook(write_only=True)
+            _append_sheet(workbook, table, headers, batches, report)
+            workbook.save(out_path)
+        return table, done
+    finally:
+        conn.close()
+
+
+# ----- driver -----
+
+class Exporter:
+    """
+    Exports tables of one database file.
+
+    `progress(table, rows_done, rows_total)` is called in the calling
+    process as workers report batches. Pass `name` to make the export
+    incremental: only rows changed since the last export of that name are
+    written, with a leading change column ('changed' or 'deleted'). The
+    first export of a name is a full one.
+    """
+
+    def __init__(self, db_path, tables=EXPORT_TABLES, fmt="xlsx", workers=None,
+                 batch_size=BATCH_SIZE, progress=None):
+        if fmt not in ("xlsx", "csv"):
+            raise ValueError(f"Unsupported export format: {fmt}")
+        self.db_path = db_path
+        self.tables = list(tables)
+        self.fmt = fmt
+        self.workers = workers or min(len(self.tables), os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.progress = progress
+
+    def _window(self, name):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            until = current_seq(conn)
+            since = last_export_seq(conn, name) if name else None
+        finally:
+            conn.close()
+        return since, until
+
+    def _record_run(self, name, until):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO export_runs (name, last_seq, exported_at) VALUES (?, ?, ?)",
+                    (name, until, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                )
+                prune_changes(conn)
+        finally:
+            conn.close()
+
+    def export(self, out_dir, name=None):
+        """
+        One file per table in out_dir, written in parallel.
+        Returns {table: (path, rows written)}.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        since, until = self._window(name)
+        manager = multiprocessing.Manager()
+        queue = manager.Queue()
+        results = {}
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {}
+                for table in self.tables:
+                    path = os.path.join(out_dir, f"{table}.{self.fmt}")
+                    future = pool.submit(_export_table, self.db_path, table, path, self.fmt,
+                                         since, until, self.batch_size, queue)
+                    futures[future] = path
+                pending = set(futures)
+                while pending:
+                    self._drain(queue, timeout=0.1)
+                    for future in [f for f in pending if f.done()]:
+                        pending.discard(future)
+                        table, rows = future.result()
+                        results[table] = (futures[future], rows)
+                self._drain(queue)
+        finally:
+            manager.shutdown()
+        if name:
+            self._record_run(name, until)
+        return results
+
+    def export_workbook(self, path, name=None):
+        """
+        All tables as sheets of a single workbook. openpyxl cannot share a
+        workbook across processes, so sheets are streamed one after another.
+        Returns {table: rows written}.
+        """
+        from openpyxl import Workbook
+
+        since, until = self._window(name)
+        workbook = Workbook(write_only=True)
+        results = {}
+        conn = _open_readonly(self.db_path)
+        try:
+            for table in self.tables:
+                count_sql, rows_sql, params = _select(table, since, until)
+                total = conn.execute(count_sql, params).fetchone()[0]
+                done = 0
+
+                def report(n, table=table, total=total):
+                    nonlocal done
+                    done += n
+                    if self.progress:
+                        self.progress(table, done, total)
+
+                if self.progress:
+                    self.progress(table, 0, total)
+                cursor = conn.execute(rows_sql, params)
+                headers = [d[0] for d in cursor.description]
+                _append_sheet(workbook, table, headers, _batches(cursor, self.batch_size), report)
+                results[table] = done
+        finally:
+            conn.close()
+        workbook.save(path)
+        if name:
+            self._record_run(name, until)
+        return results
+
+    def _drain(self, queue, timeout=None):
+        while True:
+            try:
+                message = queue.get(timeout=timeout) if timeout else queue.get_nowait()
+            except Empty:
+                return
+            timeout = None
+            if self.progress:
+                self.progress(*message)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream ledger tables to XLSX or CSV.")
+    parser.add_argument("db", help="database file")
+    parser.add_argument("out", help="output directory, or .xlsx file with --single")
+    parser.add_argument("--format", choices=("xlsx", "csv"), default="xlsx")
+    parser.add_argument("--single", action="store_true", help="one .xlsx workbook with a sheet per table")
+    parser.add_argument("--tables", nargs="+", default=EXPORT_TABLES)
+    parser.add_argument("--since-last", metavar="NAME", help="only rows changed since the last export NAME")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+    if args.single and args.format == "csv":
+        parser.error("--single writes one .xlsx workbook; it cannot be combined with --format csv")
+
+    from database.migrations import migrate
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    conn.close()
+
+    def progress(table, done, total):
+        if done == total:
+            print(f"  {table}: {done} rows")
+
+    exporter = Exporter(args.db, args.tables, args.format, args.workers, progress=progress)
+    if args.single:
+        exporter.export_workbook(args.out, args.since_last)
+    else:
+        exporter.export(args.out, args.since_last)
+    print(f"Exported to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
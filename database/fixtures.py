@@ -0,0 +1,118 @@
+"""
+In-memory template databases for tests and health checks.
+
+The fully migrated schema is built once per process in a private :memory:
+template; every fixture is a fresh :memory: connection filled from it with
+the SQLite backup API, which copies pages instead of replaying DDL. Clones
+are independent, so checks can run in parallel threads without sharing
+state or touching disk.
+
+A seeded template adds a small deterministic dataset. It is built once and
+kept as a snapshot file under .fixture_cache/, named after the schema
+version, so later runs only restore it:
+
+    conn = fixtures.clone()                 # empty, migrated
+    conn = fixtures.clone(seeded=True)      # with sample data
+"""
+import os
+import random
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+from database import bulk
+from database.migrations import latest_version, migrate
+
+
+CACHE_DIR = ".fixture_cache"
+SEED = 1234
+
+_lock = threading.Lock()
+_templates = {}
+
+
+def _new_memory():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def sample_seed(conn, days=120, seed=SEED):
+    """A small, deterministic dataset touching the high-volume tables."""
+    rng = random.Random(seed)
+    today = date(2025, 1, 1)
+    days_back = [(today - timedelta(days=d)).isoformat() for d in range(days)]
+    categories = ["Food", "Transport", "Utilities", "Entertainment", "Shopping"]
+    bulk.add_transactions_many(conn, (
+        (day, round(rng.uniform(5, 120), 2), rng.choice(categories), "EXPENSE", f"Purchase {i}")
+        for i, day in enumerate(days_back)
+    ))
+    bulk.add_transactions_many(conn, (
+        (day, 5000.0, "Salary", "INCOME", "Salary") for day in days_back[::30]
+    ))
+    bulk.add_health_metrics_many(conn, (
+        ("Weight", round(75 + rng.uniform(-2, 2), 1), "kg", day, "") for day in days_back[::7]
+    ))
+    bulk.add_fitness_logs_many(conn, (
+        (day, "Running", 30, 300, 5.0, "") for day in days_back[::3]
+    ))
+    bulk.add_time_logs_many(conn, (
+        ("Deep Work", "Work", day, "09:00", "12:00", 180, "") for day in days_back
+    ))
+
+
+def _snapshot_path():
+    return os.path.join(CACHE_DIR, f"seeded-v{latest_version()}-{SEED}.db")
+
+
+def _build(seeded):
+    template = _new_memory()
+    if not seeded:
+        migrate(template)
+        return template
+
+    snapshot = _snapshot_path()
+    if os.path.exists(snapshot):
+        source = sqlite3.connect(snapshot)
+        source.backup(template)
+        source.close()
+        return template
+
+    _template(False).backup(template)
+    sample_seed(template)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = snapshot + ".part"
+    target = sqlite3.connect(tmp)
+    template.backup(target)
+    target.close()
+    os.replace(tmp, snapshot)
+    return template
+
+
+def _template(seeded):
+    # Callers hold _lock
+    template = _templates.get(seeded)
+    if template is None:
+        template = _templates[seeded] = _build(seeded)
+    return template
+
+
+def load_into(conn, seeded=False):
+    """Overwrite `conn`'s database with a copy of the template."""
+    with _lock:
+        _template(seeded).backup(conn)
+    return conn
+
+
+def clone(seeded=False):
+    """A new, independent :memory: database with the migrated schema."""
+    conn = load_into(_new_memory(), seeded)
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def clear_snapshot_cache():
+    """Drop cached seeded snapshots, e.g. after changing sample_seed()."""
+    with _lock:
+        _templates.pop(True, None)
+        if os.path.isdir(CACHE_DIR):
+            for name in os.listdir(CACHE_DIR):
+                os.remove(os.path.join(CACHE_DIR, name))
@@ -0,0 +1,324 @@
+"""
+Incrementally maintained goal progress and habit streaks.
+
+goal_progress keeps, per goal, the running total and count of its goal_logs,
+the first and last logged day and the current and longest daily streak.
+Triggers on goal_logs update it on every insert, update and delete, so
+GoalView and the dashboard read one row per goal instead of every log.
+
+Streaks can be extended in place only by logs arriving in date order. A log
+written for an earlier day, or a deleted or re-dated one, flags the row
+dirty and refresh() recomputes just those goals from their logs (indexed on
+goal_id, date). refresh_after_writes(pool) does that on the pool's writer
+right after each commit, so reads stay read-only; get_progress() also
+recomputes any row still dirty in memory.
+
+progress_value = baseline + log_total, where baseline is whatever the goal
+started with outside of logs. The log triggers keep goals.current_value
+equal to it, and editing current_value directly moves the baseline.
+goals_progress adds the projected completion date from the pace so far.
+check() compares everything against a rebuild from the logs and can repair
+the cache and goals.current_value:
+
+    python -m database.goal_progress life_ledger.db --fix
+"""
+import argparse
+import sqlite3
+from datetime import date, datetime, timedelta
+
+
+WATCHED_TABLES = frozenset({"goals", "goal_logs"})
+
+
+def _sync_current_value(goal_id):
+    return f"""UPDATE goals SET current_value = (SELECT baseline + log_total FROM goal_progress WHERE goal_id = goals.id)
+        WHERE id = {goal_id}"""
+
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS goal_progress (
+        goal_id INTEGER PRIMARY KEY REFERENCES goals(id) ON DELETE CASCADE,
+        baseline REAL NOT NULL DEFAULT 0,
+        log_total REAL NOT NULL DEFAULT 0,
+        log_count INTEGER NOT NULL DEFAULT 0,
+        first_log_date TEXT,
+        last_log_date TEXT,
+        current_streak INTEGER NOT NULL DEFAULT 0,
+        longest_streak INTEGER NOT NULL DEFAULT 0,
+        dirty INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_goal_progress_dirty ON goal_progress (dirty) WHERE dirty = 1",
+    """CREATE TRIGGER IF NOT EXISTS trg_goals_progress_insert
+    AFTER INSERT ON goals
+    BEGIN
+        INSERT OR IGNORE INTO goal_progress (goal_id, baseline) VALUES (NEW.id, COALESCE(NEW.current_value, 0));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_goals_progress_delete
+    AFTER DELETE ON goals
+    BEGIN
+        DELETE FROM goal_progress WHERE goal_id = OLD.id;
+    END""",
+    # Also fires (as a no-op) when the log triggers below sync current_value
+    """CREATE TRIGGER IF NOT EXISTS trg_goals_progress_baseline
+    AFTER UPDATE OF current_value ON goals
+    BEGIN
+        UPDATE goal_progress SET baseline = COALESCE(NEW.current_value, 0) - log_total WHERE goal_id = NEW.id;
+    END""",
+    # In-order logs extend the streak in place; a log for an earlier day that
+    # adds a new day to the history marks the row dirty instead.
+    f"""CREATE TRIGGER IF NOT EXISTS trg_goal_logs_progress_insert
+    AFTER INSERT ON goal_logs
+    BEGIN
+        INSERT OR IGNORE INTO goal_progress (goal_id) VALUES (NEW.goal_id);
+        UPDATE goal_progress SET
+            log_total = log_total + NEW.value,
+            log_count = log_count + 1,
+            first_log_date = CASE WHEN first_log_date IS NULL OR date(NEW.date) < first_log_date
+                                  THEN date(NEW.date) ELSE first_log_date END,
+            current_streak = CASE
+                WHEN last_log_date IS NULL OR date(NEW.date) > date(last_log_date, '+1 day') THEN 1
+                WHEN date(NEW.date) = date(last_log_date, '+1 day') THEN current_streak + 1
+                ELSE current_streak END,
+            longest_streak = max(longest_streak, CASE
+                WHEN last_log_date IS NULL OR date(NEW.date) > date(last_log_date, '+1 day') THEN 1
+                WHEN date(NEW.date) = date(last_log_date, '+1 day') THEN current_streak + 1
+                ELSE current_streak END),
+            dirty = CASE
+                WHEN last_log_date IS NOT NULL AND date(NEW.date) < last_log_date
+                     AND NOT EXISTS (SELECT 1 FROM goal_logs l WHERE l.goal_id = NEW.goal_id
+                                     AND date(l.date) = date(NEW.date) AND l.id != NEW.id)
+                THEN 1 ELSE dirty END,
+            last_log_date = CASE WHEN last_log_date IS NULL OR date(NEW.date) > last_log_date
+                                 THEN date(NEW.date) ELSE last_log_date END
+        WHERE goal_id = NEW.goal_id;
+        {_sync_current_value("NEW.goal_id")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_goal_logs_progress_delete
+    AFTER DELETE ON goal_logs
+    BEGIN
+        UPDATE goal_progress SET
+            log_total = log_total - OLD.value,
+            log_count = log_count - 1,
+            dirty = CASE WHEN EXISTS (SELECT 1 FROM goal_logs l WHERE l.goal_id = OLD.goal_id
+                                      AND date(l.date) = date(OLD.date))
+                         THEN dirty ELSE 1 END
+        WHERE goal_id = OLD.goal_id;
+        {_sync_current_value("OLD.goal_id")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_goal_logs_progress_update
+    AFTER UPDATE OF goal_id, value, date ON goal_logs
+    BEGIN
+        UPDATE goal_progress SET log_total = log_total - OLD.value, log_count = log_count - 1
+        WHERE goal_id = OLD.goal_id;
+        INSERT OR IGNORE INTO goal_progress (goal_id) VALUES (NEW.goal_id);
+        UPDATE goal_progress SET log_total = log_total + NEW.value, log_count = log_count + 1
+        WHERE goal_id = NEW.goal_id;
+        UPDATE goal_progress SET dirty = 1
+        WHERE goal_id IN (OLD.goal_id, NEW.goal_id)
+          AND (OLD.goal_id != NEW.goal_id OR date(OLD.date) != date(NEW.date));
+        {_sync_current_value("OLD.goal_id")};
+        {_sync_current_value("NEW.goal_id")};
+    END""",
+    # Streak counts only while it is still alive (logged today or yesterday).
+    """CREATE VIEW IF NOT EXISTS goals_progress AS
+    SELECT g.*,
+           p.log_total, p.log_count, p.first_log_date, p.last_log_date,
+           p.baseline + p.log_total AS progress_value,
+           CASE WHEN p.last_log_date >= date('now', 'localtime', '-1 day')
+                THEN p.current_streak ELSE 0 END AS current_streak,
+           p.longest_streak,
+           CASE
+               WHEN g.target_value IS NULL THEN NULL
+               WHEN p.baseline + p.log_total >= g.target_value THEN p.last_log_date
+               WHEN p.log_total > 0 THEN date('now', 'localtime', '+' || CAST(
+                   (g.target_value - p.baseline - p.log_total) * max(1,
+                       julianday('now', 'localtime') - julianday(COALESCE(g.start_date, p.first_log_date)))
+                   / p.log_total + 0.999 AS INTEGER) || ' days')
+           END AS projected_completion
+    FROM goals g
+    JOIN goal_progress p ON p.goal_id = g.id""",
+]
+
+
+def _streaks(days):
+    """(current, longest) over sorted distinct ISO days; current ends at the last day."""
+    current = longest = 0
+    previous = None
+    for day in days:
+        parsed = datetime.strptime(day, "%Y-%m-%d").date()
+        current = current + 1 if previous is not None and parsed - previous == timedelta(days=1) else 1
+        longest = max(longest, current)
+        previous = parsed
+    return current, longest
+
+
+def _from_logs(conn, goal_id):
+    total, count, first, last = conn.execute(
+        "SELECT COALESCE(SUM(value), 0), COUNT(*), MIN(date(date)), MAX(date(date)) FROM goal_logs WHERE goal_id = ?",
+        (goal_id,),
+    ).fetchone()
+    days = [row[0] for row in conn.execute(
+        "SELECT DISTINCT date(date) AS day FROM goal_logs WHERE goal_id = ? AND day IS NOT NULL ORDER BY day",
+        (goal_id,),
+    )]
+    current, longest = _streaks(days)
+    return {
+        "log_total": total, "log_count": count, "first_log_date": first, "last_log_date": last,
+        "current_streak": current, "longest_streak": longest,
+    }
+
+
+def _store(conn, goal_id, values):
+    conn.execute(
+        """UPDATE goal_progress SET log_total = ?, log_count = ?, first_log_date = ?, last_log_date = ?,
+                  current_streak = ?, longest_streak = ?, dirty = 0
+           WHERE goal_id = ?""",
+        (values["log_total"], values["log_count"], values["first_log_date"], values["last_log_date"],
+         values["current_streak"], values["longest_streak"], goal_id),
+    )
+
+
+def create_schema(conn):
+    for sql in SCHEMA:
+        conn.execute(sql)
+    # Existing goals: whatever current_value holds beyond the logs is the baseline
+    conn.execute("""
+        INSERT OR IGNORE INTO goal_progress (goal_id, baseline)
+        SELECT g.id, COALESCE(g.current_value, 0)
+               - COALESCE((SELECT SUM(value) FROM goal_logs l WHERE l.goal_id = g.id), 0)
+        FROM goals g
+    """)
+    for (goal_id,) in conn.execute("SELECT goal_id FROM goal_progress").fetchall():
+        _store(conn, goal_id, _from_logs(conn, goal_id))
+
+
+def recreate_triggers(conn):
+    """Replace triggers created by an older SCHEMA and sync goals.current_value."""
+    for name in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_goal_logs_progress_{name}")
+    for sql in SCHEMA:
+        conn.execute(sql)
+    conn.execute(_sync_current_value("goals.id"))
+
+
+def _dirty_goals(conn):
+    return [row[0] for row in conn.execute("SELECT goal_id FROM goal_progress WHERE dirty = 1")]
+
+
+def _refresh_dirty(conn):
+    dirty = _dirty_goals(conn)
+    for goal_id in dirty:
+        _store(conn, goal_id, _from_logs(conn, goal_id))
+    return len(dirty)
+
+
+def refresh(conn):
+    """Recompute streaks of goals flagged dirty; returns how many were rebuilt."""
+    if not _dirty_goals(conn):
+        return 0
+    with conn:
+        return _refresh_dirty(conn)
+
+
+def refresh_after_writes(pool):
+    """
+    Refresh dirty goals on `pool`'s writer after every commit that touches
+    goals or goal_logs, so goals_progress read through the pool is current.
+    Returns the listener, for pool.remove_write_listener().
+    """
+    def on_write(tables):
+        if tables is not None and not tables & WATCHED_TABLES:
+            return
+        if not _dirty_goals(pool.writer):
+            return
+        with pool.write_transaction(["goal_progress"]) as conn:
+            _refresh_dirty(conn)
+
+    pool.add_write_listener(on_write)
+    return on_write
+
+
+def get_progress(conn, goal_id=None):
+    """
+    goals_progress rows as dicts (all goals, or one). Read-only: streaks of
+    goals still flagged dirty are recomputed from their logs in memory.
+    """
+    query = "SELECT * FROM goals_progress"
+    params = ()
+    if goal_id is not None:
+        query += " WHERE id = ?"
+        params = (goal_id,)
+    cursor = conn.execute(query + " ORDER BY id", params)
+    names = [d[0] for d in cursor.description]
+    rows = [dict(zip(names, row)) for row in cursor]
+
+    dirty = set(_dirty_goals(conn))
+    alive_since = (date.today() - timedelta(days=1)).isoformat()
+    for row in rows:
+        if row["id"] in dirty:
+            values = _from_logs(conn, row["id"])
+            alive = values["last_log_date"] is not None and values["last_log_date"] >= alive_since
+            row.update(
+                first_log_date=values["first_log_date"],
+                last_log_date=values["last_log_date"],
+                current_streak=values["current_streak"] if alive else 0,
+                longest_streak=values["longest_streak"],
+            )
+    return rows
+
+
+def check(conn, fix=False):
+    """
+    Compare the cached progress with a rebuild from goal_logs, and
+    goals.current_value with baseline + log total. Returns a list of
+    (goal_id, field, cached, expected); with fix=True both are repaired.
+    """
+    problems = []
+    rows = conn.execute("""
+        SELECT g.id, g.current_value, p.goal_id, p.baseline, p.log_total, p.log_count, p.first_log_date,
+               p.last_log_date, p.current_streak, p.longest_streak
+        FROM goals g LEFT JOIN goal_progress p ON p.goal_id = g.id
+    """).fetchall()
+    fields = ("log_total", "log_count", "first_log_date", "last_log_date", "current_streak", "longest_streak")
+    with conn:
+        for goal_id, current_value, cached_id, baseline, *cached in rows:
+            expected = _from_logs(conn, goal_id)
+            if cached_id is None:
+                problems.append((goal_id, "goal_progress", None, "missing"))
+                if fix:
+                    conn.execute("INSERT INTO goal_progress (goal_id, baseline) VALUES (?, ?)",
+                                 (goal_id, (current_value or 0) - expected["log_total"]))
+                    _store(conn, goal_id, expected)
+                continue
+            for field, value in zip(fields, cached):
+                wanted = expected[field]
+                if isinstance(wanted, float) and value is not None and abs(value - wanted) < 1e-6:
+                    continue
+                if value != wanted:
+                    problems.append((goal_id, field, value, wanted))
+            if fix:
+                _store(conn, goal_id, expected)
+            progress_value = baseline + expected["log_total"]
+            if current_value is None or abs(current_value - progress_value) > 1e-6:
+                problems.append((goal_id, "goals.current_value", current_value, progress_value))
+                if fix:
+                    # After _store: the baseline trigger reads the corrected log_total
+                    conn.execute("UPDATE goals SET current_value = ? WHERE id = ?", (progress_value, goal_id))
+    return problems
+
+
+if __name__ == "__main__":
+    from database.migrations import migrate
+
+    parser = argparse.ArgumentParser(description="Check cached goal progress against goal_logs.")
+    parser.add_argument("db", nargs="?", default="life_ledger.db")
+    parser.add_argument("--fix", action="store_true", help="rebuild the cache and sync goals.current_value")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    problems = check(conn, fix=args.fix)
+    for goal_id, field, cached, expected in problems:
+        print(f"goal {goal_id}: {field} is {cached!r}, expected {expected!r}")
+    print(f"{len(problems)} problem(s){' fixed' if args.fix and problems else ''}")
+    conn.close()
@@ -0,0 +1,515 @@
+"""
+Streaming bank statement importer (OFX, QFX, CSV, XLSX).
+
+A worker process parses the statement and hands rows over in fixed-size
+chunks through a bounded queue, so memory stays flat whatever the statement
+size. The main process then, per chunk:
+
+  * fingerprints every row and drops the ones already in the ledger
+    (transaction_fingerprints is a hashed, primary-key indexed lookup),
+  * classifies the whole chunk with the compiled category_suggestions matcher
+    (the rows are listed in auto_categorized until the user recategorizes them),
+  * inserts the chunk with executemany (search indexing and change logging
+    deferred to one statement per chunk, see database.bulk) and advances the
+    import checkpoint in one transaction.
+
+Transactions entered or edited anywhere else are queued by triggers in
+transaction_fingerprint_queue and fingerprinted before the next import, so a
+hand-entered row is recognised when the bank statement brings it in again.
+
+An interrupted import resumes from its last committed chunk:
+
+    python -m database.importer statement.ofx [life_ledger.db]
+"""
+import csv
+import hashlib
+import multiprocessing
+import os
+import queue as queue_module
+import re
+import sqlite3
+import sys
+from datetime import date, datetime
+
+from dateutil import parser as date_parser
+
+from database import bulk
+from database.categorizer import DEFAULT_CATEGORY, Categorizer
+
+
+CHUNK_SIZE = 2000
+QUEUE_CHUNKS = 4
+QUEUE_POLL_SECONDS = 1.0
+LOOKUP_BATCH = 500
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS transaction_fingerprints (
+        fingerprint TEXT PRIMARY KEY,
+        transaction_id INTEGER NOT NULL
+    ) WITHOUT ROWID""",
+    """CREATE INDEX IF NOT EXISTS idx_transaction_fingerprints_transaction
+    ON transaction_fingerprints (transaction_id)""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_fingerprint_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        DELETE FROM transaction_fingerprints WHERE transaction_id = OLD.id;
+    END""",
+    """CREATE TABLE IF NOT EXISTS import_checkpoints (
+        source_hash TEXT PRIMARY KEY,
+        file_name TEXT,
+        rows_done INTEGER NOT NULL DEFAULT 0,
+        inserted INTEGER NOT NULL DEFAULT 0,
+        duplicates INTEGER NOT NULL DEFAULT 0,
+        started_at TEXT,
+        finished_at TEXT
+    )""",
+]
+
+# Fingerprints are SHA-1 hashes computed in Python, which a trigger can't do on
+# connections that never registered a function, so triggers only queue ids.
+# Edits queue the row too: its old fingerprints stay, so the statement line it
+# was imported from is still recognised, and the edited values are added.
+FINGERPRINT_QUEUE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS transaction_fingerprint_queue (
+        transaction_id INTEGER PRIMARY KEY
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_fingerprint_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT OR IGNORE INTO transaction_fingerprint_queue (transaction_id) VALUES (NEW.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_transactions_fingerprint_update
+    AFTER UPDATE OF date, amount, type, description ON transactions
+    BEGIN
+        INSERT OR IGNORE INTO transaction_fingerprint_queue (transaction_id) VALUES (NEW.id);
+    END""",
+]
+
+
+# ----- fingerprints -----
+
+def normalize_description(text):
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+def fingerprint(row, occurrence=0):
+    """
+    Stable hash of a transaction. Bank ids (OFX FITID) win when present;
+    otherwise date, amount in cents, type and description are hashed along
+    with how many identical rows came before it, so two genuine identical
+    coffees on the same day are both kept.
+    """
+    if row.get("fitid"):
+        basis = f"fitid|{row['fitid']}"
+    else:
+        basis = "|".join((
+            row["date"], str(round(row["amount"] * 100)), row["type"],
+            normalize_description(row["description"]), str(occurrence),
+        ))
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()
+
+
+def occurrence_key(row):
+    """Compact key for counting identical rows; a few bytes of state per distinct row."""
+    return int(fingerprint(dict(row, fitid=None))[:16], 16)
+
+
+def _backfill_fingerprints(conn):
+    seen = {}
+    rows = conn.execute(
+        "SELECT id, date, amount, type, description FROM transactions ORDER BY id"
+    )
+    batch = []
+    for trans_id, trans_date, amount, trans_type, description in rows:
+        row = {"date": trans_date, "amount": amount, "type": trans_type, "description": description}
+        base = occurrence_key(row)
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        batch.append((fingerprint(row, occurrence), trans_id))
+    conn.executemany(
+        "INSERT OR IGNORE INTO transaction_fingerprints (fingerprint, transaction_id) VALUES (?, ?)",
+        batch,
+    )
+
+
+def create_schema(conn):
+    for sql in SCHEMA:
+        conn.execute(sql)
+    _backfill_fingerprints(conn)
+
+
+def create_fingerprint_queue(conn):
+    for sql in FINGERPRINT_QUEUE_SCHEMA:
+        conn.execute(sql)
+    # Rows written between the fingerprint backfill and this migration
+    conn.execute("""
+        INSERT OR IGNORE INTO transaction_fingerprint_queue (transaction_id)
+        SELECT t.id FROM transactions t
+        WHERE NOT EXISTS (SELECT 1 FROM transaction_fingerprints f WHERE f.transaction_id = t.id)
+    """)
+
+
+def fingerprint_queued(conn):
+    """
+    Fingerprint transactions queued by the insert/update triggers. Each gets
+    the first occurrence number not yet taken by another transaction, the
+    same numbering an import of identical rows uses. Returns how many.
+    """
+    rows = conn.execute("""
+        SELECT q.transaction_id, t.date, t.amount, t.type, t.description
+        FROM transaction_fingerprint_queue q
+        LEFT JOIN transactions t ON t.id = q.transaction_id
+        ORDER BY q.transaction_id
+    """).fetchall()
+    if not rows:
+        return 0
+    with conn:
+        for trans_id, trans_date, amount, trans_type, description in rows:
+            if trans_date is not None:
+                row = {"date": trans_date, "amount": amount, "type": trans_type, "description": description}
+                occurrence = 0
+                while True:
+                    fp = fingerprint(row, occurrence)
+                    owner = conn.execute(
+                        "SELECT transaction_id FROM transaction_fingerprints WHERE fingerprint = ?", (fp,)
+                    ).fetchone()
+                    if owner is None:
+                        conn.execute(
+                            "INSERT INTO transaction_fingerprints (fingerprint, transaction_id) VALUES (?, ?)",
+                            (fp, trans_id),
+                        )
+                        break
+                    if owner[0] == trans_id:
+                        break
+                    occurrence += 1
+            conn.execute("DELETE FROM transaction_fingerprint_queue WHERE transaction_id = ?", (trans_id,))
+    return len(rows)
+
+
+# ----- parsing (runs in the worker process) -----
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()
+    if re.fullmatch(r"\d{8}.*", text):   # OFX: YYYYMMDD[HHMMSS[.XXX]][tz]
+        return f"{text[0:4]}-{text[4:6]}-{text[6:8]}"
+    return date_parser.parse(text).strftime("%Y-%m-%d")
+
+
+def _to_amount(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(",", "").replace("$", "")
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    return float(text) if text else 0.0
+
+
+def _make_row(raw_date, amount, description, fitid=None):
+    return {
+        "date": _to_date(raw_date),
+        "amount": abs(amount),
+        "type": "INCOME" if amount > 0 else "EXPENSE",
+        "description": (description or "").strip(),
+        "fitid": fitid,
+    }
+
+
+_OFX_TAG = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+def iter_ofx(path):
+    """
+    Stream <STMTTRN> blocks from an OFX/QFX file (SGML or XML flavour)
+    without building the whole statement tree in memory.
+    """
+    block = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            for tag, value in _OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    block = {}
+                elif block is not None:
+                    block[tag] = value.strip()
+            if block is not None and "</STMTTRN>" in line.upper():
+                if "DTPOSTED" in block and "TRNAMT" in block:
+                    description = block.get("NAME") or block.get("MEMO") or ""
+                    if block.get("MEMO") and block.get("NAME") and block["MEMO"] != block["NAME"]:
+                        description = f"{block['NAME']} {block['MEMO']}"
+                    yield _make_row(block["DTPOSTED"], _to_amount(block["TRNAMT"]),
+                                    description, block.get("FITID"))
+                block = None
+
+
+_DATE_HEADERS = ("date", "posted date", "transaction date", "posting date", "booking date")
+_DESC_HEADERS = ("description", "payee", "name", "memo", "details", "narrative")
+_AMOUNT_HEADERS = ("amount", "value", "transaction amount")
+_DEBIT_HEADERS = ("debit", "withdrawal", "money out", "paid out")
+_CREDIT_HEADERS = ("credit", "deposit", "money in", "paid in")
+
+
+def _find(headers, names):
+    for name in names:
+        if name in headers:
+            return headers.index(name)
+    return None
+
+
+def _iter_table_rows(header, rows):
+    headers = [str(h or "").strip().lower() for h in header]
+    date_col = _find(headers, _DATE_HEADERS)
+    desc_col = _find(headers, _DESC_HEADERS)
+    amount_col = _find(headers, _AMOUNT_HEADERS)
+    debit_col = _find(headers, _DEBIT_HEADERS)
+    credit_col = _find(headers, _CREDIT_HEADERS)
+    if date_col is None or (amount_col is None and debit_col is None and credit_col is None):
+        raise ValueError(f"Unrecognised statement columns: {header}")
+
+    for values in rows:
+        if not values or values[date_col] in (None, ""):
+            continue
+        if amount_col is not None:
+            amount = _to_amount(values[amount_col])
+        else:
+            credit = _to_amount(values[credit_col]) if credit_col is not None and values[credit_col] not in (None, "") else 0.0
+            debit = _to_amount(values[debit_col]) if debit_col is not None and values[debit_col] not in (None, "") else 0.0
+            amount = credit - abs(debit)
+        description = values[desc_col] if desc_col is not None else ""
+        yield _make_row(values[date_col], amount, str(description or ""))
+
+
+def iter_csv(path):
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield from _iter_table_rows(header, reader)
+
+
+def iter_xlsx(path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is not None:
+            yield from _iter_table_rows(header, rows)
+    finally:
+        workbook.close()
+
+
+PARSERS = {
+    ".ofx": iter_ofx,
+    ".qfx": iter_ofx,
+    ".csv": iter_csv,
+    ".xlsx": iter_xlsx,
+}
+
+
+def iter_statement(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in PARSERS:
+        raise ValueError(f"Unsupported statement format: {ext}")
+    return PARSERS[ext](path)
+
+
+def _parse_worker(path, skip, chunk_size, queue):
+    """Worker process: parse `path`, skip already-imported rows, send chunks."""
+    try:
+        chunk = []
+        for index, row in enumerate(iter_statement(path)):
+            if index < skip:
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                queue.put(("rows", chunk))
+                chunk = []
+        if chunk:
+            queue.put(("rows", chunk))
+        queue.put(("done", None))
+    except Exception as e:
+        queue.put(("error", f"{type(e).__name__}: {e}"))
+
+
+# ----- import (main process) -----
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StatementImporter:
+    """
+    Imports one statement file into the ledger.
+
+    `progress` is called after every committed chunk with a dict of
+    rows_done / inserted / duplicates counters.
+    """
+
+    def __init__(self, conn, chunk_size=CHUNK_SIZE, progress=None, categorizer=None):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.categorizer = categorizer or Categorizer(DEFAULT_CATEGORY)
+
+    def _checkpoint(self, source_hash, path):
+        row = self.conn.execute(
+            "SELECT rows_done, inserted, duplicates, finished_at FROM import_checkpoints WHERE source_hash = ?",
+            (source_hash,),
+        ).fetchone()
+        if row is None:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO import_checkpoints (source_hash, file_name, started_at) VALUES (?, ?, ?)",
+                    (source_hash, os.path.basename(path), datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                )
+            return {"rows_done": 0, "inserted": 0, "duplicates": 0, "finished_at": None}
+        return dict(zip(("rows_done", "inserted", "duplicates", "finished_at"), row))
+
+    def _existing_fingerprints(self, fingerprints):
+        found = set()
+        for start in range(0, len(fingerprints), LOOKUP_BATCH):
+            batch = fingerprints[start:start + LOOKUP_BATCH]
+            found.update(row[0] for row in self.conn.execute(
+                f"SELECT fingerprint FROM transaction_fingerprints "
+                f"WHERE fingerprint IN ({', '.join('?' for _ in batch)})",
+                batch,
+            ))
+        return found
+
+    def _write_chunk(self, source_hash, chunk, state, occurrences):
+        categories = self.categorizer.classify_many(self.conn, (row["description"] for row in chunk))
+        fingerprints = []
+        for row in chunk:
+            base = occurrence_key(row)
+            occurrence = occurrences.get(base, 0)
+            occurrences[base] = occurrence + 1
+            fingerprints.append(fingerprint(row, occurrence))
+
+        with self.conn:
+            seen = self._existing_fingerprints(fingerprints)
+            new = []
+            for fp, row, category in zip(fingerprints, chunk, categories):
+                if fp in seen:
+                    continue
+                seen.add(fp)
+                new.append((fp, (row["date"], row["amount"], category, row["type"], row["description"])))
+            if new:
+                with bulk.deferred_row_triggers(self.conn, "transactions"):
+                    self.conn.executemany(
+                        f"INSERT INTO transactions ({', '.join(bulk.TRANSACTION_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                        (values for _fp, values in new),
+                    )
+                    # read before the deferred indexing inserts move last_insert_rowid;
+                    # AUTOINCREMENT ids of one uninterrupted write transaction are consecutive
+                    last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                first_id = last_id - len(new) + 1
+                self.conn.executemany(
+                    "INSERT INTO transaction_fingerprints (fingerprint, transaction_id) VALUES (?, ?)",
+                    ((fp, first_id + i) for i, (fp, _values) in enumerate(new)),
+                )
+                self.conn.execute(
+                    "DELETE FROM transaction_fingerprint_queue WHERE transaction_id BETWEEN ? AND ?",
+                    (first_id, last_id),
+                )
+                self.conn.execute(
+                    "INSERT INTO auto_categorized (transaction_id) "
+                    "SELECT id FROM transactions WHERE id BETWEEN ? AND ?",
+                    (first_id, last_id),
+                )
+            inserted = len(new)
+            duplicates = len(chunk) - inserted
+            state["rows_done"] += len(chunk)
+            state["inserted"] += inserted
+            state["duplicates"] += duplicates
+            self.conn.execute(
+                "UPDATE import_checkpoints SET rows_done = ?, inserted = ?, duplicates = ? WHERE source_hash = ?",
+                (state["rows_done"], state["inserted"], state["duplicates"], source_hash),
+            )
+
+    def import_file(self, path):
+        """Import `path`, resuming if a previous run stopped part-way. Returns the counters."""
+        source_hash = file_hash(path)
+        state = self._checkpoint(source_hash, path)
+        if state["finished_at"]:
+            return state
+
+        fingerprint_queued(self.conn)
+        occurrences = self._replay_occurrences(path, state["rows_done"])
+
+        queue = multiprocessing.Queue(maxsize=QUEUE_CHUNKS)
+        worker = multiprocessing.Process(
+            target=_parse_worker, args=(path, state["rows_done"], self.chunk_size, queue), daemon=True
+        )
+        worker.start()
+        try:
+            while True:
+                try:
+                    kind, payload = queue.get(timeout=QUEUE_POLL_SECONDS)
+                except queue_module.Empty:
+                    if worker.is_alive():
+                        continue
+                    raise RuntimeError(f"Parser process for {path} exited with code {worker.exitcode}")
+                if kind == "done":
+                    break
+                if kind == "error":
+                    raise ValueError(f"Could not parse {path}: {payload}")
+                self._write_chunk(source_hash, payload, state, occurrences)
+                if self.progress:
+                    self.progress(dict(state))
+        finally:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+        with self.conn:
+            state["finished_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.conn.execute(
+                "UPDATE import_checkpoints SET finished_at = ? WHERE source_hash = ?",
+                (state["finished_at"], source_hash),
+            )
+        return state
+
+    def _replay_occurrences(self, path, rows_done):
+        """Rebuild duplicate-occurrence counters for rows a resumed import already committed."""
+        occurrences = {}
+        if not rows_done:
+            return occurrences
+        for index, row in enumerate(iter_statement(path)):
+            if index >= rows_done:
+                break
+            base = occurrence_key(row)
+            occurrences[base] = occurrences.get(base, 0) + 1
+        return occurrences
+
+
+def import_statement(db_path, path, progress=None):
+    from database.migrations import migrate
+
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate(conn)
+        return StatementImporter(conn, progress=progress).import_file(path)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python -m database.importer STATEMENT [DB]")
+        sys.exit(2)
+
+    def report(state):
+        print(f"  {state['rows_done']} rows read, {state['inserted']} new, {state['duplicates']} duplicates")
+
+    result = import_statement(sys.argv[2] if len(sys.argv) > 2 else "life_ledger.db", sys.argv[1], report)
+    print(f"Imported {result['inserted']} transactions ({result['duplicates']} duplicates skipped)")
@@ -0,0 +1,539 @@
+"""
+Versioned schema migrations for the ledger database.
+
+Every migration is a (version, description, apply) entry. The version a file
+has reached is stored in PRAGMA user_version, so migrate() can be pointed at
+any ledger file, old or new, and only applies what that file is missing.
+Each migration runs in its own transaction together with the version bump,
+which makes an interrupted upgrade safe to re-run.
+
+Run as a script to upgrade files in place and compare query plans:
+
+    python -m database.migrations life_ledger.db other.db
+"""
+import sqlite3
+import sys
+
+from database import (
+    aggregates, alerts, attachment_store, categorizer, depreciation, export, goal_progress, importer, networth, search, time_intervals, timeseries,
+)
+
+
+# Tables as the application originally created them (version 1).
+BASE_TABLES = [
+    """CREATE TABLE IF NOT EXISTS transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        amount REAL NOT NULL,
+        category TEXT NOT NULL,
+        type TEXT CHECK(type IN ('INCOME', 'EXPENSE')) NOT NULL,
+        description TEXT,
+        related_id INTEGER,
+        related_table TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS inventory (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        purchase_price REAL,
+        current_value REAL,
+        purchase_date TEXT,
+        category TEXT,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS contacts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT,
+        phone TEXT,
+        birthday TEXT,
+        last_contacted TEXT,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS debts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contact_id INTEGER NOT NULL,
+        amount REAL NOT NULL,
+        type TEXT CHECK(type IN ('OWED_TO_ME', 'I_OWE')) NOT NULL,
+        description TEXT,
+        due_date TEXT,
+        is_settled BOOLEAN DEFAULT 0,
+        FOREIGN KEY (contact_id) REFERENCES contacts(id) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS financial_assets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        value REAL NOT NULL,
+        institution TEXT,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS loans (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        principal_amount REAL NOT NULL,
+        current_balance REAL NOT NULL,
+        interest_rate REAL,
+        due_date TEXT,
+        institution TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS insurance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        premium_amount REAL NOT NULL,
+        payment_frequency TEXT,
+        coverage_amount REAL,
+        renewal_date TEXT,
+        policy_number TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS savings_goals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        target_amount REAL NOT NULL,
+        current_amount REAL NOT NULL,
+        deadline TEXT,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS recurring_transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        amount REAL NOT NULL,
+        category TEXT NOT NULL,
+        type TEXT NOT NULL,
+        frequency TEXT NOT NULL,
+        start_date TEXT NOT NULL,
+        last_processed TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS budgets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT UNIQUE NOT NULL,
+        monthly_limit REAL NOT NULL,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS health_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        type TEXT NOT NULL,
+        value REAL NOT NULL,
+        unit TEXT,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS medications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        dosage TEXT,
+        frequency TEXT,
+        start_date TEXT,
+        is_active BOOLEAN DEFAULT 1,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS fitness_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        activity_type TEXT NOT NULL,
+        duration_min INTEGER,
+        calories INTEGER,
+        distance_km REAL,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS body_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        weight_kg REAL,
+        body_fat_pct REAL,
+        muscle_mass_kg REAL
+    )""",
+    """CREATE TABLE IF NOT EXISTS attachments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        related_id INTEGER NOT NULL,
+        related_table TEXT NOT NULL,
+        file_path TEXT NOT NULL,
+        file_name TEXT NOT NULL,
+        uploaded_at TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS category_suggestions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        description_keyword TEXT NOT NULL UNIQUE,
+        suggested_category TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        start_date TEXT,
+        end_date TEXT,
+        location TEXT,
+        budget REAL DEFAULT 0,
+        notes TEXT,
+        status TEXT DEFAULT 'Planning'
+    )""",
+    """CREATE TABLE IF NOT EXISTS event_tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id INTEGER NOT NULL,
+        description TEXT NOT NULL,
+        is_completed BOOLEAN DEFAULT 0,
+        FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS goals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL, -- 'SAVINGS' or 'HABIT'
+        target_value REAL,   -- Amount for savings, target frequency for habits
+        current_value REAL DEFAULT 0,
+        start_date TEXT,
+        end_date TEXT,
+        person_id INTEGER,   -- Optional link to contacts
+        status TEXT DEFAULT 'Active',
+        notes TEXT,
+        FOREIGN KEY (person_id) REFERENCES contacts(id) ON DELETE SET NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS goal_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        goal_id INTEGER NOT NULL,
+        value REAL NOT NULL, -- Amount saved or 1 for habit check
+        date TEXT NOT NULL,
+        note TEXT,
+        FOREIGN KEY (goal_id) REFERENCES goals(id) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS digital_subscriptions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        cost REAL NOT NULL,
+        billing_cycle TEXT NOT NULL,
+        next_renewal TEXT,
+        provider TEXT,
+        notes TEXT,
+        is_active BOOLEAN DEFAULT 1
+    )""",
+    """CREATE TABLE IF NOT EXISTS digital_accounts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        service_name TEXT NOT NULL,
+        username TEXT NOT NULL,
+        category TEXT NOT NULL,
+        has_2fa BOOLEAN DEFAULT 0,
+        last_password_change TEXT,
+        email TEXT,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS digital_assets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        asset_type TEXT NOT NULL,
+        value REAL,
+        renewal_date TEXT,
+        provider TEXT,
+        notes TEXT,
+        is_active BOOLEAN DEFAULT 1
+    )""",
+    """CREATE TABLE IF NOT EXISTS books (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        author TEXT,
+        status TEXT DEFAULT 'To Read', -- To Read, Reading, Read
+        rating INTEGER,
+        notes TEXT,
+        cover_url TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS courses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        platform TEXT, -- Coursera, Udemy, etc.
+        progress_pct INTEGER DEFAULT 0,
+        status TEXT DEFAULT 'Not Started',
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        content TEXT,
+        category TEXT,
+        created_at TEXT,
+        tags TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT,
+        status TEXT DEFAULT 'Planning',
+        deadline TEXT,
+        priority TEXT DEFAULT 'Medium'
+    )""",
+    """CREATE TABLE IF NOT EXISTS project_tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        status TEXT DEFAULT 'To Do', -- To Do, In Progress, Done
+        assigned_to TEXT,
+        due_date TEXT,
+        FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        category TEXT,
+        file_path TEXT,
+        expiry_date TEXT,
+        is_secure BOOLEAN DEFAULT 0,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS pantry_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        quantity TEXT,
+        expiry_date TEXT,
+        category TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS recipes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        ingredients TEXT, -- JSON or Text blob
+        instructions TEXT,
+        prep_time_mins INTEGER,
+        category TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS meal_plans (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        meal_type TEXT NOT NULL, -- Breakfast, Lunch, Dinner
+        recipe_id INTEGER,
+        description TEXT,
+        FOREIGN KEY (recipe_id) REFERENCES recipes(id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS system_alerts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        message TEXT NOT NULL,
+        severity TEXT DEFAULT 'Info', -- Info, Warning, Critical
+        created_at TEXT,
+        is_read BOOLEAN DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS time_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        activity TEXT NOT NULL,
+        category TEXT NOT NULL,
+        date TEXT NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        duration_minutes INTEGER,
+        notes TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS note_links (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_id INTEGER NOT NULL,
+        target_id INTEGER NOT NULL,
+        link_type TEXT DEFAULT 'relates_to',
+        notes TEXT,
+        FOREIGN KEY (source_id) REFERENCES notes(id) ON DELETE CASCADE,
+        FOREIGN KEY (target_id) REFERENCES notes(id) ON DELETE CASCADE,
+        UNIQUE(source_id, target_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS interactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contact_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        type TEXT,
+        summary TEXT,
+        sentiment TEXT,
+        FOREIGN KEY (contact_id) REFERENCES contacts(id) ON DELETE CASCADE
+    )""",
+]
+
+# Columns that were bolted on later with ad-hoc ALTER TABLE statements.
+ADDED_COLUMNS = [
+    ("inventory", "last_depreciated", "TEXT"),
+    ("contacts", "category", "TEXT DEFAULT 'General'"),
+    ("contacts", "is_favorite", "BOOLEAN DEFAULT 0"),
+    ("contacts", "contact_frequency_days", "INTEGER DEFAULT 30"),
+]
+
+# (index name, table, columns) for the filters and joins the views use.
+INDEXES = [
+    ("idx_transactions_date", "transactions", "date"),
+    ("idx_transactions_category_date", "transactions", "category, date"),
+    ("idx_transactions_type_date", "transactions", "type, date"),
+    ("idx_health_metrics_type_date", "health_metrics", "type, date"),
+    ("idx_fitness_logs_date", "fitness_logs", "date"),
+    ("idx_body_metrics_date", "body_metrics", "date"),
+    ("idx_time_logs_date", "time_logs", "date"),
+    ("idx_goal_logs_goal_date", "goal_logs", "goal_id, date"),
+    ("idx_debts_contact", "debts", "contact_id"),
+    ("idx_interactions_contact_date", "interactions", "contact_id, date"),
+    ("idx_event_tasks_event", "event_tasks", "event_id"),
+    ("idx_project_tasks_project", "project_tasks", "project_id"),
+    ("idx_meal_plans_date", "meal_plans", "date"),
+    ("idx_attachments_related", "attachments", "related_table, related_id"),
+    ("idx_system_alerts_read_created", "system_alerts", "is_read, created_at"),
+]
+
+
+def table_exists(conn, table):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def column_names(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def add_column(conn, table, column, declaration):
+    """ALTER TABLE ... ADD COLUMN unless the column is already there."""
+    if column not in column_names(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+def _create_base_tables(conn):
+    for sql in BASE_TABLES:
+        conn.execute(sql)
+
+
+def _add_missing_columns(conn):
+    for table, column, declaration in ADDED_COLUMNS:
+        add_column(conn, table, column, declaration)
+
+
+def _create_indexes(conn):
+    for name, table, columns in INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def _deferrable_insert_triggers(conn):
+    search.recreate_triggers(conn)
+    export.recreate_triggers(conn)
+
+
+MIGRATIONS = [
+    (1, "Base tables", _create_base_tables),
+    (2, "Columns previously added with ad-hoc ALTERs", _add_missing_columns),
+    (3, "Secondary indexes for view filters", _create_indexes),
+    (4, "Monthly transaction aggregates", aggregates.create_schema),
+    (5, "Import fingerprints and checkpoints", importer.create_schema),
+    (6, "Inventory depreciation schedule", depreciation.create_schema),
+    (7, "Typed health metric series", timeseries.create_schema),
+    (8, "Full-text search index", search.create_schema),
+    (9, "Category suggestion versioning", categorizer.create_schema),
+    (10, "Row change log for incremental exports", export.create_schema),
+    (11, "Content-addressed attachment blobs", attachment_store.create_schema),
+    (12, "Upcoming items view and alert de-duplication", alerts.create_schema),
+    (13, "Net-worth snapshot history", networth.create_schema),
+    (14, "Cached goal progress and streaks", goal_progress.create_schema),
+    (15, "Time log intervals and rollups", time_intervals.create_schema),
+    (16, "Fingerprint queue for transactions entered outside imports", importer.create_fingerprint_queue),
+    (17, "Time log triggers: empty logs, week-by-hour pruning", time_intervals.recreate_triggers),
+    (18, "Goal log triggers keep goals.current_value in sync", goal_progress.recreate_triggers),
+    (19, "Health series triggers skip non-numeric readings", timeseries.recreate_triggers),
+    (20, "Search and change-log insert triggers defer to bulk inserts", _deferrable_insert_triggers),
+    (21, "Track importer-assigned categories", categorizer.create_auto_categorized),
+]
+
+
+def latest_version():
+    return MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """
+    Bring the database up to the latest schema version.
+
+    Returns the list of versions that were applied; an up-to-date file
+    returns an empty list and is not written to.
+    """
+    applied = []
+    current = get_version(conn)
+    pending = [m for m in MIGRATIONS if m[0] > current]
+    if not pending:
+        return applied
+
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # manage BEGIN/COMMIT ourselves so DDL is transactional
+    try:
+        for version, _description, apply in pending:
+            conn.execute("BEGIN")
+            try:
+                apply(conn)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(version)
+    finally:
+        conn.isolation_level = isolation_level
+    return applied
+
+
+# Representative reads issued by the views, with sample parameters.
+HOT_QUERIES = [
+    ("transactions by month",
+     "SELECT * FROM transactions WHERE date BETWEEN ? AND ? ORDER BY date DESC",
+     ("2026-01-01", "2026-01-31")),
+    ("transactions by category",
+     "SELECT * FROM transactions WHERE category = ? AND date >= ? ORDER BY date DESC",
+     ("Food", "2026-01-01")),
+    ("monthly total by type",
+     "SELECT SUM(amount) FROM transactions WHERE type = ? AND date >= ?",
+     ("EXPENSE", "2026-01-01")),
+    ("health metric history",
+     "SELECT date, value FROM health_metrics WHERE type = ? ORDER BY date",
+     ("Weight",)),
+    ("goal logs",
+     "SELECT * FROM goal_logs WHERE goal_id = ? ORDER BY date DESC",
+     (1,)),
+    ("debts for contact",
+     "SELECT * FROM debts WHERE contact_id = ?",
+     (1,)),
+    ("event tasks",
+     "SELECT * FROM event_tasks WHERE event_id = ?",
+     (1,)),
+    ("project tasks",
+     "SELECT * FROM project_tasks WHERE project_id = ?",
+     (1,)),
+    ("week of meal plans",
+     "SELECT * FROM meal_plans WHERE date BETWEEN ? AND ? ORDER BY date",
+     ("2026-01-05", "2026-01-11")),
+]
+
+
+def explain_hot_queries(conn):
+    """Return {query name: [plan detail, ...]} from EXPLAIN QUERY PLAN."""
+    plans = {}
+    for name, sql, params in HOT_QUERIES:
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            plans[name] = [row[3] for row in rows]
+        except sqlite3.Error as e:
+            plans[name] = [f"error: {e}"]
+    return plans
+
+
+def main(paths):
+    for path in paths:
+        print(f"== {path}")
+        conn = sqlite3.connect(path)
+        try:
+            before_version = get_version(conn)
+            before = explain_hot_queries(conn)
+            applied = migrate(conn)
+            after = explain_hot_queries(conn)
+        finally:
+            conn.close()
+
+        if applied:
+            print(f"  schema v{before_version} -> v{applied[-1]} (applied {applied})")
+        else:
+            print(f"  schema already at v{before_version}")
+        for name, _sql, _params in HOT_QUERIES:
+            print(f"  {name}:")
+            print(f"    before: {'; '.join(before[name])}")
+            print(f"    after:  {'; '.join(after[name])}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["life_ledger.db"])
@@ -0,0 +1,254 @@
+"""
+Net-worth history as change-only daily snapshots.
+
+net_worth_snapshots holds one row per day on which some component of net
+worth moved, with the per-component breakdown (accounts, savings, inventory,
+digital assets, money owed to you; loans and money you owe). A day without a
+row has the values of the latest row before it, so the value on any date is
+one primary-key lookup and a chart over a range reads only the rows inside
+it, never a replay of the underlying tables.
+
+take_snapshot() is cheap enough to run at startup and after writes to any
+of WATCHED_TABLES; ui.components.networth_recorder.NetWorthRecorder does
+that from ChangeBus notifications. Build the history of an existing ledger
+with:
+
+    python -m database.networth life_ledger.db --backfill
+"""
+import argparse
+import sqlite3
+from datetime import date, datetime, timedelta
+
+from database.depreciation import DEFAULT_RATE, depreciate
+
+
+ASSETS = ("financial_assets", "savings", "inventory", "digital_assets", "receivables")
+LIABILITIES = ("loans", "payables")
+COMPONENTS = ASSETS + LIABILITIES
+INVENTORY_STEP = 0.01
+
+WATCHED_TABLES = frozenset({
+    "financial_assets", "savings_goals", "inventory", "digital_assets", "loans", "debts",
+})
+
+# Values that don't depend on the date (no history is kept for them)
+_STATIC_SQL = """
+    SELECT
+        (SELECT COALESCE(SUM(value), 0) FROM financial_assets),
+        (SELECT COALESCE(SUM(current_amount), 0) FROM savings_goals),
+        (SELECT COALESCE(SUM(value), 0) FROM digital_assets WHERE is_active = 1),
+        (SELECT COALESCE(SUM(amount), 0) FROM debts WHERE is_settled = 0 AND type = 'OWED_TO_ME'),
+        (SELECT COALESCE(SUM(current_balance), 0) FROM loans),
+        (SELECT COALESCE(SUM(amount), 0) FROM debts WHERE is_settled = 0 AND type = 'I_OWE')
+"""
+
+SCHEMA = [
+    f"""CREATE TABLE IF NOT EXISTS net_worth_snapshots (
+        date TEXT PRIMARY KEY,
+        {', '.join(f'{c} REAL NOT NULL DEFAULT 0' for c in COMPONENTS)},
+        assets REAL NOT NULL,
+        liabilities REAL NOT NULL,
+        net_worth REAL NOT NULL
+    ) WITHOUT ROWID""",
+]
+
+
+def create_schema(conn):
+    for sql in SCHEMA:
+        conn.execute(sql)
+
+
+def _iso(day):
+    if day is None:
+        return date.today().isoformat()
+    return day if isinstance(day, str) else day.isoformat()
+
+
+def _static_components(conn):
+    values = conn.execute(_STATIC_SQL).fetchone()
+    keys = ("financial_assets", "savings", "digital_assets", "receivables", "loans", "payables")
+    return dict(zip(keys, values))
+
+
+def _inventory_items(conn):
+    return conn.execute("""
+        SELECT i.purchase_price, i.purchase_date, COALESCE(r.annual_rate, ?), i.current_value
+        FROM inventory i LEFT JOIN depreciation_rates r ON r.category = i.category
+        WHERE i.purchase_price IS NOT NULL OR i.current_value IS NOT NULL
+    """, (DEFAULT_RATE,)).fetchall()
+
+
+def _inventory_value(items, as_of):
+    """
+    Depreciated value on `as_of` of the items owned by then. Items without
+    a purchase price count at their entered current_value.
+    """
+    return sum(
+        value if price is None else depreciate(price, bought, rate, as_of)
+        for price, bought, rate, value in items
+        if not bought or bought[:10] <= as_of
+    )
+
+
+def _with_totals(components):
+    row = {c: round(components.get(c) or 0, 2) for c in COMPONENTS}
+    row["assets"] = round(sum(row[c] for c in ASSETS), 2)
+    row["liabilities"] = round(sum(row[c] for c in LIABILITIES), 2)
+    row["net_worth"] = round(row["assets"] - row["liabilities"], 2)
+    return row
+
+
+def component_values(conn, as_of=None):
+    """Current breakdown computed from the underlying tables."""
+    as_of = _iso(as_of)
+    components = _static_components(conn)
+    components["inventory"] = _inventory_value(_inventory_items(conn), as_of)
+    return _with_totals(components)
+
+
+def _changed(previous, row, threshold, inventory_step):
+    if previous is None:
+        return True
+    for c in COMPONENTS:
+        step = threshold
+        if c == "inventory":
+            # Depreciation moves this a little every day; only record real steps
+            step = max(threshold, abs(previous[c]) * inventory_step)
+        if abs(row[c] - previous[c]) >= step:
+            return True
+    return False
+
+
+def _write(conn, day, row):
+    columns = ("date",) + COMPONENTS + ("assets", "liabilities", "net_worth")
+    conn.execute(
+        f"INSERT OR REPLACE INTO net_worth_snapshots ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})",
+        [day] + [row[c] for c in columns[1:]],
+    )
+
+
+def snapshot_at(conn, day=None):
+    """The breakdown in effect on `day` (latest snapshot on or before it), or None."""
+    cursor = conn.execute(
+        "SELECT * FROM net_worth_snapshots WHERE date <= ? ORDER BY date DESC LIMIT 1", (_iso(day),)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([d[0] for d in cursor.description], row))
+
+
+def snapshot_due(conn, as_of=None, threshold=0.01, inventory_step=INVENTORY_STEP):
+    """True when take_snapshot() would write a row; only reads."""
+    day = _iso(as_of)
+    return _changed(snapshot_at(conn, day), component_values(conn, day), threshold, inventory_step)
+
+
+def take_snapshot(conn, as_of=None, threshold=0.01, inventory_step=INVENTORY_STEP, in_transaction=False):
+    """
+    Record today's breakdown if any component moved by at least `threshold`
+    since the snapshot in effect. Returns True when a row was written.
+    Inventory depreciation only counts once it adds up to `inventory_step`
+    (a fraction of the last recorded inventory value). Pass
+    in_transaction=True when the caller already holds a transaction.
+    """
+    day = _iso(as_of)
+    row = component_values(conn, day)
+    if not _changed(snapshot_at(conn, day), row, threshold, inventory_step):
+        return False
+    if in_transaction:
+        _write(conn, day, row)
+        return True
+    with conn:
+        _write(conn, day, row)
+    return True
+
+
+def backfill(conn, start=None, end=None, threshold=0.01, inventory_step=INVENTORY_STEP):
+    """
+    Rebuild the history from `start` (default: earliest inventory purchase)
+    to `end` (default: today). Inventory is replayed from purchase dates and
+    depreciation rates; balances the ledger keeps no history for (accounts,
+    savings, loans, debts, digital assets) are held at today's values.
+    Returns the number of rows written.
+    """
+    end = datetime.strptime(_iso(end), "%Y-%m-%d").date()
+    items = _inventory_items(conn)
+    if start is None:
+        dates = [bought[:10] for _p, bought, _r, _v in items if bought]
+        start = min(dates) if dates else end.isoformat()
+    day = datetime.strptime(_iso(start), "%Y-%m-%d").date()
+
+    static = _static_components(conn)
+    previous = None
+    written = 0
+    with conn:
+        conn.execute("DELETE FROM net_worth_snapshots WHERE date BETWEEN ? AND ?",
+                     (day.isoformat(), end.isoformat()))
+        while day <= end:
+            stamp = day.isoformat()
+            row = _with_totals(dict(static, inventory=_inventory_value(items, stamp)))
+            if _changed(previous, row, threshold, inventory_step):
+                _write(conn, stamp, row)
+                previous = row
+                written += 1
+            day += timedelta(days=1)
+    return written
+
+
+def series(conn, start, end, step_days=1, columns=("net_worth",)):
+    """
+    [(date, {column: value})] at every `step_days` from start to end, for
+    net-worth and allocation charts. Reads the snapshot in effect at start
+    plus the rows inside the range, then steps through them once.
+    """
+    start, end = _iso(start), _iso(end)
+    first = snapshot_at(conn, start)
+    cursor = conn.execute(
+        f"SELECT date, {', '.join(columns)} FROM net_worth_snapshots "
+        f"WHERE date > ? AND date <= ? ORDER BY date",
+        (start, end),
+    )
+    changes = iter(cursor.fetchall())
+    upcoming = next(changes, None)
+    current = {c: first[c] for c in columns} if first else None
+
+    points = []
+    day = datetime.strptime(start, "%Y-%m-%d").date()
+    last = datetime.strptime(end, "%Y-%m-%d").date()
+    while day <= last:
+        stamp = day.isoformat()
+        while upcoming is not None and upcoming[0] <= stamp:
+            current = dict(zip(columns, upcoming[1:]))
+            upcoming = next(changes, None)
+        if current is not None:
+            points.append((stamp, current))
+        day += timedelta(days=step_days)
+    return points
+
+
+def allocation(conn, day=None):
+    """{component: share of total assets} on `day`, for the allocation chart."""
+    snapshot = snapshot_at(conn, day)
+    if not snapshot or not snapshot["assets"]:
+        return {}
+    return {c: snapshot[c] / snapshot["assets"] for c in ASSETS}
+
+
+if __name__ == "__main__":
+    from database.migrations import migrate
+
+    parser = argparse.ArgumentParser(description="Record or backfill net-worth snapshots.")
+    parser.add_argument("db", nargs="?", default="life_ledger.db")
+    parser.add_argument("--backfill", action="store_true", help="rebuild history from inventory purchase dates")
+    parser.add_argument("--start", help="first day to backfill (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    migrate(conn)
+    if args.backfill:
+        print(f"{args.db}: wrote {backfill(conn, args.start)} snapshots")
+    else:
+        print(f"{args.db}: {'recorded' if take_snapshot(conn) else 'unchanged'}")
+    conn.close()
@@ -0,0 +1,132 @@
+"""
+Keyset pagination over ledger tables.
+
+A page is fetched with WHERE (sort_col, id) > (last_sort, last_id) ... LIMIT n
+rather than OFFSET, so reading page 5000 of the ledger costs the same as
+page 1 as long as the sort column is indexed. Sorting and filtering happen in
+SQLite; callers only ever hold one page of rows.
+
+Row-value comparisons never match NULL, so a sort column that can hold NULLs
+orders them last in either direction and the page predicate has an explicit
+IS NULL branch. NOT NULL columns keep the plain, index-seekable form.
+"""
+
+
+# Column layouts for the tables the paged table model is used with.
+TABLES = {
+    "transactions": {
+        "columns": ["id", "date", "description", "category", "type", "amount"],
+        "default_sort": "date",
+        "search": ["description", "category"],
+        "not_null": ["id", "date", "category", "type", "amount"],
+    },
+    "health_metrics": {
+        "columns": ["id", "date", "type", "value", "unit", "notes"],
+        "default_sort": "date",
+        "search": ["type", "notes"],
+        "not_null": ["id", "date", "type", "value"],
+    },
+    "fitness_logs": {
+        "columns": ["id", "date", "activity_type", "duration_min", "calories", "distance_km", "notes"],
+        "default_sort": "date",
+        "search": ["activity_type", "notes"],
+        "not_null": ["id", "date", "activity_type"],
+    },
+    "time_logs": {
+        "columns": ["id", "date", "start_time", "end_time", "activity", "category", "duration_minutes", "notes"],
+        "default_sort": "date",
+        "search": ["activity", "category", "notes"],
+        "not_null": ["id", "date", "start_time", "end_time", "activity", "category"],
+    },
+}
+
+
+class KeysetQuery:
+    """
+    Builds COUNT and page queries for one table, sort order and filter set.
+
+    Keys are (sort_value, id) tuples; id breaks ties so the order is total
+    and no row is skipped or repeated between pages.
+    """
+
+    def __init__(self, table, columns=None, sort_column=None, descending=True,
+                 equals=None, date_from=None, date_to=None, search=None, search_columns=None):
+        layout = TABLES.get(table, {})
+        self.table = table
+        self.columns = list(columns or layout["columns"])
+        self.sort_column = sort_column or layout.get("default_sort", "id")
+        if self.sort_column not in self.columns:
+            raise ValueError(f"Cannot sort {table} by unknown column {self.sort_column!r}")
+        for column in (equals or {}):
+            if column not in self.columns:
+                raise ValueError(f"Cannot filter {table} by unknown column {column!r}")
+        self.descending = descending
+        self.nullable = self.sort_column not in layout.get("not_null", ("id",))
+        self.equals = dict(equals or {})
+        self.date_from = date_from
+        self.date_to = date_to
+        self.search = search
+        self.search_columns = list(search_columns or layout.get("search", []))
+
+    def _where(self):
+        clauses, params = [], []
+        for column, value in self.equals.items():
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        if self.date_from:
+            clauses.append("date >= ?")
+            params.append(self.date_from)
+        if self.date_to:
+            clauses.append("date <= ?")
+            params.append(self.date_to)
+        if self.search and self.search_columns:
+            like = " OR ".join(f"{column} LIKE ?" for column in self.search_columns)
+            clauses.append(f"({like})")
+            params.extend([f"%{self.search}%"] * len(self.search_columns))
+        return clauses, params
+
+    def count_sql(self):
+        clauses, params = self._where()
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return f"SELECT COUNT(*) AS n FROM {self.table}{where}", params
+
+    def _order_by(self):
+        direction = "DESC" if self.descending else "ASC"
+        nulls = " NULLS LAST" if self.nullable else ""
+        return f"ORDER BY {self.sort_column} {direction}{nulls}, id {direction}"
+
+    def _after(self, after_key):
+        """Predicate and params for the rows following after_key in _order_by() order."""
+        sort_value, last_id = after_key
+        op = "<" if self.descending else ">"
+        if sort_value is None:
+            # Already into the trailing NULLs
+            return f"({self.sort_column} IS NULL AND id {op} ?)", [last_id]
+        predicate = f"({self.sort_column}, id) {op} (?, ?)"
+        if self.nullable:
+            predicate = f"({predicate} OR {self.sort_column} IS NULL)"
+        return predicate, [sort_value, last_id]
+
+    def page_sql(self, after_key=None, limit=200):
+        """SELECT for the `limit` rows following after_key (or the first page)."""
+        clauses, params = self._where()
+        if after_key is not None:
+            predicate, key_params = self._after(after_key)
+            clauses.append(predicate)
+            params.extend(key_params)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {', '.join(self.columns)} FROM {self.table}{where} {self._order_by()} LIMIT ?"
+        return sql, params + [limit]
+
+    def key_at_sql(self, offset):
+        """SELECT for the key of the row at `offset`, used to jump without paging through."""
+        clauses, params = self._where()
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT {self.sort_column} AS sort_value, id FROM {self.table}{where} "
+            f"{self._order_by()} LIMIT 1 OFFSET ?"
+        )
+        return sql, params + [offset]
+
+    def key_of(self, row):
+        return (row[self.sort_column], row["id"])
@@ -0,0 +1,273 @@
+"""
+WAL-mode connection pool for the ledger database.
+
+SQLite in WAL mode lets any number of readers run while one writer commits,
+so the pool hands every thread its own read connection and funnels all writes
+through a single connection guarded by a lock. A long write (recurring
+processing, an import) no longer blocks reads from the UI or worker threads.
+"""
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+from database.cache import (
+    QueryCache, expand_tables, schema_names, table_written, trigger_dependencies, view_dependencies,
+)
+
+
+# Applied to every connection. cache_size is negative -> KiB, here 32 MiB.
+CONNECTION_PRAGMAS = (
+    ("foreign_keys", "ON"),
+    ("busy_timeout", "5000"),
+    ("cache_size", "-32000"),
+    ("mmap_size", str(256 * 1024 * 1024)),
+    ("temp_store", "MEMORY"),
+)
+
+# NORMAL is durable across application crashes in WAL mode and only risks the
+# last commits on power loss, which is the usual trade-off for desktop apps.
+WRITER_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+)
+
+
+def _apply_pragmas(conn, pragmas):
+    for name, value in pragmas:
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+class ConnectionPool:
+    """
+    Per-thread read connections plus one serialized writer.
+
+    Reads return lists of dicts, like the models do. Writes go through
+    execute()/execute_many() or the write_transaction() context manager.
+
+    Pass cache_size > 0 to enable the result cache; writes made through the
+    pool evict the cached reads of the tables they touch. Pass a
+    diagnostics.QueryStats as `stats` to time every statement that reaches
+    SQLite (cache hits are not counted).
+
+    Write listeners (add_write_listener) are called after every commit with
+    the frozenset of tables it changed, trigger-maintained tables included,
+    or None when the statement could not be attributed to a table.
+
+    Trigger and view dependencies are reloaded whenever the schema version
+    changes, so migrating through pool.writer after construction is fine.
+    """
+
+    def __init__(self, db_path="life_ledger.db", cache_size=0, stats=None):
+        self.db_path = db_path
+        self.stats = stats
+        self.in_memory = db_path == ":memory:" or str(db_path).startswith("file::memory:")
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._write_listeners = []
+        self._dependencies = {}
+        self._schema_version = None
+        self._schema_lock = threading.Lock()
+
+        self._writer = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._writer.row_factory = sqlite3.Row
+        _apply_pragmas(self._writer, CONNECTION_PRAGMAS)
+        if not self.in_memory:
+            _apply_pragmas(self._writer, WRITER_PRAGMAS)
+
+        self.cache = QueryCache(cache_size) if cache_size else None
+        with self._write_lock:
+            self._sync_schema(self._writer)
+
+    # ----- connections -----
+
+    def _open_reader(self):
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        _apply_pragmas(conn, CONNECTION_PRAGMAS)
+        conn.execute("PRAGMA query_only = ON")
+        with self._readers_lock:
+            self._readers.append(conn)
+        return conn
+
+    def _close_reader(self, conn):
+        with self._readers_lock:
+            if conn not in self._readers:
+                return
+            self._readers.remove(conn)
+        conn.close()
+
+    def reader(self):
+        """
+        Return this thread's read connection, opening it on first use. It is
+        closed when the thread exits (its thread-local handle is collected).
+        """
+        handle = getattr(self._local, "handle", None)
+        if handle is None:
+            handle = _ReaderHandle(self._open_reader())
+            weakref.finalize(handle, self._close_reader, handle.conn)
+            self._local.handle = handle
+        return handle.conn
+
+    def release_reader(self):
+        """Close the calling thread's read connection now, e.g. at the end of a worker."""
+        handle = getattr(self._local, "handle", None)
+        if handle is not None:
+            del self._local.handle
+            self._close_reader(handle.conn)
+
+    @property
+    def writer(self):
+        return self._writer
+
+    # ----- reads -----
+
+    def fetch_all(self, query, params=()):
+        if self.cache is not None:
+            key = QueryCache.make_key(query, params)
+            rows = self.cache.get(key)
+            if rows is None:
+                if self.in_memory:
+                    with self._write_lock:
+                        self._sync_schema(self._writer)
+                else:
+                    self._sync_schema(self.reader())
+                # A write committing while we read bumps the stamp and the rows aren't cached
+                stamp = self.cache.stamp(query)
+                rows = self._fetch_all(query, params)
+                if stamp is not None:
+                    self.cache.put(key, rows, stamp)
+            return rows
+        return self._fetch_all(query, params)
+
+    def _fetch_all(self, query, params):
+        if self.in_memory:
+            # A private :memory: database only exists on the writer connection
+            with self._write_lock:
+                return self._timed_fetch(self._writer, query, params)
+        return self._timed_fetch(self.reader(), query, params)
+
+    def _timed_fetch(self, conn, query, params):
+        if self.stats is None:
+            return [dict(row) for row in conn.execute(query, params)]
+        start = time.perf_counter()
+        rows = [dict(row) for row in conn.execute(query, params)]
+        self.stats.record(query, (time.perf_counter() - start) * 1000, len(rows), conn, params)
+        return rows
+
+    def fetch_one(self, query, params=()):
+        rows = self.fetch_all(query, params)
+        return rows[0] if rows else None
+
+    # ----- writes -----
+
+    @contextmanager
+    def write_transaction(self, tables=None):
+        """
+        Hold the writer for a whole transaction.
+
+        BEGIN IMMEDIATE takes the write lock up front so two writers never
+        deadlock half-way through. Commits on success, rolls back on error.
+        `tables` names what the transaction writes, for cache invalidation;
+        without it the whole cache is dropped on commit.
+        """
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            else:
+                self._writer.execute("COMMIT")
+                self._sync_schema(self._writer)
+                self._invalidate(tables)
+                self._notify(tables)
+
+    def _tables_for(self, query):
+        table = table_written(query)
+        return [table] if table else None
+
+    def _invalidate(self, tables):
+        if self.cache is None:
+            return
+        if tables:
+            self.cache.invalidate(*tables)
+        else:
+            # Unknown statement (DDL, multi-table script): any cached read may be stale
+            self.cache.clear()
+
+    def _sync_schema(self, conn):
+        """Reload trigger and view dependencies if the schema changed since last seen."""
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        with self._schema_lock:
+            if version == self._schema_version:
+                return
+            self._dependencies = trigger_dependencies(conn)
+            if self.cache is not None:
+                self.cache.set_dependencies(self._dependencies, view_dependencies(conn), schema_names(conn))
+                # Entries were tagged under the old schema
+                self.cache.clear()
+            self._schema_version = version
+
+    # ----- change notifications -----
+
+    def add_write_listener(self, callback):
+        """Call callback(tables) after each committed write; see the class docstring."""
+        self._write_listeners.append(callback)
+
+    def remove_write_listener(self, callback):
+        if callback in self._write_listeners:
+            self._write_listeners.remove(callback)
+
+    def _notify(self, tables):
+        if not self._write_listeners:
+            return
+        changed = frozenset(expand_tables(tables, self._dependencies)) if tables else None
+        for callback in list(self._write_listeners):
+            callback(changed)
+
+    def execute(self, query, params=()):
+        """Run one write statement in its own transaction; returns lastrowid."""
+        with self.write_transaction(self._tables_for(query)) as conn:
+            start = time.perf_counter()
+            cursor = conn.execute(query, params)
+            if self.stats is not None:
+                self.stats.record(query, (time.perf_counter() - start) * 1000, cursor.rowcount, conn, params)
+        return cursor.lastrowid
+
+    def execute_many(self, query, params_seq):
+        """Run a statement for every params tuple in one transaction; returns rowcount."""
+        with self.write_transaction(self._tables_for(query)) as conn:
+            start = time.perf_counter()
+            cursor = conn.executemany(query, params_seq)
+            if self.stats is not None:
+                # No plan for batches: there is no single params tuple to explain with
+                self.stats.record(query, (time.perf_counter() - start) * 1000, cursor.rowcount)
+        return cursor.rowcount
+
+    def cache_stats(self):
+        """Hit/miss counters of the result cache, or None when it is disabled."""
+        return self.cache.stats() if self.cache is not None else None
+
+    def close(self):
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        with self._write_lock:
+            self._writer.close()
+
+
+class _ReaderHandle:
+    """Thread-local owner of a read connection; collected when its thread exits."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
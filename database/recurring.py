@@ -0,0 +1,168 @@
+"""
+Catch-up engine for recurring transactions.
+
+Every rule's due dates since it was last processed are generated in one go
+(monthly and yearly dates are anchored on the start date, so a rule starting
+on the 31st lands on the last day of shorter months and returns to the 31st
+afterwards). All due transactions are bulk-inserted, every rule's
+last_processed is advanced and a single summary alert is written, all in one
+transaction: an interrupted run leaves nothing behind and simply runs again.
+The rules are read inside that transaction (BEGIN IMMEDIATE), so two runs
+racing each other cannot both see a rule as due. A rule that cannot be
+scheduled (unknown frequency, bad start date) is logged and skipped; the
+other rules still run.
+"""
+import logging
+from datetime import date, datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+
+log = logging.getLogger(__name__)
+
+STEPS = {
+    "daily": lambda k: timedelta(days=k),
+    "weekly": lambda k: timedelta(weeks=k),
+    "bi-weekly": lambda k: timedelta(weeks=2 * k),
+    "biweekly": lambda k: timedelta(weeks=2 * k),
+    "monthly": lambda k: relativedelta(months=k),
+    "quarterly": lambda k: relativedelta(months=3 * k),
+    "yearly": lambda k: relativedelta(years=k),
+    "annually": lambda k: relativedelta(years=k),
+}
+
+
+def _parse(value):
+    return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+
+def _estimate_index(start, after, frequency):
+    """Smallest occurrence index that can fall after `after`, skipping the dates before it."""
+    if after < start:
+        return 0
+    if frequency in ("monthly", "quarterly"):
+        months = (after.year - start.year) * 12 + after.month - start.month
+        return max(0, months // (3 if frequency == "quarterly" else 1) - 1)
+    if frequency in ("yearly", "annually"):
+        return max(0, after.year - start.year - 1)
+    days = {"daily": 1, "weekly": 7}.get(frequency, 14)
+    return max(0, (after - start).days // days - 1)
+
+
+def due_dates(start_date, frequency, after=None, until=None):
+    """
+    Every occurrence of a rule in (after, until], as date objects.
+
+    `after` is the last processed date (None = never processed, so the
+    start date itself is due); `until` defaults to today.
+    """
+    frequency = frequency.strip().lower()
+    if frequency not in STEPS:
+        raise ValueError(f"Unsupported frequency: {frequency}")
+    step = STEPS[frequency]
+    start = _parse(start_date) if isinstance(start_date, str) else start_date
+    until = until or date.today()
+    after = (_parse(after) if isinstance(after, str) else after) if after else start - timedelta(days=1)
+
+    dates = []
+    k = _estimate_index(start, after, frequency)
+    while True:
+        occurrence = start + step(k)
+        if occurrence > until:
+            break
+        if occurrence > after:
+            dates.append(occurrence)
+        k += 1
+    return dates
+
+
+def plan_catch_up(rules, today=None, skipped=None):
+    """
+    [(rule, [due dates])] for every rule with something due.
+
+    `rules` are dicts with the recurring_transactions columns. Rules that
+    cannot be scheduled are logged and left out (appended to `skipped` if
+    given).
+    """
+    today = today or date.today()
+    plan = []
+    for rule in rules:
+        try:
+            dates = due_dates(rule["start_date"], rule["frequency"], rule.get("last_processed"), today)
+        except ValueError as e:
+            log.warning("Skipping recurring transaction %s (%s): %s", rule.get("id"), rule.get("name"), e)
+            if skipped is not None:
+                skipped.append(rule)
+            continue
+        if dates:
+            plan.append((rule, dates))
+    return plan
+
+
+def _summary_message(plan):
+    parts = []
+    total_count = 0
+    for rule, dates in plan:
+        total_count += len(dates)
+        amount = rule["amount"] * len(dates)
+        suffix = f" x{len(dates)}" if len(dates) > 1 else ""
+        parts.append(f"{rule['name']}{suffix} (${amount:,.2f})")
+    return total_count, f"Processed {total_count} recurring payment(s): " + ", ".join(parts)
+
+
+def process_recurring(conn, today=None):
+    """
+    Catch every rule up to `today` in a single transaction.
+
+    Returns {'transactions': n, 'rules': m, 'skipped': k}; running it again
+    the same day is a no-op.
+    """
+    today = today or date.today()
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # manage BEGIN/COMMIT ourselves to read and write under one lock
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = _catch_up(conn, today)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.isolation_level = isolation_level
+    return result
+
+
+def _catch_up(conn, today):
+    columns = ("id", "name", "amount", "category", "type", "frequency", "start_date", "last_processed")
+    rules = [
+        dict(zip(columns, row))
+        for row in conn.execute(f"SELECT {', '.join(columns)} FROM recurring_transactions")
+    ]
+    skipped = []
+    plan = plan_catch_up(rules, today, skipped)
+    if not plan:
+        return {"transactions": 0, "rules": 0, "skipped": len(skipped)}
+
+    rows = [
+        (d.isoformat(), rule["amount"], rule["category"], rule["type"], rule["name"],
+         rule["id"], "recurring_transactions")
+        for rule, dates in plan
+        for d in dates
+    ]
+    count, message = _summary_message(plan)
+    stamp = today.isoformat()
+    conn.executemany(
+        "INSERT INTO transactions (date, amount, category, type, description, related_id, related_table) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.executemany(
+        "UPDATE recurring_transactions SET last_processed = ? WHERE id = ?",
+        [(stamp, rule["id"]) for rule, _dates in plan],
+    )
+    conn.execute(
+        "INSERT INTO system_alerts (title, message, severity, created_at) VALUES (?, ?, 'Info', ?)",
+        ("Recurring Payments", message, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+    )
+    return {"transactions": count, "rules": len(plan), "skipped": len(skipped)}
@@ -0,0 +1,194 @@
+"""
+Global full-text search across the ledger (SQLite FTS5).
+
+ledger_search indexes the text of transactions, notes, contacts, books,
+recipes, documents and digital accounts in one FTS5 table. Each source row
+maps to a fixed FTS rowid (source id * 16 + table code), so the sync
+triggers update and delete by rowid instead of scanning the index.
+
+Rebuild the index for an existing database with:
+
+    python -m database.search life_ledger.db
+"""
+import re
+import sqlite3
+import sys
+
+from database.bulk import unless_deferred
+
+
+# table -> (code, title expression, body expression). Codes must stay stable:
+# they are baked into the FTS rowids.
+SOURCES = {
+    "transactions": (1, "{r}.description",
+                     "{r}.category || ' ' || {r}.type || ' ' || {r}.date || ' ' || {r}.amount"),
+    "notes": (2, "{r}.title",
+              "COALESCE({r}.content, '') || ' ' || COALESCE({r}.tags, '') || ' ' || COALESCE({r}.category, '')"),
+    "contacts": (3, "{r}.name",
+                 "COALESCE({r}.email, '') || ' ' || COALESCE({r}.phone, '') || ' ' || COALESCE({r}.notes, '')"),
+    "books": (4, "{r}.title",
+              "COALESCE({r}.author, '') || ' ' || COALESCE({r}.notes, '')"),
+    "recipes": (5, "{r}.name",
+                "COALESCE({r}.ingredients, '') || ' ' || COALESCE({r}.instructions, '') || ' ' || COALESCE({r}.category, '')"),
+    "documents": (6, "{r}.name",
+                  "COALESCE({r}.category, '') || ' ' || COALESCE({r}.notes, '')"),
+    "digital_accounts": (7, "{r}.service_name",
+                         "COALESCE({r}.username, '') || ' ' || COALESCE({r}.email, '') || ' ' || "
+                         "COALESCE({r}.category, '') || ' ' || COALESCE({r}.notes, '')"),
+}
+TABLE_BY_CODE = {code: table for table, (code, _t, _b) in SOURCES.items()}
+CODE_STRIDE = 16  # rowid = source id * CODE_STRIDE + code, so codes stay below it
+
+SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS ledger_search USING fts5(
+        title,
+        body,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )""",
+]
+
+
+def _triggers(table):
+    code, title, body = SOURCES[table]
+    new_title, new_body = title.format(r="NEW"), body.format(r="NEW")
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_search_insert
+        AFTER INSERT ON {table} {unless_deferred(table)}
+        BEGIN
+            INSERT INTO ledger_search (rowid, title, body)
+            VALUES (NEW.id * {CODE_STRIDE} + {code}, COALESCE({new_title}, ''), COALESCE({new_body}, ''));
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_search_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM ledger_search WHERE rowid = OLD.id * {CODE_STRIDE} + {code};
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_search_update
+        AFTER UPDATE ON {table}
+        BEGIN
+            DELETE FROM ledger_search WHERE rowid = OLD.id * {CODE_STRIDE} + {code};
+            INSERT INTO ledger_search (rowid, title, body)
+            VALUES (NEW.id * {CODE_STRIDE} + {code}, COALESCE({new_title}, ''), COALESCE({new_body}, ''));
+        END""",
+    ]
+
+
+def create_schema(conn):
+    for sql in SCHEMA:
+        conn.execute(sql)
+    for table in SOURCES:
+        for sql in _triggers(table):
+            conn.execute(sql)
+    _refill(conn)
+
+
+def recreate_triggers(conn):
+    """Replace triggers created by an older version of _triggers()."""
+    for table in SOURCES:
+        for event in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_{event}")
+        for sql in _triggers(table):
+            conn.execute(sql)
+
+
+def _index_sql(table):
+    code, title, body = SOURCES[table]
+    return f"""
+        INSERT INTO ledger_search (rowid, title, body)
+        SELECT r.id * {CODE_STRIDE} + {code},
+               COALESCE({title.format(r='r')}, ''), COALESCE({body.format(r='r')}, '')
+        FROM {table} r
+    """
+
+
+def index_rows_after(conn, table, after_id):
+    """Index the rows of `table` with id > after_id (a bulk insert with deferred triggers)."""
+    if table in SOURCES:
+        conn.execute(_index_sql(table) + " WHERE r.id > ?", (after_id,))
+
+
+def _refill(conn):
+    conn.execute("DELETE FROM ledger_search")
+    for table in SOURCES:
+        conn.execute(_index_sql(table))
+    conn.execute("INSERT INTO ledger_search (ledger_search) VALUES ('optimize')")
+
+
+def rebuild_search_index(conn):
+    """Re-index every source table from scratch in one transaction."""
+    with conn:
+        _refill(conn)
+
+
+def to_match_query(text):
+    """
+    Turn free text from the search box into a safe FTS5 query: every word
+    is quoted (so operators and punctuation can't break the syntax) and
+    prefix-matched, and all words must match.
+    """
+    words = re.findall(r"\w+", text, flags=re.UNICODE)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _fetch(db, sql, params):
+    if hasattr(db, "fetch_all"):
+        return db.fetch_all(sql, params)
+    cursor = db.execute(sql, params)
+    names = [d[0] for d in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+
+def search(db, text, limit=50, tables=None):
+    """
+    Ranked matches for `text` across the ledger.
+
+    Returns [{'source_table', 'source_id', 'title', 'snippet', 'rank'}],
+    best first. The snippet comes from the body, or from the title when only
+    the title matched. `db` is a sqlite3 connection or a ConnectionPool; `tables`
+    optionally restricts the sources.
+    """
+    match = to_match_query(text)
+    if not match:
+        return []
+    sql = f"""
+        SELECT rowid, title,
+               CASE WHEN snippet(ledger_search, 1, '', '', '…', 12) = snippet(ledger_search, 1, '[', ']', '…', 12)
+                    THEN snippet(ledger_search, 0, '[', ']', '…', 12)  -- nothing matched in the body
+                    ELSE snippet(ledger_search, 1, '[', ']', '…', 12)
+               END AS snippet,
+               bm25(ledger_search, 5.0, 1.0) AS rank
+        FROM ledger_search
+        WHERE ledger_search MATCH ?
+    """
+    params = [match]
+    if tables:
+        codes = [SOURCES[t][0] for t in tables]
+        sql += f" AND (rowid % {CODE_STRIDE}) IN ({', '.join('?' for _ in codes)})"
+        params.extend(codes)
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+
+    results = []
+    for row in _fetch(db, sql, params):
+        source_id, code = divmod(row["rowid"], CODE_STRIDE)
+        results.append({
+            "source_table": TABLE_BY_CODE.get(code),
+            "source_id": source_id,
+            "title": row["title"],
+            "snippet": row["snippet"],
+            "rank": row["rank"],
+        })
+    return results
+
+
+if __name__ == "__main__":
+    from database.migrations import migrate
+
+    for path in sys.argv[1:] or ["life_ledger.db"]:
+        conn = sqlite3.connect(path)
+        migrate(conn)
+        rebuild_search_index(conn)
+        count = conn.execute("SELECT COUNT(*) FROM ledger_search").fetchone()[0]
+        conn.close()
+        print(f"{path}: indexed {count} rows")
@@ -0,0 +1,309 @@
+"""
+Interval index and rollups for time tracking.
+
+time_logs keeps its text date/start_time/end_time columns for the forms, and
+triggers mirror every log into integer start_ts/end_ts (seconds since the
+epoch of the wall-clock time, so hour buckets match what the user typed; an
+end before the start means the log ran past midnight, one ending when it
+starts is empty and stays out of the index and rollups). The intervals are
+indexed in an R*Tree, so overlap and containment lookups are logarithmic
+instead of comparing every pair of logs.
+
+The same triggers keep three rollups current on insert, update and delete:
+
+    time_rollup_hourly    (day, hour, category)     -> minutes
+    time_rollup_daily     (day, category)           -> minutes, logs
+    time_rollup_weekhour  (weekday, hour, category) -> minutes, all time
+
+A log is split across the hours it covers by joining it with a static table
+of hour offsets (time_hour_slots); logs are assumed to be shorter than
+MAX_HOURS. Week-by-hour heatmaps read at most 7 * 24 rows per category.
+
+R*Tree coordinates are 32-bit integers, which covers dates up to 2038.
+"""
+from datetime import datetime, timedelta
+
+
+MAX_HOURS = 48
+DEFAULT_CATEGORY = "Uncategorized"
+
+_START = "CAST(strftime('%s', {r}.date || ' ' || {r}.start_time) AS INTEGER)"
+_END = "CAST(strftime('%s', {r}.date || ' ' || {r}.end_time) AS INTEGER)"
+
+
+def _ts_update(where):
+    start, end = _START.format(r="time_logs"), _END.format(r="time_logs")
+    return f"""UPDATE time_logs SET
+            start_ts = {start},
+            end_ts = CASE WHEN {end} < {start} THEN {end} + 86400 ELSE {end} END
+        WHERE {where}"""
+
+
+def _buckets(where):
+    """One row per (log, hour) it touches: log id, category, bucket start, seconds inside it."""
+    return f"""SELECT t.id AS log_id, COALESCE(t.category, '{DEFAULT_CATEGORY}') AS category,
+                  (t.start_ts / 3600 + h.slot) * 3600 AS bucket,
+                  min(t.end_ts, (t.start_ts / 3600 + h.slot + 1) * 3600)
+                  - max(t.start_ts, (t.start_ts / 3600 + h.slot) * 3600) AS seconds
+           FROM time_logs t JOIN time_hour_slots h
+             ON (t.start_ts / 3600 + h.slot) * 3600 < t.end_ts
+           WHERE {where} AND t.start_ts IS NOT NULL AND t.end_ts > t.start_ts"""
+
+
+def _add_rollups(where, sign="+"):
+    buckets = _buckets(where)
+    return [
+        f"""INSERT INTO time_rollup_hourly (day, hour, category, minutes)
+        SELECT date(bucket, 'unixepoch'), CAST(strftime('%H', bucket, 'unixepoch') AS INTEGER),
+               category, {sign}SUM(seconds) / 60.0
+        FROM ({buckets}) GROUP BY 1, 2, 3
+        ON CONFLICT (day, hour, category) DO UPDATE SET minutes = minutes + excluded.minutes""",
+        f"""INSERT INTO time_rollup_daily (day, category, minutes, logs)
+        SELECT date(bucket, 'unixepoch'), category, {sign}SUM(seconds) / 60.0, {sign}COUNT(DISTINCT log_id)
+        FROM ({buckets}) GROUP BY 1, 2
+        ON CONFLICT (day, category) DO UPDATE SET minutes = minutes + excluded.minutes,
+                                                  logs = logs + excluded.logs""",
+        f"""INSERT INTO time_rollup_weekhour (weekday, hour, category, minutes)
+        SELECT (CAST(strftime('%w', bucket, 'unixepoch') AS INTEGER) + 6) % 7,
+               CAST(strftime('%H', bucket, 'unixepoch') AS INTEGER), category, {sign}SUM(seconds) / 60.0
+        FROM ({buckets}) GROUP BY 1, 2, 3
+        ON CONFLICT (weekday, hour, category) DO UPDATE SET minutes = minutes + excluded.minutes""",
+    ]
+
+
+_PRUNE = [
+    "DELETE FROM time_rollup_hourly WHERE minutes < 0.001",
+    "DELETE FROM time_rollup_daily WHERE minutes < 0.001 AND logs <= 0",
+    "DELETE FROM time_rollup_weekhour WHERE minutes < 0.001",
+]
+
+
+def _index(where):
+    return f"""INSERT OR REPLACE INTO time_log_intervals (id, start_ts, end_ts)
+        SELECT id, start_ts, end_ts FROM time_logs t
+        WHERE {where} AND start_ts IS NOT NULL AND end_ts > start_ts"""
+
+
+# Stand-in for "FROM time_logs t" in delete/update triggers: the row as it was
+_OLD_ROW = "FROM (SELECT OLD.id AS id, OLD.category AS category, OLD.start_ts AS start_ts, OLD.end_ts AS end_ts) t"
+
+
+def _body(statements):
+    return ";\n        ".join(statements) + ";"
+
+
+TABLES = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS time_log_intervals USING rtree_i32(id, start_ts, end_ts)",
+    "CREATE TABLE IF NOT EXISTS time_hour_slots (slot INTEGER PRIMARY KEY)",
+    """CREATE TABLE IF NOT EXISTS time_rollup_hourly (
+        day TEXT NOT NULL,
+        hour INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        minutes REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, hour, category)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS time_rollup_daily (
+        day TEXT NOT NULL,
+        category TEXT NOT NULL,
+        minutes REAL NOT NULL DEFAULT 0,
+        logs INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, category)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS time_rollup_weekhour (
+        weekday INTEGER NOT NULL,   -- 0 = Monday
+        hour INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        minutes REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (weekday, hour, category)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_time_logs_start_ts ON time_logs (start_ts)",
+]
+
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_time_logs_intervals_insert
+    AFTER INSERT ON time_logs
+    BEGIN
+        {_body([_ts_update("id = NEW.id"), _index("t.id = NEW.id")] + _add_rollups("t.id = NEW.id"))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_time_logs_intervals_delete
+    AFTER DELETE ON time_logs
+    BEGIN
+        DELETE FROM time_log_intervals WHERE id = OLD.id;
+        {_body([sql.replace("FROM time_logs t", _OLD_ROW)
+                for sql in _add_rollups("1", sign="-")] + _PRUNE)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_time_logs_intervals_update
+    AFTER UPDATE OF date, start_time, end_time, category ON time_logs
+    BEGIN
+        {_body([sql.replace("FROM time_logs t", _OLD_ROW)
+                for sql in _add_rollups("1", sign="-")] + _PRUNE)}
+        DELETE FROM time_log_intervals WHERE id = OLD.id;
+        {_body([_ts_update("id = NEW.id"), _index("t.id = NEW.id")] + _add_rollups("t.id = NEW.id"))}
+    END""",
+]
+
+
+def create_schema(conn):
+    from database.migrations import add_column
+
+    add_column(conn, "time_logs", "start_ts", "INTEGER")
+    add_column(conn, "time_logs", "end_ts", "INTEGER")
+    for sql in TABLES:
+        conn.execute(sql)
+    conn.executemany("INSERT OR IGNORE INTO time_hour_slots (slot) VALUES (?)", [(i,) for i in range(MAX_HOURS)])
+    for sql in TRIGGERS:
+        conn.execute(sql)
+    _refill(conn)
+
+
+def recreate_triggers(conn):
+    """Replace triggers created by an older version of TRIGGERS and rebuild from the logs."""
+    for name in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_time_logs_intervals_{name}")
+    for sql in TRIGGERS:
+        conn.execute(sql)
+    _refill(conn)
+
+
+def _refill(conn):
+    for table in ("time_log_intervals", "time_rollup_hourly", "time_rollup_daily", "time_rollup_weekhour"):
+        conn.execute(f"DELETE FROM {table}")
+    conn.execute(_ts_update("1"))
+    conn.execute(_index("1"))
+    for sql in _add_rollups("1"):
+        conn.execute(sql)
+
+
+def rebuild(conn):
+    """Recompute epoch columns, the interval index and every rollup."""
+    with conn:
+        _refill(conn)
+
+
+# ----- queries -----
+
+def to_ts(value):
+    """Epoch seconds for a date, datetime or 'YYYY-MM-DD[ HH:MM]' string."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return int((value - datetime(1970, 1, 1)).total_seconds())
+
+
+def _rows(cursor):
+    names = [d[0] for d in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+
+def overlapping(conn, start, end):
+    """Logs intersecting [start, end), ordered by start."""
+    return _rows(conn.execute("""
+        SELECT t.* FROM time_log_intervals i JOIN time_logs t ON t.id = i.id
+        WHERE i.start_ts < ? AND i.end_ts > ?
+        ORDER BY t.start_ts
+    """, (to_ts(end), to_ts(start))))
+
+
+def containing(conn, moment):
+    """Logs running at `moment`."""
+    ts = to_ts(moment)
+    return _rows(conn.execute("""
+        SELECT t.* FROM time_log_intervals i JOIN time_logs t ON t.id = i.id
+        WHERE i.start_ts <= ? AND i.end_ts > ?
+    """, (ts, ts)))
+
+
+def find_overlaps(conn, start=None, end=None):
+    """
+    [(id, other_id, overlap_minutes)] for every pair of logs that overlap,
+    optionally within [start, end). Each log probes the R*Tree once.
+    """
+    query = """
+        SELECT a.id, b.id,
+               (min(a.end_ts, b.end_ts) - max(a.start_ts, b.start_ts)) / 60.0
+        FROM time_log_intervals a JOIN time_log_intervals b
+          ON b.start_ts < a.end_ts AND b.end_ts > a.start_ts AND b.id > a.id
+    """
+    params = ()
+    if start is not None and end is not None:
+        query += " WHERE a.start_ts < ? AND a.end_ts > ?"
+        params = (to_ts(end), to_ts(start))
+    return conn.execute(query + " ORDER BY a.start_ts", params).fetchall()
+
+
+def gaps(conn, day, day_start="08:00", day_end="22:00", min_minutes=15):
+    """
+    Untracked stretches of `day` between day_start and day_end that last
+    at least min_minutes, as [(start 'HH:MM', end 'HH:MM', minutes)].
+    """
+    day = day if isinstance(day, str) else day.isoformat()
+    window_start = to_ts(f"{day} {day_start}")
+    window_end = to_ts(f"{day} {day_end}")
+    intervals = conn.execute(
+        "SELECT start_ts, end_ts FROM time_log_intervals WHERE start_ts < ? AND end_ts > ? ORDER BY start_ts",
+        (window_end, window_start),
+    ).fetchall()
+
+    def clock(ts):
+        return (datetime(1970, 1, 1) + timedelta(seconds=ts)).strftime("%H:%M")
+
+    found = []
+    cursor = window_start
+    for start_ts, end_ts in intervals + [(window_end, window_end)]:
+        if start_ts - cursor >= min_minutes * 60:
+            found.append((clock(cursor), clock(min(start_ts, window_end)), (start_ts - cursor) // 60))
+        cursor = max(cursor, end_ts)
+        if cursor >= window_end:
+            break
+    return found
+
+
+def heatmap(conn, week_start=None, category=None):
+    """
+    7 x 24 minutes grid (rows Monday..Sunday, columns hours). With
+    week_start, that week from the hourly rollup; without, all time.
+    """
+    grid = [[0.0] * 24 for _ in range(7)]
+    if week_start is None:
+        query = "SELECT weekday, hour, SUM(minutes) FROM time_rollup_weekhour"
+        params = []
+        if category is not None:
+            query += " WHERE category = ?"
+            params.append(category)
+        rows = conn.execute(query + " GROUP BY weekday, hour", params)
+    else:
+        first = datetime.strptime(week_start, "%Y-%m-%d").date() if isinstance(week_start, str) else week_start
+        query = """SELECT (CAST(strftime('%w', day) AS INTEGER) + 6) % 7, hour, SUM(minutes)
+                   FROM time_rollup_hourly WHERE day BETWEEN ? AND ?"""
+        params = [first.isoformat(), (first + timedelta(days=6)).isoformat()]
+        if category is not None:
+            query += " AND category = ?"
+            params.append(category)
+        rows = conn.execute(query + " GROUP BY day, hour", params)
+    for weekday, hour, minutes in rows:
+        grid[weekday][hour] += minutes
+    return grid
+
+
+def daily_totals(conn, start, end, category=None):
+    """[(day, category, minutes)] from the daily rollup."""
+    query = "SELECT day, category, minutes FROM time_rollup_daily WHERE day BETWEEN ? AND ?"
+    params = [start if isinstance(start, str) else start.isoformat(),
+              end if isinstance(end, str) else end.isoformat()]
+    if category is not None:
+        query += " AND category = ?"
+        params.append(category)
+    return conn.execute(query + " ORDER BY day, category", params).fetchall()
+
+
+def category_totals(conn, start=None, end=None):
+    """{category: minutes}, all time or between two days."""
+    query = "SELECT category, SUM(minutes) FROM time_rollup_daily"
+    params = []
+    if start is not None and end is not None:
+        query += " WHERE day BETWEEN ? AND ?"
+        params = [str(start), str(end)]
+    return dict(conn.execute(query + " GROUP BY category", params).fetchall())
@@ -0,0 +1,254 @@
+"""
+Typed numeric series for health metrics, with chart downsampling.
+
+health_metrics.value is declared REAL but multi-part readings such as blood
+pressure are stored as text ('120/85'). health_series keeps one numeric row
+per (metric, component) instead, e.g. Blood Pressure -> systolic/diastolic,
+Weight -> value. Triggers keep it in step with health_metrics, so charts and
+averages read plain numbers straight from an index on (type, component, date).
+
+Charts never need more points than they have pixels, so the getters here
+downsample long histories: min/max buckets in SQL (cheap, keeps spikes) or
+LTTB in Python (keeps the visual shape).
+"""
+
+
+# Names for the parts of 'a/b' readings; other types fall back to part1/part2.
+COMPONENTS = {
+    "Blood Pressure": ("systolic", "diastolic"),
+}
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS health_series (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        metric_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        type TEXT NOT NULL,
+        component TEXT NOT NULL,
+        value REAL NOT NULL
+    )""",
+    """CREATE INDEX IF NOT EXISTS idx_health_series_type_component_date
+    ON health_series (type, component, date)""",
+    """CREATE INDEX IF NOT EXISTS idx_health_series_metric
+    ON health_series (metric_id)""",
+]
+
+# True when a text fragment is an unsigned decimal number (CAST would turn
+# anything else, e.g. 'n/a', into 0.0).
+_NUMERIC = "(trim({0}) GLOB '[0-9]*' AND trim({0}) NOT GLOB '*[^0-9.]*')"
+_PART1 = "substr({src}.value, 1, instr({src}.value, '/') - 1)"
+_PART2 = "substr({src}.value, instr({src}.value, '/') + 1)"
+
+# Statements run for NEW inside the triggers (and, with health_metrics as the
+# source, for the backfill). The REAL column's affinity already stores numeric
+# text as a number, so a plain value still typed text is not a number and is
+# left out rather than charted as 0.
+_SPLIT_SQL = f"""
+    INSERT INTO health_series (metric_id, date, type, component, value)
+    SELECT {{src}}.id, {{src}}.date, {{src}}.type, 'value', {{src}}.value
+    {{from_clause}} typeof({{src}}.value) IN ('integer', 'real');
+    INSERT INTO health_series (metric_id, date, type, component, value)
+    SELECT {{src}}.id, {{src}}.date, {{src}}.type,
+           CASE {{src}}.type WHEN 'Blood Pressure' THEN 'systolic' ELSE 'part1' END,
+           CAST({_PART1} AS REAL)
+    {{from_clause}} instr(CAST({{src}}.value AS TEXT), '/') > 0 AND {_NUMERIC.format(_PART1)};
+    INSERT INTO health_series (metric_id, date, type, component, value)
+    SELECT {{src}}.id, {{src}}.date, {{src}}.type,
+           CASE {{src}}.type WHEN 'Blood Pressure' THEN 'diastolic' ELSE 'part2' END,
+           CAST({_PART2} AS REAL)
+    {{from_clause}} instr(CAST({{src}}.value AS TEXT), '/') > 0 AND {_NUMERIC.format(_PART2)};
+"""
+
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_health_metrics_series_insert
+    AFTER INSERT ON health_metrics
+    BEGIN
+        {_SPLIT_SQL.format(src="NEW", from_clause="WHERE")}
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_health_metrics_series_delete
+    AFTER DELETE ON health_metrics
+    BEGIN
+        DELETE FROM health_series WHERE metric_id = OLD.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_health_metrics_series_update
+    AFTER UPDATE OF date, type, value ON health_metrics
+    BEGIN
+        DELETE FROM health_series WHERE metric_id = OLD.id;
+        {_SPLIT_SQL.format(src="NEW", from_clause="WHERE")}
+    END""",
+]
+
+
+def create_schema(conn):
+    for sql in SCHEMA + TRIGGERS:
+        conn.execute(sql)
+    rebuild_series(conn, in_transaction=True)
+
+
+def recreate_triggers(conn):
+    """Replace triggers created by an older version of TRIGGERS and rebuild the series."""
+    for name in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_health_metrics_series_{name}")
+    for sql in TRIGGERS:
+        conn.execute(sql)
+    rebuild_series(conn, in_transaction=True)
+
+
+def rebuild_series(conn, in_transaction=False):
+    """Re-derive health_series from health_metrics."""
+    statements = ["DELETE FROM health_series"] + [
+        s for s in _SPLIT_SQL.format(src="m", from_clause="FROM health_metrics m WHERE").split(";")
+        if s.strip()
+    ]
+    if in_transaction:
+        for sql in statements:
+            conn.execute(sql)
+        return
+    with conn:
+        for sql in statements:
+            conn.execute(sql)
+
+
+# ----- downsampling -----
+
+def lttb(points, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling of [(x, y), ...] sorted by x.
+
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with its neighbours, which preserves the visual shape.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_bucket = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = points[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def _range_clause(start, end):
+    clauses, params = [], []
+    if start:
+        clauses.append("date >= ?")
+        params.append(start)
+    if end:
+        clauses.append("date <= ?")
+        params.append(end)
+    return clauses, params
+
+
+def series_components(conn, metric_type):
+    return [
+        row[0] for row in conn.execute(
+            "SELECT DISTINCT component FROM health_series WHERE type = ? ORDER BY component",
+            (metric_type,),
+        )
+    ]
+
+
+def get_series(conn, metric_type, component="value", start=None, end=None,
+               max_points=500, method="lttb"):
+    """
+    [(date, value)] for one metric component, at most max_points long.
+
+    method='lttb' keeps the line's shape; method='minmax' buckets the range
+    in SQL and returns each bucket's min and max, so spikes survive.
+    """
+    clauses, params = _range_clause(start, end)
+    where = " AND ".join(["type = ?", "component = ?"] + clauses)
+    params = [metric_type, component] + params
+
+    if method == "minmax":
+        return _minmax_series(conn, "health_series", "value", where, params, max_points)
+
+    rows = conn.execute(
+        f"SELECT date, value FROM health_series WHERE {where} ORDER BY date, id", params
+    ).fetchall()
+    return _lttb_dates(rows, max_points)
+
+
+FITNESS_COLUMNS = ("duration_min", "calories", "distance_km")
+
+
+def get_fitness_series(conn, column, activity_type=None, start=None, end=None,
+                       max_points=500, method="lttb"):
+    """[(date, value)] of one fitness_logs column, downsampled like get_series()."""
+    if column not in FITNESS_COLUMNS:
+        raise ValueError(f"Unknown fitness column: {column}")
+    clauses, params = _range_clause(start, end)
+    clauses.append(f"{column} IS NOT NULL")
+    if activity_type:
+        clauses.insert(0, "activity_type = ?")
+        params.insert(0, activity_type)
+    where = " AND ".join(clauses)
+
+    if method == "minmax":
+        return _minmax_series(conn, "fitness_logs", column, where, params, max_points)
+    rows = conn.execute(
+        f"SELECT date, {column} FROM fitness_logs WHERE {where} ORDER BY date, id", params
+    ).fetchall()
+    return _lttb_dates(rows, max_points)
+
+
+def _lttb_dates(rows, max_points):
+    if len(rows) <= max_points:
+        return [(d, v) for d, v in rows]
+    # LTTB needs numeric x; index the rows by position and map back to dates
+    indexed = [(i, v) for i, (_d, v) in enumerate(rows)]
+    return [rows[i] for i, _v in lttb(indexed, max_points)]
+
+
+def _minmax_series(conn, table, column, where, params, max_points):
+    span = conn.execute(
+        f"SELECT MIN(julianday(date)), MAX(julianday(date)), COUNT(*) FROM {table} WHERE {where}",
+        params,
+    ).fetchone()
+    first, last, count = span
+    if not count:
+        return []
+    buckets = max(1, max_points // 2)
+    width = max((last - first) / buckets, 1e-9)
+    # Each bucket contributes the rows holding its min and its max (one row if
+    # they coincide), at their own dates and in date order. The last date
+    # lands exactly on `buckets`, so the index is clamped into the last bucket.
+    rows = conn.execute(
+        f"""
+        WITH bucketed AS (
+            SELECT id, date, {column} AS value,
+                   min(CAST((julianday(date) - ?) / ? AS INTEGER), ?) AS bucket
+            FROM {table}
+            WHERE {where}
+        ), ranked AS (
+            SELECT id, date, value, bucket,
+                   ROW_NUMBER() OVER (PARTITION BY bucket ORDER BY value, date, id) AS low_rank,
+                   ROW_NUMBER() OVER (PARTITION BY bucket ORDER BY value DESC, date, id) AS high_rank
+            FROM bucketed
+        )
+        SELECT date, value FROM ranked
+        WHERE low_rank = 1 OR high_rank = 1
+        ORDER BY bucket, date, id
+        """,
+        [first, width, buckets - 1] + params,
+    ).fetchall()
+    return [(d, v) for d, v in rows]
@@ -1,5 +1,8 @@
 import sqlite3
 import sys
+import time
+
+from database.diagnostics import explain_plan
 
 def run_shell():
     db_path = 'life_ledger.db'
@@ -9,13 +12,27 @@ def run_shell():
         cursor = conn.cursor()
         print("Connected! Enter your SQL queries below completely. Type 'exit' to quit.")
         print("Example: SELECT * FROM transactions LIMIT 5;")
+        print("Dot commands: .timer on|off, .plan <query>")
+        timer = False
         
         while True:
             query = input("SQL> ")
             if query.lower() in ('exit', 'quit'):
                 break
             
+            if query.startswith('.timer'):
+                arg = query[len('.timer'):].strip().lower()
+                if arg in ('on', 'off'):
+                    timer = arg == 'on'
+                print(f"Timer is {'on' if timer else 'off'}.")
+                continue
+            if query.startswith('.plan'):
+                for line in explain_plan(conn, query[len('.plan'):].strip()):
+                    print(f"  {line}")
+                continue
+            
             try:
+                start = time.perf_counter()
                 cursor.execute(query)
                 if query.strip().upper().startswith("SELECT"):
                     results = cursor.fetchall()
@@ -31,6 +48,8 @@ def run_shell():
                 else:
                     conn.commit()
                     print(f"Query executed. Rows affected: {cursor.rowcount}")
+                if timer:
+                    print(f"Run Time: {(time.perf_counter() - start) * 1000:.2f} ms")
             except sqlite3.Error as e:
                 print(f"Error: {e}")
                 
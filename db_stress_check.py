@@ -0,0 +1,88 @@
+"""
+Stress check for the WAL connection pool.
+
+Holds one long write transaction open while several reader threads keep
+querying the ledger, and reports how many reads each reader completed during
+the write. With the old rollback journal the readers would stall until the
+writer committed.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from database.migrations import migrate
+from database.pool import ConnectionPool
+
+
+def run_stress_check(readers=4, write_rows=100_000, chunk=5_000):
+    print(">>> STARTING WAL STRESS CHECK <<<")
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "stress.db")
+
+    pool = ConnectionPool(db_path)
+    migrate(pool.writer)
+    pool.execute_many(
+        "INSERT INTO transactions (date, amount, category, type, description) VALUES (?, ?, ?, ?, ?)",
+        (("2025-01-01", 10.0, "Food", "EXPENSE", "seed") for _ in range(10_000)),
+    )
+
+    writing = threading.Event()
+    done = threading.Event()
+    counts = [0] * readers
+    errors = []
+
+    def reader(idx):
+        writing.wait()
+        try:
+            while not done.is_set():
+                pool.fetch_one("SELECT COUNT(*) AS n, SUM(amount) AS total FROM transactions")
+                counts[idx] += 1
+        except Exception as e:
+            errors.append(e)
+
+    def writer():
+        with pool.write_transaction() as conn:
+            writing.set()
+            for start in range(0, write_rows, chunk):
+                conn.executemany(
+                    "INSERT INTO transactions (date, amount, category, type, description) VALUES (?, ?, ?, ?, ?)",
+                    (("2025-02-01", 1.0, "Bulk", "EXPENSE", "stress") for _ in range(chunk)),
+                )
+        done.set()
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    started = time.perf_counter()
+    writer_thread = threading.Thread(target=writer)
+    writer_thread.start()
+    writer_thread.join()
+    write_secs = time.perf_counter() - started
+    for t in threads:
+        t.join()
+
+    journal = pool.fetch_one("PRAGMA journal_mode")
+    pool.close()
+    for name in os.listdir(tmp_dir):
+        os.remove(os.path.join(tmp_dir, name))
+    os.rmdir(tmp_dir)
+
+    print(f"journal_mode: {list(journal.values())[0]}")
+    print(f"write of {write_rows} rows held the writer for {write_secs:.2f}s")
+    for idx, count in enumerate(counts):
+        print(f"  reader {idx}: {count} reads during the write")
+
+    if errors:
+        print(f"[FAIL] Reader errors: {errors[0]}")
+        return False
+    if min(counts) == 0:
+        print("[FAIL] A reader made no progress during the write")
+        return False
+    print("[PASS] Concurrent readers progressed during a long write")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_stress_check() else 1)
@@ -1,7 +1,11 @@
+import time
+_STARTED = time.perf_counter()
+
+import os
 import sys
 import traceback
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
 from ui.components.error_dialog import ErrorDialog
 
 def exception_hook(exc_type, exc_value, exc_traceback):
@@ -22,10 +26,22 @@ def exception_hook(exc_type, exc_value, exc_traceback):
     else:
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
 
+def report_first_paint(app):
+    """
+    Print time-to-first-paint and quit; used by startup_benchmark.py.
+    """
+    app.processEvents()
+    print(f"FIRST_PAINT_MS={(time.perf_counter() - _STARTED) * 1000:.1f}", flush=True)
+    app.quit()
+
 if __name__ == "__main__":
     sys.excepthook = exception_hook
     
     app = QApplication(sys.argv)
+    # Imported after the app exists so import errors reach the error dialog
+    from ui.main_window import MainWindow
     window = MainWindow()
     window.show()
+    if os.environ.get("LIFE_LEDGER_EXIT_AFTER_PAINT"):
+        QTimer.singleShot(0, lambda: report_first_paint(app))
     sys.exit(app.exec())
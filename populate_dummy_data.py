@@ -1,23 +1,34 @@
 """
 Comprehensive Dummy Data Population Script for Life Ledger
 This script populates ALL modules with realistic sample data for testing and demonstration.
+
+By default it builds ~90 days of history. For scaling work it doubles as a
+seeded generator: high-volume tables are produced lazily and streamed through
+the bulk insert path, so millions of rows never sit in memory at once.
+Everything is written through a single connection, migrated up front.
+
+    python populate_dummy_data.py                      # demo data
+    python populate_dummy_data.py --years 10 --scale 5 --seed 42 --db bench.db
 """
 
-from database.manager import DatabaseManager
-from models.transaction import TransactionModel
-from models.inventory import InventoryModel
-from models.person import PersonModel
-from models.finance import AssetModel, LoanModel, SavingsModel, InsuranceModel
-from models.automation import AutomationModel
-from models.event import EventModel
-from models.goal import GoalModel
-from models.health import HealthModel
-from models.fitness import FitnessModel
-from models.digital_life import DigitalSubscriptionModel, DigitalAccountModel, DigitalAssetModel
+from database import bulk
+from database.migrations import migrate
 from datetime import datetime, timedelta
+import argparse
 import random
 
-def clear_all_data(db):
+# Seeded runs date everything back from here, so a seed produces the same
+# rows whichever day it runs on (the demo data follows the wall clock).
+ANCHOR = datetime(2025, 1, 1)
+
+
+def scaled(rows, scale):
+    """`rows` repeated `scale` times; copies after the first get a numbered name (first field)."""
+    for copy in range(scale):
+        for row in rows:
+            yield row if not copy else (f"{row[0]} ({copy + 1})",) + tuple(row[1:])
+
+def clear_all_data(conn):
     """Clear existing data (optional - comment out if you want to keep existing data)"""
     print("Clearing existing data...")
     tables = [
@@ -25,26 +36,20 @@ def clear_all_data(db):
         'loans', 'insurance', 'savings_goals', 'recurring_transactions', 'budgets',
         'events', 'event_tasks', 'goals', 'goal_logs', 'health_metrics', 
         'medications', 'fitness_logs', 'body_metrics',
-        'digital_subscriptions', 'digital_accounts', 'digital_assets'
+        'digital_subscriptions', 'digital_accounts', 'digital_assets', 'time_logs'
     ]
     for table in tables:
         try:
-            db.execute_query(f"DELETE FROM {table}")
+            with conn:
+                conn.execute(f"DELETE FROM {table}")
         except:
             pass
     print("  [OK] Data cleared\n")
 
-def populate_finances(db):
+def populate_finances(conn, today, days=90, scale=1):
     """Populate financial data: transactions, assets, loans, insurance, savings"""
     print("Populating Financial Data...")
     
-    trans_model = TransactionModel(db)
-    asset_model = AssetModel(db)
-    loan_model = LoanModel(db)
-    savings_model = SavingsModel(db)
-    insurance_model = InsuranceModel(db)
-    auto_model = AutomationModel(db)
-    
     # Transactions (last 90 days)
     income_sources = [
         ("Salary", 5500, "Salary"),
@@ -70,25 +75,25 @@ def populate_finances(db):
         ("Healthcare", 120, "Health")
     ]
     
-    today = datetime.now()
-    
-    # Add income (monthly)
-    for month in range(3):
-        for desc, amount, category in income_sources:
-            date = (today - timedelta(days=30*month + random.randint(1, 5))).strftime('%Y-%m-%d')
-            trans_model.add_transaction(date, amount, category, 'INCOME', desc)
-    
-    # Add expenses (spread over 90 days)
-    for day in range(90):
-        date = (today - timedelta(days=day)).strftime('%Y-%m-%d')
-        # Random 2-4 expenses per day
-        num_expenses = random.randint(2, 4)
-        for _ in range(num_expenses):
-            desc, base_amount, category = random.choice(expense_categories)
-            amount = base_amount * random.uniform(0.7, 1.3)
-            trans_model.add_transaction(date, amount, category, 'EXPENSE', desc)
-    
-    print("  [OK] Added transactions")
+    def transactions():
+        # Add income (monthly)
+        for month in range(max(1, days // 30)):
+            for desc, amount, category in income_sources:
+                date = (today - timedelta(days=30*month + random.randint(1, 5))).strftime('%Y-%m-%d')
+                yield (date, amount, category, 'INCOME', desc)
+        
+        # Add expenses (spread over the whole period)
+        for day in range(days):
+            date = (today - timedelta(days=day)).strftime('%Y-%m-%d')
+            # Random 2-4 expenses per day (times scale)
+            num_expenses = random.randint(2 * scale, 4 * scale)
+            for _ in range(num_expenses):
+                desc, base_amount, category = random.choice(expense_categories)
+                amount = base_amount * random.uniform(0.7, 1.3)
+                yield (date, amount, category, 'EXPENSE', desc)
+    
+    count = bulk.add_transactions_many(conn, transactions())
+    print(f"  [OK] Added {count} transactions")
     
     # Financial Assets
     assets = [
@@ -100,8 +105,9 @@ def populate_finances(db):
         ("Crypto Holdings", "Cryptocurrency", 8500, "Coinbase")
     ]
     
-    for name, asset_type, value, institution in assets:
-        asset_model.add_asset(name, asset_type, value, institution, "")
+    bulk.insert_many(conn, "financial_assets", ("name", "type", "value", "institution", "notes"),
+                     ((name, asset_type, value, institution, "")
+                      for name, asset_type, value, institution in scaled(assets, scale)))
     
     print("  [OK] Added financial assets")
     
@@ -112,8 +118,8 @@ def populate_finances(db):
         ("Personal Loan", "Personal Loan", 5000, 2800, 7.2, "2025-08-20", "Marcus")
     ]
     
-    for name, loan_type, principal, balance, rate, due_date, institution in loans:
-        loan_model.add_loan(name, loan_type, principal, balance, rate, due_date, institution)
+    bulk.insert_many(conn, "loans", ("name", "type", "principal_amount", "current_balance", "interest_rate",
+                                     "due_date", "institution"), scaled(loans, scale))
     
     print("  [OK] Added loans")
     
@@ -125,8 +131,8 @@ def populate_finances(db):
         ("Renters Insurance", "Property", 25, "Monthly", 50000, "2026-11-01", "Lemonade-44556")
     ]
     
-    for name, ins_type, premium, frequency, coverage, renewal, policy_num in insurance_policies:
-        insurance_model.add_insurance(name, ins_type, premium, frequency, coverage, renewal, policy_num)
+    bulk.insert_many(conn, "insurance", ("name", "type", "premium_amount", "payment_frequency", "coverage_amount",
+                                         "renewal_date", "policy_number"), scaled(insurance_policies, scale))
     
     print("  [OK] Added insurance policies")
     
@@ -138,8 +144,9 @@ def populate_finances(db):
         ("House Down Payment", 50000, 15000, "2028-06-01")
     ]
     
-    for name, target, current, deadline in savings_goals:
-        savings_model.add_goal(name, target, current, deadline, "")
+    bulk.insert_many(conn, "savings_goals", ("name", "target_amount", "current_amount", "deadline", "notes"),
+                     ((name, target, current, deadline, "")
+                      for name, target, current, deadline in scaled(savings_goals, scale)))
     
     print("  [OK] Added savings goals")
     
@@ -154,8 +161,12 @@ def populate_finances(db):
         ("Utilities", 200)
     ]
     
-    for category, limit in budgets:
-        auto_model.set_budget(category, limit)
+    bulk.execute_many(
+        conn,
+        "INSERT INTO budgets (category, monthly_limit) VALUES (?, ?) "
+        "ON CONFLICT (category) DO UPDATE SET monthly_limit = excluded.monthly_limit",
+        budgets,
+    )
     
     print("  [OK] Added budgets")
     
@@ -167,18 +178,15 @@ def populate_finances(db):
         ("Salary", 5500, "Salary", "INCOME", "Monthly", "2024-01-01")
     ]
     
-    for name, amount, category, trans_type, frequency, start_date in recurring:
-        # Model now supports type and start_date
-        auto_model.add_recurring(name, amount, category, trans_type, frequency, start_date)
+    bulk.insert_many(conn, "recurring_transactions", ("name", "amount", "category", "type", "frequency", "start_date"),
+                     scaled(recurring, scale))
     
     print("  [OK] Added recurring transactions\n")
 
-def populate_inventory(db):
+def populate_inventory(conn, scale=1):
     """Populate inventory/possessions"""
     print("Populating Inventory...")
     
-    inv_model = InventoryModel(db)
-    
     items = [
         ("MacBook Pro 16\"", 2800, 2400, "2023-06-15", "Electronics"),
         ("iPhone 15 Pro", 1200, 1000, "2023-09-20", "Electronics"),
@@ -197,17 +205,15 @@ def populate_inventory(db):
         ("Air Purifier", 300, 280, "2023-06-01", "Appliances")
     ]
     
-    for name, purchase_price, current_value, purchase_date, category in items:
-        inv_model.add_item(name, purchase_price, current_value, purchase_date, category)
+    bulk.insert_many(conn, "inventory", ("name", "purchase_price", "current_value", "purchase_date", "category"),
+                     scaled(items, scale))
     
     print("  [OK] Added inventory items\n")
 
-def populate_people(db):
+def populate_people(conn, today, scale=1):
     """Populate contacts and debts"""
     print("Populating People & Relationships...")
     
-    person_model = PersonModel(db)
-    
     contacts = [
         ("Alice Johnson", "alice.j@email.com", "+1-555-0101", "1990-05-15", "Friend"),
         ("Bob Smith", "bob.smith@email.com", "+1-555-0102", "1988-08-22", "Friend"),
@@ -219,62 +225,68 @@ def populate_people(db):
         ("Henry Wilson", "henry.w@email.com", "+1-555-0108", "1991-04-12", "Family")
     ]
     
-    for name, email, phone, birthday, category in contacts:
-        last_contacted = (datetime.now() - timedelta(days=random.randint(1, 60))).strftime('%Y-%m-%d')
-        person_model.add_contact(name, email, phone, birthday, last_contacted, f"Notes about {name}")
+    def contact_rows():
+        for name, email, phone, birthday, category in scaled(contacts, scale):
+            last_contacted = (today - timedelta(days=random.randint(1, 60))).strftime('%Y-%m-%d')
+            yield (name, email, phone, birthday, last_contacted, f"Notes about {name}")
     
+    count = bulk.insert_many(conn, "contacts", ("name", "email", "phone", "birthday", "last_contacted", "notes"),
+                             contact_rows())
     print("  [OK] Added contacts")
     
-    # Get contact IDs for debts
-    all_contacts = person_model.get_contacts()
+    # IDs of the contacts just added, in insertion order
+    contact_ids = [row[0] for row in conn.execute("SELECT id FROM contacts ORDER BY id DESC LIMIT ?", (count,))][::-1]
     
-    # Add some debts
+    # Add some debts (for each copy of the contact list)
     debts = [
-        (all_contacts[0]['id'], 50, "OWED_TO_ME", "Lunch money", "2026-02-15", False),
-        (all_contacts[1]['id'], 200, "I_OWE", "Concert tickets", "2026-01-20", False),
-        (all_contacts[4]['id'], 150, "OWED_TO_ME", "Shared Airbnb", "2026-03-01", False),
-        (all_contacts[5]['id'], 500, "I_OWE", "Business loan", "2026-06-30", False)
+        (0, 50, "OWED_TO_ME", "Lunch money", "2026-02-15", False),
+        (1, 200, "I_OWE", "Concert tickets", "2026-01-20", False),
+        (4, 150, "OWED_TO_ME", "Shared Airbnb", "2026-03-01", False),
+        (5, 500, "I_OWE", "Business loan", "2026-06-30", False)
     ]
     
-    for contact_id, amount, debt_type, description, due_date, settled in debts:
-        person_model.add_debt(contact_id, amount, debt_type, description, due_date, settled)
+    bulk.insert_many(conn, "debts", ("contact_id", "amount", "type", "description", "due_date", "is_settled"),
+                     ((contact_ids[copy * len(contacts) + index],) + tuple(rest)
+                      for copy in range(scale) for index, *rest in debts))
     
     print("  [OK] Added debts\n")
 
-def populate_health(db):
+def populate_health(conn, today, days=60, scale=1):
     """Populate health metrics and medications"""
     print("Populating Health Data...")
     
-    health_model = HealthModel(db)
+    # Health metrics over the `days` days up to `today` (`scale` readings per reading day)
     
-    # Health metrics over last 60 days
-    today = datetime.now()
+    def metrics():
+        for day in range(days):
+            date = (today - timedelta(days=day)).strftime('%Y-%m-%d')
+            for _ in range(scale):
+                yield from readings(day, date)
     
-    for day in range(60):
-        date = (today - timedelta(days=day)).strftime('%Y-%m-%d')
-        
+    def readings(day, date):
         # Blood Pressure (every 3 days)
         if day % 3 == 0:
             systolic = random.randint(115, 125)
             diastolic = random.randint(75, 85)
-            health_model.add_metric("Blood Pressure", f"{systolic}/{diastolic}", "mmHg", date)
+            yield ("Blood Pressure", f"{systolic}/{diastolic}", "mmHg", date, "")
         
         # Heart Rate (every 2 days)
         if day % 2 == 0:
             hr = random.randint(65, 75)
-            health_model.add_metric("Heart Rate", hr, "bpm", date)
+            yield ("Heart Rate", hr, "bpm", date, "")
         
         # Weight (weekly)
         if day % 7 == 0:
             weight = 75 + random.uniform(-2, 2)
-            health_model.add_metric("Weight", round(weight, 1), "kg", date)
+            yield ("Weight", round(weight, 1), "kg", date, "")
         
         # Blood Sugar (every 5 days)
         if day % 5 == 0:
             glucose = random.randint(85, 105)
-            health_model.add_metric("Blood Sugar", glucose, "mg/dL", date)
+            yield ("Blood Sugar", glucose, "mg/dL", date, "")
     
-    print("  [OK] Added health metrics")
+    count = bulk.add_health_metrics_many(conn, metrics())
+    print(f"  [OK] Added {count} health metrics")
     
     # Medications
     medications = [
@@ -284,19 +296,16 @@ def populate_health(db):
         ("Allergy Medicine", "10mg", "As needed", "2024-03-15")
     ]
     
-    for name, dosage, frequency, start_date in medications:
-        health_model.add_medication(name, dosage, frequency, start_date, f"Taking {name}")
+    bulk.insert_many(conn, "medications", ("name", "dosage", "frequency", "start_date", "notes"),
+                     ((name, dosage, frequency, start_date, f"Taking {name}")
+                      for name, dosage, frequency, start_date in scaled(medications, scale)))
     
     print("  [OK] Added medications\n")
 
-def populate_fitness(db):
+def populate_fitness(conn, today, days=60, scale=1):
     """Populate fitness logs and body metrics"""
     print("Populating Fitness Data...")
     
-    fitness_model = FitnessModel(db)
-    
-    today = datetime.now()
-    
     activities = [
         ("Running", 45, 450, 7.5),
         ("Cycling", 60, 520, 20),
@@ -307,42 +316,70 @@ def populate_fitness(db):
         ("HIIT Workout", 25, 320, 0)
     ]
     
-    # Add fitness logs (3-4 times per week for last 60 days)
-    for day in range(60):
-        date = (today - timedelta(days=day)).strftime('%Y-%m-%d')
-        
-        # 50% chance of workout on any given day
-        if random.random() > 0.5:
-            activity, duration, calories, distance = random.choice(activities)
-            # Add some variation
-            duration = int(duration * random.uniform(0.8, 1.2))
-            calories = int(calories * random.uniform(0.9, 1.1))
-            if distance > 0:
-                distance = round(distance * random.uniform(0.8, 1.2), 2)
-            else:
-                distance = None
+    # Add fitness logs (3-4 times per week over the last `days` days)
+    def logs():
+        for day in range(days):
+            date = (today - timedelta(days=day)).strftime('%Y-%m-%d')
             
-            fitness_model.add_log(date, activity, duration, calories, distance)
-    
-    print("  [OK] Added fitness logs")
+            # 50% chance of workout on any given day (`scale` chances)
+            for _ in range(scale):
+                if random.random() <= 0.5:
+                    continue
+                activity, duration, calories, distance = random.choice(activities)
+                # Add some variation
+                duration = int(duration * random.uniform(0.8, 1.2))
+                calories = int(calories * random.uniform(0.9, 1.1))
+                if distance > 0:
+                    distance = round(distance * random.uniform(0.8, 1.2), 2)
+                else:
+                    distance = None
+                
+                yield (date, activity, duration, calories, distance, "")
+    
+    count = bulk.add_fitness_logs_many(conn, logs())
+    print(f"  [OK] Added {count} fitness logs")
     
     # Body metrics (weekly)
-    for week in range(12):
-        date = (today - timedelta(days=week*7)).strftime('%Y-%m-%d')
-        weight = 75 + random.uniform(-3, 3)
-        body_fat = 18 + random.uniform(-2, 2)
-        muscle_mass = 35 + random.uniform(-1, 1)
-        
-        fitness_model.add_body_metric(date, round(weight, 1), round(body_fat, 1), round(muscle_mass, 1))
+    def body_metrics():
+        for week in range(max(12, days // 7)):
+            date = (today - timedelta(days=week*7)).strftime('%Y-%m-%d')
+            weight = 75 + random.uniform(-3, 3)
+            body_fat = 18 + random.uniform(-2, 2)
+            muscle_mass = 35 + random.uniform(-1, 1)
+            
+            yield (date, round(weight, 1), round(body_fat, 1), round(muscle_mass, 1))
     
+    bulk.add_body_metrics_many(conn, body_metrics())
     print("  [OK] Added body metrics\n")
 
-def populate_goals(db):
+def populate_time_logs(conn, today, days=60, scale=1):
+    """Populate tracked time blocks (workdays, workouts, evenings)"""
+    print("Populating Time Logs...")
+    
+    def logs():
+        for day in range(days):
+            current = today - timedelta(days=day)
+            date = current.strftime('%Y-%m-%d')
+            if current.weekday() < 5:
+                yield ("Deep Work", "Work", date, "09:00", "12:00", 180, "")
+                yield ("Meetings", "Work", date, "13:00", "17:00", 240, "")
+            if random.random() > 0.5:
+                yield ("Gym", "Health", date, "07:00", "08:00", 60, "")
+            start_hour = random.randint(19, 21)
+            yield ("Reading", "Leisure", date, f"{start_hour:02d}:00", f"{start_hour + 1:02d}:30", 90, "")
+            # Extra short blocks through the working day when scaled up
+            for block in range(scale - 1):
+                hour = 8 + block % 10
+                minutes = random.choice([15, 30, 45])
+                yield ("Admin", "Work", date, f"{hour:02d}:00", f"{hour:02d}:{minutes:02d}", minutes, "")
+    
+    count = bulk.add_time_logs_many(conn, logs())
+    print(f"  [OK] Added {count} time logs\n")
+
+def populate_goals(conn, today, days=60, scale=1):
     """Populate personal and savings goals"""
     print("Populating Goals...")
     
-    goal_model = GoalModel(db)
-    
     goals = [
         ("Read 24 Books This Year", "HABIT", 24, 8, "2024-01-01", "2026-12-31", "Active"),
         ("Meditate Daily", "HABIT", 365, 45, "2024-01-01", "2026-12-31", "Active"),
@@ -353,29 +390,31 @@ def populate_goals(db):
         ("Lose 10kg", "HABIT", 10, 4, "2024-01-01", "2026-06-30", "Active")
     ]
     
-    for name, goal_type, target, current, start_date, end_date, status in goals:
-        goal_model.add_goal(name, goal_type, target, current, start_date, end_date, None, status)
+    count = bulk.insert_many(conn, "goals", ("name", "type", "target_value", "current_value", "start_date",
+                                             "end_date", "status"), scaled(goals, scale))
     
     print("  [OK] Added goals")
     
-    # Add some goal logs
-    all_goals = goal_model.get_goals()
-    for goal in all_goals[:3]:  # Add logs for first 3 goals
-        for i in range(5):
-            date = (datetime.now() - timedelta(days=i*7)).strftime('%Y-%m-%d')
-            value = random.uniform(0.5, 2) if goal['type'] == 'HABIT' else random.uniform(50, 200)
-            goal_model.add_goal_log(goal['id'], value, date, f"Progress update {i+1}")
+    # Add weekly goal logs (goals.current_value follows through the goal_progress triggers)
+    added = conn.execute("SELECT id, type FROM goals ORDER BY id DESC LIMIT ?", (count,)).fetchall()[::-1]
+    
+    def logs():
+        for index, (goal_id, goal_type) in enumerate(added):
+            if index % len(goals) >= 3:  # Add logs for the first 3 goals of each copy
+                continue
+            for i in range(max(5, days // 7)):
+                date = (today - timedelta(days=i*7)).strftime('%Y-%m-%d')
+                value = random.uniform(0.5, 2) if goal_type == 'HABIT' else random.uniform(50, 200)
+                yield (goal_id, value, date, f"Progress update {i+1}")
+    
+    bulk.insert_many(conn, "goal_logs", ("goal_id", "value", "date", "note"), logs())
     
     print("  [OK] Added goal logs\n")
 
-def populate_events(db):
+def populate_events(conn, today, scale=1):
     """Populate events and travel plans"""
     print("Populating Events...")
     
-    event_model = EventModel(db)
-    
-    today = datetime.now()
-    
     events = [
         ("Summer Vacation - Hawaii", "Vacation", 
          (today + timedelta(days=120)).strftime('%Y-%m-%d'),
@@ -403,15 +442,18 @@ def populate_events(db):
          "New York, NY", 600, "Confirmed")
     ]
     
-    for name, event_type, start_date, end_date, location, budget, status in events:
-        event_model.add_event(name, event_type, start_date, end_date, location, budget, f"Notes for {name}", status)
+    count = bulk.insert_many(
+        conn, "events", ("name", "type", "start_date", "end_date", "location", "budget", "notes", "status"),
+        ((name, event_type, start_date, end_date, location, budget, f"Notes for {name}", status)
+         for name, event_type, start_date, end_date, location, budget, status in scaled(events, scale)),
+    )
     
     print("  [OK] Added events")
     
     # Add tasks for first event
-    all_events = event_model.get_events()
-    if all_events:
-        event_id = all_events[0]['id']
+    first = conn.execute("SELECT id FROM events ORDER BY id DESC LIMIT 1 OFFSET ?", (count - 1,)).fetchone()
+    if first:
+        event_id = first[0]
         tasks = [
             "Book flights",
             "Reserve hotel",
@@ -419,21 +461,14 @@ def populate_events(db):
             "Pack luggage",
             "Arrange pet care"
         ]
-        for task in tasks:
-            event_model.add_task(event_id, task)
+        bulk.insert_many(conn, "event_tasks", ("event_id", "description"), ((event_id, task) for task in tasks))
     
     print("  [OK] Added event tasks\n")
 
-def populate_digital_life(db):
+def populate_digital_life(conn, today, scale=1):
     """Populate digital subscriptions, accounts, and assets"""
     print("Populating Digital Life...")
     
-    sub_model = DigitalSubscriptionModel(db)
-    acc_model = DigitalAccountModel(db)
-    asset_model = DigitalAssetModel(db)
-    
-    today = datetime.now()
-    
     # Digital Subscriptions
     subscriptions = [
         ("Netflix", "Streaming (Video)", 15.99, "Monthly", (today + timedelta(days=15)).strftime('%Y-%m-%d'), "Netflix Inc.", True),
@@ -448,8 +483,12 @@ def populate_digital_life(db):
         ("LinkedIn Premium", "Productivity", 29.99, "Monthly", (today + timedelta(days=20)).strftime('%Y-%m-%d'), "LinkedIn", False)
     ]
     
-    for name, category, cost, billing, renewal, provider, active in subscriptions:
-        sub_model.add_subscription(name, category, cost, billing, renewal, provider, f"Subscription to {name}", active)
+    bulk.insert_many(
+        conn, "digital_subscriptions",
+        ("name", "category", "cost", "billing_cycle", "next_renewal", "provider", "notes", "is_active"),
+        ((name, category, cost, billing, renewal, provider, f"Subscription to {name}", active)
+         for name, category, cost, billing, renewal, provider, active in scaled(subscriptions, scale)),
+    )
     
     print("  [OK] Added digital subscriptions")
     
@@ -469,8 +508,12 @@ def populate_digital_life(db):
         ("Healthcare Portal", "patient123", "Healthcare", True, (today - timedelta(days=75)).strftime('%Y-%m-%d'), "personal@gmail.com")
     ]
     
-    for service, username, category, has_2fa, last_pwd_change, email in accounts:
-        acc_model.add_account(service, username, category, has_2fa, last_pwd_change, email, f"Account for {service}")
+    bulk.insert_many(
+        conn, "digital_accounts",
+        ("service_name", "username", "category", "has_2fa", "last_password_change", "email", "notes"),
+        ((service, username, category, has_2fa, last_pwd_change, email, f"Account for {service}")
+         for service, username, category, has_2fa, last_pwd_change, email in scaled(accounts, scale)),
+    )
     
     print("  [OK] Added online accounts")
     
@@ -486,33 +529,54 @@ def populate_digital_life(db):
         ("NFT Collection", "NFT/Digital Art", 800, None, "OpenSea", True)
     ]
     
-    for name, asset_type, value, renewal, provider, active in assets:
-        asset_model.add_asset(name, asset_type, value, renewal, provider, f"Digital asset: {name}", active)
+    bulk.insert_many(
+        conn, "digital_assets", ("name", "asset_type", "value", "renewal_date", "provider", "notes", "is_active"),
+        ((name, asset_type, value, renewal, provider, f"Digital asset: {name}", active)
+         for name, asset_type, value, renewal, provider, active in scaled(assets, scale)),
+    )
     
     print("  [OK] Added digital assets\n")
 
-def main():
-    """Main function to populate all dummy data"""
+def main(db_path='life_ledger.db', years=None, scale=1, seed=None, clear=True, anchor=None):
+    """
+    Main function to populate all dummy data.
+    
+    `years` switches from the demo window (90 days of money, 60 of health and
+    fitness) to N years of everything; `scale` multiplies the volume of every
+    module (daily transactions, readings, workouts and time blocks, and copies
+    of the fixed lists) and `seed` makes the run reproducible. Dates count back
+    from `anchor`, which defaults to ANCHOR for seeded runs and to now otherwise.
+    """
     print("=" * 60)
     print("LIFE LEDGER - COMPREHENSIVE DUMMY DATA POPULATION")
     print("=" * 60)
     print()
     
-    # Initialize database
-    db = DatabaseManager()
+    if seed is not None:
+        random.seed(seed)
+    today = anchor or (ANCHOR if seed is not None else datetime.now())
+    finance_days = years * 365 if years else 90
+    tracking_days = years * 365 if years else 60
+    
+    # One connection for the whole run; every table is written in one transaction
+    conn = bulk.connect(db_path)
+    migrate(conn)
     
-    # Optional: Clear existing data (comment out if you want to keep existing data)
-    clear_all_data(db)
+    # Optional: Clear existing data (pass clear=False / --keep to keep existing data)
+    if clear:
+        clear_all_data(conn)
     
     # Populate all modules
-    populate_finances(db)
-    populate_inventory(db)
-    populate_people(db)
-    populate_health(db)
-    populate_fitness(db)
-    populate_goals(db)
-    populate_events(db)
-    populate_digital_life(db)
+    populate_finances(conn, today, finance_days, scale)
+    populate_inventory(conn, scale)
+    populate_people(conn, today, scale)
+    populate_health(conn, today, tracking_days, scale)
+    populate_fitness(conn, today, tracking_days, scale)
+    populate_time_logs(conn, today, tracking_days, scale)
+    populate_goals(conn, today, tracking_days, scale)
+    populate_events(conn, today, scale)
+    populate_digital_life(conn, today, scale)
+    conn.close()
     
     print("=" * 60)
     print("[OK] ALL DUMMY DATA POPULATED SUCCESSFULLY!")
@@ -524,6 +588,7 @@ def main():
     print("  • Contacts and debt relationships")
     print("  • Health metrics and medications")
     print("  • Fitness logs and body metrics")
+    print("  • Time tracking logs")
     print("  • Personal and savings goals")
     print("  • Events and travel plans")
     print("  • Digital subscriptions, accounts, and assets")
@@ -533,5 +598,14 @@ def main():
     print()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Populate the ledger with sample data.")
+    parser.add_argument("--db", default="life_ledger.db", help="database file to populate")
+    parser.add_argument("--years", type=int, help="generate N years of history instead of the demo window")
+    parser.add_argument("--scale", type=int, default=1, help="multiply the volume of every module")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible data")
+    parser.add_argument("--anchor", type=datetime.fromisoformat,
+                        help="date (YYYY-MM-DD) to count history back from; seeded runs default to 2025-01-01")
+    parser.add_argument("--keep", action="store_true", help="keep existing data instead of clearing it")
+    args = parser.parse_args()
+    main(args.db, years=args.years, scale=args.scale, seed=args.seed, clear=not args.keep, anchor=args.anchor)
 
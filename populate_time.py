@@ -1,11 +1,12 @@
-from database.manager import DatabaseManager
-from models.time_tracking import TimeTracker
+from database import bulk
+from database.migrations import migrate
 from datetime import datetime, timedelta
 import random
 
-def populate_time_data():
-    db = DatabaseManager()
-    tracker = TimeTracker(db)
+def populate_time_data(db_path='life_ledger.db'):
+    # One connection: make sure the schema exists, then write through the bulk path
+    conn = bulk.connect(db_path)
+    migrate(conn)
     
     print("Populating Time Logs...")
     
@@ -23,22 +24,27 @@ def populate_time_data():
     
     today = datetime.now().strftime("%Y-%m-%d")
     
+    logs = []
+    
     # 07:00 - 08:00 Gym
-    tracker.add_log("Morning Gym", "Health", today, "07:00", "08:00", 60, "Leg day")
+    logs.append(("Morning Gym", "Health", today, "07:00", "08:00", 60, "Leg day"))
     
     # 09:00 - 12:00 Work
-    tracker.add_log("Deep Work", "Work", today, "09:00", "12:00", 180, "Focused coding")
+    logs.append(("Deep Work", "Work", today, "09:00", "12:00", 180, "Focused coding"))
     
     # 13:00 - 14:00 Lunch/Social
-    tracker.add_log("Team Lunch", "Social", today, "13:00", "14:00", 60, "")
+    logs.append(("Team Lunch", "Social", today, "13:00", "14:00", 60, ""))
     
     # 14:00 - 17:00 Work
-    tracker.add_log("Meetings", "Work", today, "14:00", "17:00", 180, "")
+    logs.append(("Meetings", "Work", today, "14:00", "17:00", 180, ""))
     
     # 19:00 - 21:00 Leisure
-    tracker.add_log("Reading", "Leisure", today, "19:00", "21:00", 120, "Sci-Fi novel")
+    logs.append(("Reading", "Leisure", today, "19:00", "21:00", 120, "Sci-Fi novel"))
+
+    bulk.add_time_logs_many(conn, logs)
+    conn.close()
 
-    print("Added 5 sample logs for today.")
+    print(f"Added {len(logs)} sample logs for today.")
 
 if __name__ == "__main__":
     populate_time_data()
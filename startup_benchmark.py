@@ -0,0 +1,84 @@
+"""
+Startup benchmark for The Life Ledger.
+
+Launches main.py in a child process with -X importtime, has it quit right
+after the first frame is painted, and reports time-to-first-paint plus the
+most expensive imports. Heavy libraries that should only load when a chart or
+analysis needs them are flagged if they were imported before the first paint.
+
+    python startup_benchmark.py [runs]
+
+Results are appended to bench_output.txt; the raw importtime log of the last
+run is written to importtime.log.
+"""
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+
+HEAVY_MODULES = ("matplotlib", "pandas", "numpy", "openpyxl", "ofxparse")
+PAINT_MARKER = re.compile(r"FIRST_PAINT_MS=([0-9.]+)")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once():
+    env = dict(os.environ)
+    env["LIFE_LEDGER_EXIT_AFTER_PAINT"] = "1"
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py"],
+        capture_output=True, text=True, env=env, timeout=120,
+    )
+    match = PAINT_MARKER.search(proc.stdout)
+    if not match:
+        raise RuntimeError(f"main.py did not report a first paint:\n{proc.stdout}\n{proc.stderr[-2000:]}")
+    return float(match.group(1)), proc.stderr
+
+
+def parse_importtime(log):
+    """[(cumulative_us, module)] for top-level imports, most expensive first."""
+    imports = []
+    for line in log.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and len(match.group(3)) <= 1:
+            imports.append((int(match.group(2)), match.group(4)))
+    return sorted(imports, reverse=True)
+
+
+def main(runs=3):
+    paint_times = []
+    log = ""
+    for _ in range(runs):
+        paint_ms, log = run_once()
+        paint_times.append(paint_ms)
+
+    with open("importtime.log", "w") as f:
+        f.write(log)
+
+    imports = parse_importtime(log)
+    loaded = {module.split(".")[0] for _us, module in imports}
+    eager_heavy = [name for name in HEAVY_MODULES if name in loaded]
+
+    lines = [
+        f"== startup {datetime.now().isoformat(timespec='seconds')}",
+        f"time to first paint (ms): best {min(paint_times):.1f}, "
+        f"median {sorted(paint_times)[len(paint_times) // 2]:.1f} over {runs} runs",
+        "slowest top-level imports (cumulative ms):",
+    ]
+    lines += [f"  {us / 1000:8.1f}  {module}" for us, module in imports[:15]]
+    if eager_heavy:
+        lines.append(f"[WARN] heavy modules imported before first paint: {', '.join(eager_heavy)}")
+    else:
+        lines.append("[PASS] no heavy modules imported before first paint")
+
+    report = "\n".join(lines)
+    print(report)
+    with open("bench_output.txt", "a") as f:
+        f.write(report + "\n")
+    return not eager_heavy
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(int(sys.argv[1]) if len(sys.argv) > 1 else 3) else 1)
@@ -1,16 +1,66 @@
 import sys
-import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import QApplication
 
+
+def _database_checks():
+    """(name, fn(conn)) smoke checks, each run on its own in-memory clone."""
+    from database import (
+        aggregates, alerts, categorizer, depreciation, goal_progress, migrations,
+        networth, recurring, search, time_intervals, timeseries,
+    )
+
+    def schema(conn):
+        assert migrations.get_version(conn) == migrations.latest_version()
+
+    return [
+        ("Schema Version", schema),
+        ("Monthly Aggregates", lambda conn: aggregates.monthly_totals(conn)),
+        ("Global Search", lambda conn: search.search(conn, "purchase")),
+        ("Health Series", lambda conn: timeseries.get_series(conn, "Weight")),
+        ("Categorizer", lambda conn: categorizer.Categorizer().classify(conn, "Coffee shop")),
+        ("Depreciation", lambda conn: depreciation.total_value(conn)),
+        ("Recurring Processing", lambda conn: recurring.process_recurring(conn)),
+        ("Upcoming Alerts", lambda conn: alerts.upcoming(conn)),
+        ("Net Worth Snapshot", lambda conn: networth.take_snapshot(conn)),
+        ("Goal Progress", lambda conn: goal_progress.get_progress(conn)),
+        ("Time Heatmap", lambda conn: time_intervals.heatmap(conn)),
+    ]
+
+
+def test_database_modules():
+    """Run the database checks in parallel, each on a seeded :memory: clone."""
+    from database import fixtures
+
+    def run(check):
+        name, fn = check
+        conn = fixtures.clone(seeded=True)
+        try:
+            fn(conn)
+            return f"[PASS] {name}"
+        except Exception as e:
+            return f"[FAIL] {name}: {e}"
+        finally:
+            conn.close()
+
+    with ThreadPoolExecutor() as pool:
+        for line in pool.map(run, _database_checks()):
+            print(line)
+
 # Mock UI to prevent show() blocking
 def test_all_modules():
     print(">>> STARTING SYSTEM HEALTH CHECK <<<")
+    started = time.perf_counter()
     
     app = QApplication(sys.argv)
     
+    test_database_modules()
+    
     try:
         from database.manager import DatabaseManager
-        db = DatabaseManager('test_health.db')
+        # In memory: nothing to clean up and safe to run next to other checks
+        db = DatabaseManager(':memory:')
         print("[PASS] Database Connection")
     except Exception as e:
         print(f"[FAIL] Database Connection: {e}")
@@ -82,10 +132,7 @@ def test_all_modules():
     except ImportError as e:
         print(f"[CRITICAL FAIL] Import Error: {e}")
 
-    print(">>> CHECKS COMPLETE <<<")
-    # Clean up test db
-    if os.path.exists("test_health.db"):
-        os.remove("test_health.db")
+    print(f">>> CHECKS COMPLETE in {time.perf_counter() - started:.2f}s <<<")
 
 if __name__ == "__main__":
     test_all_modules()
@@ -0,0 +1,60 @@
+"""
+The trigger-maintained monthly totals (database.aggregates)
+"""
+from database import aggregates, fixtures
+
+
+def _from_triggers(conn):
+    return conn.execute(
+        "SELECT month, category, type, ROUND(total, 2), count FROM transaction_monthly_totals "
+        "ORDER BY month, category, type"
+    ).fetchall()
+
+
+def _from_ledger(conn):
+    return conn.execute(
+        "SELECT substr(date, 1, 7), category, type, ROUND(SUM(amount), 2), COUNT(*) FROM transactions "
+        "GROUP BY 1, 2, 3 ORDER BY 1, 2, 3"
+    ).fetchall()
+
+
+def test_totals_follow_inserts_updates_and_deletes():
+    conn = fixtures.clone()
+    rows = [
+        ("2025-01-03", 12.5, "Food", "EXPENSE", "Lunch"),
+        ("2025-01-20", 7.25, "Food", "EXPENSE", "Coffee"),
+        ("2025-01-31", 3000, "Salary", "INCOME", "Payroll"),
+        ("2025-02-02", 60, "Transport", "EXPENSE", "Train pass"),
+    ]
+    with conn:
+        conn.executemany(
+            "INSERT INTO transactions (date, amount, category, type, description) VALUES (?, ?, ?, ?, ?)", rows
+        )
+    assert _from_triggers(conn) == _from_ledger(conn)
+
+    with conn:
+        conn.execute("UPDATE transactions SET amount = 15 WHERE description = 'Lunch'")
+        conn.execute("UPDATE transactions SET date = '2025-02-01', category = 'Dining' WHERE description = 'Coffee'")
+    assert _from_triggers(conn) == _from_ledger(conn)
+
+    with conn:
+        conn.execute("DELETE FROM transactions WHERE description IN ('Train pass', 'Payroll')")
+    assert _from_triggers(conn) == _from_ledger(conn)
+    assert ("2025-02", "Transport", "EXPENSE") not in [row[:3] for row in _from_triggers(conn)]
+
+
+def test_monthly_and_category_totals_read_the_aggregates():
+    conn = fixtures.clone()
+    with conn:
+        conn.executemany(
+            "INSERT INTO transactions (date, amount, category, type, description) VALUES (?, ?, ?, ?, ?)",
+            [
+                ("2025-03-01", 40, "Food", "EXPENSE", "Groceries"),
+                ("2025-03-09", 10, "Fun", "EXPENSE", "Cinema"),
+                ("2025-03-15", 500, "Salary", "INCOME", "Payroll"),
+            ],
+        )
+    assert aggregates.monthly_totals(conn, "2025-03", "2025-03") == [
+        {"month": "2025-03", "income": 500, "expense": 50, "count": 3}
+    ]
+    assert aggregates.category_totals(conn, "2025-03") == {"Food": 40, "Fun": 10}
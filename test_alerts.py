@@ -0,0 +1,88 @@
+"""
+AlertScheduler: what fires, when, and how many alerts it reports.
+"""
+import os
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+
+from database import fixtures
+from database.alerts import AlertScheduler
+
+TODAY = date(2025, 6, 1)
+
+
+def _subscription(conn, renewal):
+    with conn:
+        conn.execute(
+            "INSERT INTO digital_subscriptions (name, category, cost, billing_cycle, next_renewal) "
+            "VALUES ('Music', 'Streaming', 10, 'Monthly', ?)",
+            (renewal,),
+        )
+
+
+def _loan(conn, due_date):
+    with conn:
+        conn.execute(
+            "INSERT INTO loans (name, type, principal_amount, current_balance, due_date) "
+            "VALUES ('Car', 'Auto', 5000, 4000, ?)",
+            (due_date,),
+        )
+
+
+def _alerts(conn):
+    return conn.execute("SELECT COUNT(*) FROM system_alerts").fetchone()[0]
+
+
+def test_fire_due_counts_only_inserted_alerts():
+    conn = fixtures.clone()
+    _subscription(conn, "2025-06-04")
+    _loan(conn, "2025-06-05")
+    _subscription(conn, "2025-09-01")  # not due for notice yet
+    scheduler = AlertScheduler()
+    scheduler.reload(conn, TODAY)
+    assert scheduler.fire_due(conn, TODAY) == 2
+    assert _alerts(conn) == 2
+    assert scheduler.next_due() == date(2025, 8, 25)
+
+    scheduler.reload(conn, TODAY)
+    assert scheduler.fire_due(conn, TODAY) == 0
+    assert _alerts(conn) == 2
+
+
+def test_items_overdue_while_closed_fire_once():
+    conn = fixtures.clone()
+    _loan(conn, "2025-05-20")
+    scheduler = AlertScheduler()
+    scheduler.reload(conn, TODAY)
+    assert scheduler.fire_due(conn, TODAY) == 1
+    message = conn.execute("SELECT message FROM system_alerts").fetchone()[0]
+    assert "12 days ago" in message
+
+    scheduler.reload(conn, TODAY)
+    assert len(scheduler) == 0
+
+
+def test_timer_writes_through_the_pool_and_evicts_cached_reads():
+    from PyQt6.QtCore import QCoreApplication
+
+    from database.pool import ConnectionPool
+    from ui.components.alert_timer import AlertTimer
+
+    QCoreApplication.instance() or QCoreApplication([])
+    path = os.path.join(tempfile.mkdtemp(), "alerts.db")
+    conn = fixtures.load_into(sqlite3.connect(path))
+    _loan(conn, (date.today() + timedelta(days=2)).isoformat())
+    conn.close()
+    pool = ConnectionPool(path, cache_size=16)
+    count = "SELECT COUNT(*) AS n FROM system_alerts"
+    assert pool.fetch_one(count)["n"] == 0
+
+    timer = AlertTimer(pool)
+    created = []
+    timer.alertsCreated.connect(created.append)
+    timer.start()
+    assert created == [1]
+    assert pool.fetch_one(count)["n"] == 1
+    timer.stop()
+    pool.close()
@@ -0,0 +1,53 @@
+"""
+The content-addressed attachment store (database.attachment_store)
+"""
+import os
+import sqlite3
+import tempfile
+
+from database import fixtures
+from database.attachment_store import DEFAULT_ROOT, BlobStore, ingest_loose_files
+
+
+def test_store_sits_beside_the_database():
+    folder = tempfile.mkdtemp()
+    store = BlobStore.for_database(os.path.join(folder, "ledger.db"))
+    assert store.root == os.path.join(folder, DEFAULT_ROOT)
+    assert os.path.isdir(store.root)
+
+
+def test_ingest_moves_shared_original_once_both_rows_point_at_blob():
+    conn = fixtures.clone()
+    folder = tempfile.mkdtemp()
+    original = os.path.join(folder, "receipt.pdf")
+    with open(original, "wb") as f:
+        f.write(b"receipt")
+    with conn:
+        for related_id in (1, 2):
+            conn.execute(
+                """INSERT INTO attachments (related_id, related_table, file_path, file_name, uploaded_at)
+                   VALUES (?, 'transactions', ?, 'receipt.pdf', '2025-01-01')""",
+                (related_id, original),
+            )
+    store = BlobStore(os.path.join(folder, DEFAULT_ROOT))
+    counts = ingest_loose_files(conn, store, remove_originals=True)
+    assert (counts["stored"], counts["deduplicated"], counts["removed"]) == (1, 1, 1)
+    assert not os.path.exists(original)
+    paths = {row[0] for row in conn.execute("SELECT file_path FROM attachments")}
+    assert len(paths) == 1 and os.path.isfile(paths.pop())
+
+
+def test_relative_paths_resolve_beside_the_database_and_originals_stay():
+    folder = tempfile.mkdtemp()
+    os.makedirs(os.path.join(folder, "scans"))
+    original = os.path.join(folder, "scans", "passport.png")
+    with open(original, "wb") as f:
+        f.write(b"scan")
+    path = os.path.join(folder, "ledger.db")
+    conn = fixtures.load_into(sqlite3.connect(path))
+    with conn:
+        conn.execute("INSERT INTO documents (name, file_path) VALUES ('Passport', 'scans/passport.png')")
+    counts = ingest_loose_files(conn, BlobStore.for_database(path))
+    assert (counts["stored"], counts["missing"], counts["removed"]) == (1, 0, 0)
+    assert os.path.isfile(original)
+    conn.close()
@@ -0,0 +1,23 @@
+"""
+Smoke test for the headless benchmark on a throwaway database.
+"""
+import os
+import tempfile
+
+import pytest
+
+
+def test_benchmark_runs_database_timings_end_to_end():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    pytest.importorskip("PyQt6.QtWidgets")
+    import benchmark
+
+    folder = tempfile.mkdtemp()
+    output = os.path.join(folder, "bench_output.txt")
+    results = benchmark.main(["--years", "1", "--repeat", "1",
+                              "--db", os.path.join(folder, "bench.db"), "--output", output])
+    database_timings = [(label, ms) for label, ms in results if label.startswith("db ")]
+    assert len(database_timings) == 5
+    assert all(ms is not None for _label, ms in database_timings)
+    with open(output) as f:
+        assert "db search 'coffee'" in f.read()
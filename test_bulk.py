@@ -0,0 +1,81 @@
+"""
+The bulk write path (database.bulk) and the seed scripts using it
+"""
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from database import bulk, fixtures, search
+
+
+def test_insert_many_streams_a_generator():
+    conn = fixtures.clone()
+    rows = ((f"2025-01-{day:02d}", 5.0, "Food", "EXPENSE", "Lunch") for day in range(1, 29))
+    assert bulk.add_transactions_many(conn, rows) == 28
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 28
+
+
+def test_failed_row_rolls_back_the_batch():
+    conn = fixtures.clone()
+    rows = [("2025-01-01", 5.0, "Food", "EXPENSE", "ok"), ("2025-01-02", 5.0, "Food", "BOGUS", "bad type")]
+    with pytest.raises(sqlite3.IntegrityError):
+        bulk.add_transactions_many(conn, rows)
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 0
+
+
+def test_bulk_insert_indexes_and_logs_the_batch_once():
+    conn = fixtures.clone()
+    before = conn.execute("SELECT value FROM ledger_meta WHERE key = 'row_change_seq'").fetchone()[0]
+    rows = [(f"2025-01-{day:02d}", 5.0, "Food", "EXPENSE", f"Gelato {day}") for day in range(1, 11)]
+    bulk.add_transactions_many(conn, rows)
+
+    assert len(search.search(conn, "gelato")) == 10
+    assert conn.execute("SELECT COUNT(*), MIN(seq), MAX(seq) FROM row_changes").fetchone() == (10, before + 1, before + 1)
+    assert conn.execute("SELECT COUNT(*) FROM ledger_meta WHERE key LIKE 'defer_row_triggers:%'").fetchone()[0] == 0
+
+
+def test_triggers_still_fire_on_other_connections_during_a_bulk_insert():
+    path = os.path.join(tempfile.mkdtemp(), "bulk.db")
+    fixtures.load_into(sqlite3.connect(path)).close()
+    conn = sqlite3.connect(path)
+    with conn:
+        with bulk.deferred_row_triggers(conn, "transactions"):
+            conn.execute(
+                "INSERT INTO transactions (date, amount, category, type, description) "
+                "VALUES ('2025-01-01', 5, 'Food', 'EXPENSE', 'Gelato')"
+            )
+            other = sqlite3.connect(path)
+            assert other.execute("SELECT COUNT(*) FROM ledger_meta WHERE key LIKE 'defer%'").fetchone()[0] == 0
+            other.close()
+    with conn:
+        conn.execute(
+            "INSERT INTO transactions (date, amount, category, type, description) "
+            "VALUES ('2025-01-02', 5, 'Food', 'EXPENSE', 'Gelato again')"
+        )
+    assert len(search.search(conn, "gelato")) == 2
+    assert conn.execute("SELECT COUNT(*) FROM row_changes").fetchone()[0] == 2
+    conn.close()
+
+
+def test_seed_scripts_create_schema_on_their_own_connection():
+    import populate_time
+
+    path = os.path.join(tempfile.mkdtemp(), "seed.db")
+    populate_time.populate_time_data(path)
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM time_logs").fetchone()[0] == 5
+    conn.close()
+
+
+def test_seeded_data_is_anchored_and_scales_every_module():
+    import populate_dummy_data
+
+    path = os.path.join(tempfile.mkdtemp(), "seed.db")
+    populate_dummy_data.main(path, scale=2, seed=1)
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT MAX(date) FROM transactions").fetchone()[0] == "2025-01-01"
+    for table, once in (("contacts", 8), ("debts", 4), ("inventory", 15), ("goals", 7), ("digital_accounts", 12)):
+        assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 2 * once
+    conn.close()
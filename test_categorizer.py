@@ -0,0 +1,62 @@
+"""
+Keyword categorization and keyword learning (database.categorizer)
+"""
+import os
+import tempfile
+
+from database import fixtures
+from database.categorizer import KeywordMatcher, learn_keywords
+from database.importer import StatementImporter
+
+
+def test_keywords_match_whole_words_only():
+    matcher = KeywordMatcher([("bar", "Dining"), ("shell", "Fuel")])
+    assert matcher.match("Bar & Grill") == "Dining"
+    assert matcher.match("POS 1234 THE BAR") == "Dining"
+    assert matcher.match("Barclays card payment") is None
+    assert matcher.match("Crowbar hardware") is None
+    assert matcher.match("SHELL-0042 fuel") == "Fuel"
+    assert matcher.match("Seashells gift shop") is None
+
+
+def test_longest_whole_word_keyword_wins():
+    matcher = KeywordMatcher([("coffee", "Dining"), ("coffee beans", "Groceries"), ("beans", "Groceries")])
+    assert matcher.match("Coffee beans 1kg") == "Groceries"
+    assert matcher.match("Coffee beanstalk") == "Dining"
+    # a longer keyword cut off mid-word must not hide a shorter one ending at the same place
+    assert KeywordMatcher([("ann", "A"), ("joann", "B")]).match("Dinner with Ann") == "A"
+
+
+def _add(conn, description, category):
+    with conn:
+        conn.execute(
+            "INSERT INTO transactions (date, amount, category, type, description) "
+            "VALUES ('2025-04-01', 9, ?, 'EXPENSE', ?)",
+            (category, description),
+        )
+
+
+def _statement(lines):
+    path = os.path.join(tempfile.mkdtemp(), "statement.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Date,Description,Amount\n")
+        for line in lines:
+            f.write(line + "\n")
+    return path
+
+
+def test_learning_skips_categories_the_importer_guessed():
+    conn = fixtures.clone()
+    with conn:
+        conn.execute("DELETE FROM category_suggestions")
+        conn.execute("INSERT INTO category_suggestions (description_keyword, suggested_category) VALUES ('gym', 'Health')")
+    StatementImporter(conn).import_file(_statement(
+        [f"2025-04-0{day},Gym Stretchy Club,-30.00" for day in range(1, 5)]
+    ))
+    assert learn_keywords(conn) == []
+
+    for description in ("Stretchy pilates", "Stretchy yoga", "Stretchy class"):
+        _add(conn, description, "Fitness")
+    with conn:
+        conn.execute("UPDATE transactions SET category = 'Fitness' WHERE description LIKE 'Gym%'")
+    assert ("stretchy", "Fitness") in learn_keywords(conn)
@@ -0,0 +1,69 @@
+"""
+ChangeBus fan-out of pool writes to the views that depend on them.
+"""
+import os
+import tempfile
+
+from database.migrations import migrate
+from database.pool import ConnectionPool
+
+
+def _bus_and_view_class():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QCoreApplication, QObject
+
+    from ui.components.change_bus import ChangeBus
+
+    class View(QObject):
+        def __init__(self, depends_on, visible=True):
+            super().__init__()
+            self.DEPENDS_ON = depends_on
+            self.visible = visible
+            self.refreshed = 0
+
+        def isVisible(self):
+            return self.visible
+
+        def refresh_data(self):
+            self.refreshed += 1
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    return app, ChangeBus(window_ms=10_000), View
+
+
+def test_pool_writes_reach_only_dependent_views_once_per_burst():
+    app, bus, View = _bus_and_view_class()
+    pool = ConnectionPool(os.path.join(tempfile.mkdtemp(), "bus.db"))
+    migrate(pool.writer)
+    bus.connect_pool(pool)
+    batches = []
+    bus.tablesChanged.connect(batches.append)
+    # goal_progress is only written by goal_logs triggers
+    goals, finance, hidden_goals = View(["goal_progress"]), View(["transactions"]), View(["goals"], visible=False)
+    for view in (goals, finance, hidden_goals):
+        bus.register_view(view)
+
+    goal_id = pool.execute("INSERT INTO goals (name, type, target_value) VALUES ('Read', 'HABIT', 10)")
+    for day in (1, 2, 3):
+        pool.execute("INSERT INTO goal_logs (goal_id, value, date) VALUES (?, 1, ?)", (goal_id, f"2025-01-0{day}"))
+    app.processEvents()
+    bus.flush()
+
+    assert len(batches) == 1 and {"goals", "goal_logs", "goal_progress"} <= batches[0]
+    assert "transactions" not in batches[0]
+    assert (goals.refreshed, finance.refreshed, hidden_goals.refreshed) == (1, 0, 0)
+    assert bus.is_stale(hidden_goals)
+    assert bus.refresh_if_stale(hidden_goals)
+    assert hidden_goals.refreshed == 1 and not bus.is_stale(hidden_goals)
+    pool.close()
+
+
+def test_unknown_writes_refresh_every_view():
+    app, bus, View = _bus_and_view_class()
+    views = [View(["transactions"]), View([])]
+    for view in views:
+        bus.register_view(view)
+    bus.publish(None)
+    app.processEvents()
+    bus.flush()
+    assert [view.refreshed for view in views] == [1, 1]
@@ -0,0 +1,41 @@
+"""
+ChartCanvas in-place updates and deferred redraws.
+"""
+import os
+
+
+def _canvas():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    from ui.components.chart_canvas import ChartCanvas
+
+    app = QApplication.instance() or QApplication([])
+    return app, ChartCanvas()
+
+
+def test_series_updates_reuse_their_artists():
+    _app, canvas = _canvas()
+    line = canvas.set_line("spend", [1, 2, 3], [10, 20, 30])
+    assert canvas.set_line("spend", [1, 2, 3], [5, 5, 5]) is line
+    assert len(canvas.ax.lines) == 1 and list(line.get_ydata()) == [5, 5, 5]
+
+    bars = canvas.set_bars("budget", ["Food", "Rent"], [100, 900])
+    assert canvas.set_bars("budget", ["Food", "Rent"], [150, 900]) is bars
+    assert [rect.get_height() for rect in bars.patches] == [150, 900]
+    rebuilt = canvas.set_bars("budget", ["Food", "Rent", "Fun"], [1, 2, 3])
+    assert rebuilt is not bars and len(canvas.ax.patches) == 3
+
+
+def test_hidden_chart_redraws_once_when_shown():
+    app, canvas = _canvas()
+    canvas.set_line("weight", [1, 2], [75, 74])
+    assert canvas.refresh() is False and canvas.is_dirty()
+    assert canvas.draw_count == 0
+
+    canvas.show()
+    app.processEvents()
+    assert not canvas.is_dirty()
+    assert canvas.draw_count == 1
+    assert canvas.refresh() is False  # nothing changed since
+    canvas.close()
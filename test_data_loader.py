@@ -0,0 +1,52 @@
+"""
+DataLoader request superseding.
+"""
+import os
+import threading
+
+
+def _loader():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QCoreApplication
+
+    from ui.components.data_loader import DataLoader
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    return app, DataLoader(max_threads=1)
+
+
+def test_newer_request_supersedes_running_and_queued_ones():
+    app, loader = _loader()
+    started, release = threading.Event(), threading.Event()
+    delivered = []
+
+    def slow(value):
+        started.set()
+        release.wait(5)
+        return value
+
+    loader.request("view", slow, "stale", on_result=delivered.append)
+    assert started.wait(5)
+    loader.request("view", lambda: "queued", on_result=delivered.append)
+    loader.request("view", lambda: "fresh", on_result=delivered.append)
+    release.set()
+    loader.wait()
+    app.processEvents()
+    assert delivered == ["fresh"]
+    assert not loader.is_loading("view")
+
+
+def test_errors_and_other_keys_are_delivered_independently():
+    app, loader = _loader()
+    results, errors = [], []
+
+    def broken():
+        raise ValueError("bad query")
+
+    loader.request("budget", broken, on_result=results.append, on_error=errors.append)
+    loader.request("goals", sum, [1, 2, 3], on_result=results.append)
+    loader.cancel("never")
+    loader.wait()
+    app.processEvents()
+    assert results == [6]
+    assert len(errors) == 1 and "ValueError: bad query" in errors[0]
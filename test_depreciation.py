@@ -0,0 +1,38 @@
+"""
+Read-time inventory depreciation (database.depreciation)
+"""
+from database import depreciation, fixtures
+
+
+def _inventory(conn):
+    conn.executemany(
+        "INSERT INTO inventory (name, purchase_price, current_value, purchase_date, category) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("Laptop", 1000.0, 1000.0, "2024-01-01", "Electronics"),
+            ("Heirloom", None, 500.0, None, "Jewelry"),
+        ],
+    )
+
+
+def test_depreciates_from_purchase_price():
+    conn = fixtures.clone()
+    _inventory(conn)
+    values = {row["name"]: row["value"] for row in depreciation.items_with_values(conn, "2025-01-01")}
+    assert 790 < values["Laptop"] < 810
+    assert values["Heirloom"] == 500.0
+
+
+def test_unpriced_items_count_at_current_value():
+    conn = fixtures.clone()
+    _inventory(conn)
+    laptop = depreciation.total_value(conn, "2025-01-01", category="Electronics")
+    assert depreciation.total_value(conn, "2025-01-01") == laptop + 500.0
+
+
+def test_store_leaves_unpriced_items_alone():
+    conn = fixtures.clone()
+    _inventory(conn)
+    assert depreciation.store_current_values(conn, "2025-01-01") == 1
+    stored = dict(conn.execute("SELECT name, current_value FROM inventory"))
+    assert stored["Heirloom"] == 500.0
+    assert stored["Laptop"] < 1000.0
@@ -0,0 +1,43 @@
+"""
+Query timing and the slow-query log (database.diagnostics).
+"""
+import json
+import os
+import tempfile
+
+from database.diagnostics import QueryStats, normalize_sql
+from database.migrations import migrate
+from database.pool import ConnectionPool
+
+
+def test_pool_statements_are_grouped_and_slow_ones_keep_their_plan():
+    stats = QueryStats(slow_ms=0)
+    pool = ConnectionPool(os.path.join(tempfile.mkdtemp(), "diag.db"), stats=stats)
+    migrate(pool.writer)
+    for month in ("2025-01", "2025-02"):
+        pool.fetch_all(
+            "SELECT *   FROM transactions\n WHERE date BETWEEN ? AND ?", (f"{month}-01", f"{month}-31")
+        )
+    by_sql = {row["sql"]: row for row in stats.statements()}
+    entry = by_sql["SELECT * FROM transactions WHERE date BETWEEN ? AND ?"]
+    assert entry["count"] == 2
+    slow = [row for row in stats.slow_queries() if row["sql"] == entry["sql"]]
+    assert any("idx_transactions_date" in step for step in slow[0]["plan"])
+    pool.close()
+
+
+def test_fast_statements_stay_out_of_the_slow_log():
+    stats = QueryStats(slow_ms=1000)
+    stats.record("SELECT 1", 0.5, rows=1)
+    with stats.time_view("GoalView"):
+        pass
+    assert stats.slow_queries() == []
+    assert stats.statements()[0]["avg_ms"] == 0.5
+    path = stats.export_json(os.path.join(tempfile.mkdtemp(), "diag.json"))
+    with open(path) as f:
+        snapshot = json.load(f)
+    assert [row["view"] for row in snapshot["views"]] == ["GoalView"]
+
+
+def test_normalize_sql_collapses_whitespace():
+    assert normalize_sql("  SELECT *\n\tFROM goals  ") == "SELECT * FROM goals"
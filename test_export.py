@@ -0,0 +1,50 @@
+"""
+Incremental exports and the row change log (database.export)
+"""
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from database import fixtures
+from database.export import Exporter, main
+
+
+def _spend(conn, description):
+    with conn:
+        conn.execute(
+            "INSERT INTO transactions (date, amount, category, type, description) "
+            "VALUES ('2025-01-01', 5, 'Food', 'EXPENSE', ?)",
+            (description,),
+        )
+
+
+def _changes(conn):
+    return conn.execute("SELECT COUNT(*) FROM row_changes").fetchone()[0]
+
+
+def test_change_log_pruned_past_every_named_export():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "export.db")
+    conn = fixtures.load_into(sqlite3.connect(path))
+    exporter = Exporter(path, tables=["transactions"], fmt="csv", workers=1)
+    for description in ("Lunch", "Coffee"):
+        _spend(conn, description)
+    exporter.export(os.path.join(folder, "a1"), name="accountant")
+    assert _changes(conn) == 0
+
+    _spend(conn, "Dinner")
+    exporter.export(os.path.join(folder, "b1"), name="backup")
+    assert _changes(conn) == 1  # 'accountant' has not seen Dinner yet
+
+    result = exporter.export(os.path.join(folder, "a2"), name="accountant")
+    assert result["transactions"][1] == 1
+    assert _changes(conn) == 0
+    conn.close()
+
+
+def test_single_workbook_rejects_csv():
+    with pytest.raises(SystemExit) as excinfo:
+        main(["ledger.db", "out.xlsx", "--single", "--format", "csv"])
+    assert excinfo.value.code == 2
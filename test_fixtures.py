@@ -0,0 +1,29 @@
+"""
+In-memory template databases (database.fixtures).
+"""
+import sqlite3
+
+from database import fixtures
+from database.migrations import get_version, latest_version
+
+
+def test_clones_are_migrated_and_independent():
+    first, second = fixtures.clone(), fixtures.clone()
+    assert get_version(first) == latest_version()
+    with first:
+        first.execute("INSERT INTO budgets (category, monthly_limit) VALUES ('Food', 100)")
+    assert second.execute("SELECT COUNT(*) FROM budgets").fetchone()[0] == 0
+    assert first.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_seeded_clone_is_deterministic_and_restored_from_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(fixtures, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(fixtures, "_templates", {})
+    query = "SELECT COUNT(*), ROUND(SUM(amount), 2) FROM transactions"
+    built = fixtures.clone(seeded=True).execute(query).fetchone()
+    assert built[0] > 0
+    assert [path.name for path in tmp_path.iterdir()] == [f"seeded-v{latest_version()}-{fixtures.SEED}.db"]
+
+    monkeypatch.setattr(fixtures, "_templates", {})
+    restored = fixtures.load_into(sqlite3.connect(":memory:"), seeded=True)
+    assert restored.execute(query).fetchone() == built
@@ -0,0 +1,68 @@
+"""
+Cached goal progress and streaks (database.goal_progress)
+"""
+import os
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+
+from database import fixtures, goal_progress
+from database.pool import ConnectionPool
+
+
+def _day(offset):
+    return (date.today() - timedelta(days=offset)).isoformat()
+
+
+def _goal(conn, current_value=0):
+    with conn:
+        return conn.execute(
+            "INSERT INTO goals (name, type, target_value, current_value) VALUES ('Read', 'HABIT', 30, ?)",
+            (current_value,),
+        ).lastrowid
+
+
+def _log(conn, goal_id, offset, value=1):
+    with conn:
+        conn.execute("INSERT INTO goal_logs (goal_id, value, date) VALUES (?, ?, ?)", (goal_id, value, _day(offset)))
+
+
+def test_out_of_order_log_refreshed_on_pool_writer():
+    path = os.path.join(tempfile.mkdtemp(), "goals.db")
+    fixtures.load_into(sqlite3.connect(path)).close()
+    pool = ConnectionPool(path)
+    goal_progress.refresh_after_writes(pool)
+    goal_id = pool.execute("INSERT INTO goals (name, type, target_value) VALUES ('Read', 'HABIT', 30)")
+    for offset in (0, 2):
+        pool.execute("INSERT INTO goal_logs (goal_id, value, date) VALUES (?, 1, ?)", (goal_id, _day(offset)))
+    pool.execute("INSERT INTO goal_logs (goal_id, value, date) VALUES (?, 1, ?)", (goal_id, _day(1)))
+    row = pool.fetch_one("SELECT current_streak, longest_streak FROM goals_progress WHERE id = ?", (goal_id,))
+    assert (row["current_streak"], row["longest_streak"]) == (3, 3)
+    pool.close()
+
+
+def test_get_progress_is_read_only():
+    path = os.path.join(tempfile.mkdtemp(), "goals.db")
+    conn = fixtures.load_into(sqlite3.connect(path))
+    goal_id = _goal(conn)
+    for offset in (0, 2, 1):
+        _log(conn, goal_id, offset)
+    conn.close()
+    reader = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    progress = goal_progress.get_progress(reader, goal_id)[0]
+    assert (progress["current_streak"], progress["longest_streak"]) == (3, 3)
+    assert reader.execute("SELECT dirty FROM goal_progress").fetchone()[0] == 1
+    reader.close()
+
+
+def test_current_value_follows_logs_and_edits():
+    conn = fixtures.clone()
+    goal_id = _goal(conn, current_value=5)
+    _log(conn, goal_id, 0, value=2)
+    assert conn.execute("SELECT current_value FROM goals").fetchone()[0] == 7
+    with conn:
+        conn.execute("UPDATE goals SET current_value = 10 WHERE id = ?", (goal_id,))
+    _log(conn, goal_id, 0, value=1)
+    assert goal_progress.get_progress(conn, goal_id)[0]["progress_value"] == 11
+    assert conn.execute("SELECT current_value FROM goals").fetchone()[0] == 11
+    assert goal_progress.check(conn) == []
@@ -0,0 +1,56 @@
+"""
+Statement import de-duplication (database.importer)
+"""
+import os
+import tempfile
+
+from database import fixtures
+from database.importer import StatementImporter
+
+
+def _statement(lines):
+    path = os.path.join(tempfile.mkdtemp(), "statement.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Date,Description,Amount\n")
+        for line in lines:
+            f.write(line + "\n")
+    return path
+
+
+def _add(conn, day, amount, description):
+    with conn:
+        conn.execute(
+            "INSERT INTO transactions (date, amount, category, type, description) VALUES (?, ?, 'Food', 'EXPENSE', ?)",
+            (day, amount, description),
+        )
+
+
+def test_hand_entered_transaction_is_a_duplicate():
+    conn = fixtures.clone()
+    _add(conn, "2025-04-01", 12.0, "Lunch spot")
+    state = StatementImporter(conn).import_file(_statement([
+        "2025-04-01,Lunch spot,-12.00",
+        "2025-04-02,Bakery,-4.50",
+    ]))
+    assert (state["inserted"], state["duplicates"]) == (1, 1)
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 2
+
+
+def test_identical_rows_counted_by_occurrence():
+    conn = fixtures.clone()
+    _add(conn, "2025-04-01", 3.0, "Coffee")
+    _add(conn, "2025-04-01", 3.0, "Coffee")
+    state = StatementImporter(conn).import_file(_statement(["2025-04-01,Coffee,-3.00"] * 3))
+    assert (state["inserted"], state["duplicates"]) == (1, 2)
+
+
+def test_edited_import_still_recognised():
+    conn = fixtures.clone()
+    StatementImporter(conn).import_file(_statement(["2025-04-01,POS 1234 GROCER,-40.00"]))
+    with conn:
+        conn.execute("UPDATE transactions SET description = 'Groceries'")
+    state = StatementImporter(conn).import_file(_statement([
+        "2025-04-01,POS 1234 GROCER,-40.00",
+        "2025-04-01,Groceries,-40.00",
+    ]))
+    assert (state["inserted"], state["duplicates"]) == (0, 2)
@@ -0,0 +1,78 @@
+"""
+LazyStackedWidget page construction.
+"""
+import os
+import sys
+import tempfile
+
+
+def _app():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def test_pages_are_imported_and_built_on_first_show():
+    app = _app()
+    from ui.components.lazy_stack import LazyStackedWidget
+
+    folder = tempfile.mkdtemp()
+    with open(os.path.join(folder, "lazy_page_view.py"), "w") as f:
+        f.write(
+            "from PyQt6.QtWidgets import QLabel\n"
+            "class PageView(QLabel):\n"
+            "    pass\n"
+        )
+    sys.path.insert(0, folder)
+    try:
+        built = []
+        stack = LazyStackedWidget("ledger")
+        stack.add_lazy_view("page", "lazy_page_view:PageView")
+        stack.add_lazy_view("other", built.append)
+        assert stack.count() == 2 and stack.views() == {}
+        assert "lazy_page_view" not in sys.modules
+
+        page = stack.show_view("page")
+        assert page.text() == "ledger" and stack.currentWidget() is page
+        assert stack.show_view("page") is page
+        assert built == [] and stack.count() == 2
+        app.processEvents()
+    finally:
+        sys.path.remove(folder)
+        sys.modules.pop("lazy_page_view", None)
+
+
+def test_stale_view_refreshed_and_timed_when_shown():
+    app = _app()
+    from PyQt6.QtWidgets import QWidget
+
+    from database.diagnostics import QueryStats
+    from ui.components.change_bus import ChangeBus
+    from ui.components.lazy_stack import LazyStackedWidget
+
+    class FinanceView(QWidget):
+        DEPENDS_ON = ("transactions",)
+
+        def __init__(self):
+            super().__init__()
+            self.loads = 0
+
+        def refresh_data(self):
+            self.loads += 1
+
+    stats, bus = QueryStats(slow_ms=1000), ChangeBus(window_ms=10_000)
+    stack = LazyStackedWidget(stats=stats, bus=bus)
+    stack.add_lazy_view("finance", FinanceView)
+    stack.add_lazy_view("goals", QWidget)
+    view = stack.ensure_view("finance")
+    stack.show_view("goals")
+
+    bus.publish(["transactions"])
+    app.processEvents()
+    bus.flush()
+    assert view.loads == 0 and bus.is_stale(view)
+
+    stack.show_view("finance")
+    assert view.loads == 1
+    assert {row["view"] for row in stats.views()} == {"finance (build)", "goals (build)", "finance"}
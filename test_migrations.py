@@ -0,0 +1,44 @@
+"""
+Versioned schema migrations (database.migrations).
+"""
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from database import migrations
+
+
+def test_fresh_database_reaches_latest_version_once():
+    path = os.path.join(tempfile.mkdtemp(), "fresh.db")
+    conn = sqlite3.connect(path)
+    assert migrations.migrate(conn) == [version for version, _d, _f in migrations.MIGRATIONS]
+    assert migrations.get_version(conn) == migrations.latest_version()
+    mtime = os.path.getmtime(path)
+    assert migrations.migrate(conn) == []
+    assert os.path.getmtime(path) == mtime
+    conn.close()
+
+
+def test_failed_step_rolls_back_and_keeps_the_version(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    migrations.migrate(conn)
+    latest = migrations.latest_version()
+
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        raise sqlite3.OperationalError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [(latest + 1, "Broken", broken)])
+    with pytest.raises(sqlite3.OperationalError):
+        migrations.migrate(conn)
+    assert migrations.get_version(conn) == latest
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'half_done'").fetchone()[0] == 0
+
+
+def test_hot_queries_use_indexes():
+    conn = sqlite3.connect(":memory:")
+    migrations.migrate(conn)
+    for name, plan in migrations.explain_hot_queries(conn).items():
+        assert any("USING INDEX" in step for step in plan), (name, plan)
@@ -0,0 +1,56 @@
+"""
+Change-only net-worth snapshots (database.networth)
+"""
+import os
+import sqlite3
+import tempfile
+
+from database import fixtures, networth
+
+
+def _asset(conn, value):
+    with conn:
+        conn.execute("INSERT INTO financial_assets (name, type, value) VALUES ('Checking', 'Bank', ?)", (value,))
+
+
+def test_snapshot_written_only_on_change():
+    conn = fixtures.clone()
+    _asset(conn, 1000.0)
+    assert networth.take_snapshot(conn, "2025-01-01")
+    assert not networth.take_snapshot(conn, "2025-01-02")
+    _asset(conn, 250.0)
+    assert networth.take_snapshot(conn, "2025-01-03")
+    assert networth.snapshot_at(conn, "2025-01-02")["net_worth"] == 1000.0
+    assert networth.snapshot_at(conn, "2025-01-05")["net_worth"] == 1250.0
+
+
+def test_unpriced_inventory_counts_at_current_value():
+    conn = fixtures.clone()
+    with conn:
+        conn.execute("INSERT INTO inventory (name, current_value, category) VALUES ('Heirloom', 500, 'Jewelry')")
+    assert networth.component_values(conn, "2025-01-01")["inventory"] == 500.0
+
+
+def test_recorder_snapshots_after_published_writes():
+    from PyQt6.QtCore import QCoreApplication
+
+    from database.pool import ConnectionPool
+    from ui.components.change_bus import ChangeBus
+    from ui.components.networth_recorder import NetWorthRecorder
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    path = os.path.join(tempfile.mkdtemp(), "networth.db")
+    fixtures.load_into(sqlite3.connect(path)).close()
+    pool = ConnectionPool(path, cache_size=16)
+    bus = ChangeBus()
+    bus.connect_pool(pool)
+    recorder = NetWorthRecorder(pool, bus)
+    latest = "SELECT net_worth FROM net_worth_snapshots ORDER BY date DESC LIMIT 1"
+    assert pool.fetch_one(latest) is None
+
+    pool.execute("INSERT INTO financial_assets (name, type, value) VALUES ('Checking', 'Bank', 300)")
+    app.processEvents()
+    bus.flush()
+    assert pool.fetch_one(latest)["net_worth"] == 300.0  # the cached empty result was evicted
+    recorder.stop()
+    pool.close()
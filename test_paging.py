@@ -0,0 +1,49 @@
+"""
+Keyset pagination (database.paging)
+"""
+from database import fixtures
+from database.paging import KeysetQuery
+
+
+def _fitness_logs():
+    conn = fixtures.clone()
+    conn.row_factory = lambda cursor, row: dict(zip([d[0] for d in cursor.description], row))
+    with conn:
+        conn.executemany(
+            "INSERT INTO fitness_logs (date, activity_type, duration_min, distance_km) VALUES (?, 'Run', 30, ?)",
+            [(f"2025-01-{i % 28 + 1:02d}", None if i % 2 else float(i % 7)) for i in range(50)],
+        )
+    return conn
+
+
+def _walk(conn, query, page_size=7):
+    rows, key = [], None
+    while True:
+        sql, params = query.page_sql(key, page_size)
+        page = conn.execute(sql, params).fetchall()
+        if not page:
+            return rows
+        rows.extend(page)
+        key = query.key_of(page[-1])
+
+
+def test_pages_cover_null_sort_values():
+    conn = _fitness_logs()
+    for descending in (True, False):
+        query = KeysetQuery("fitness_logs", sort_column="distance_km", descending=descending)
+        rows = _walk(conn, query)
+        assert len(rows) == 50
+        assert len({row["id"] for row in rows}) == 50
+        values = [row["distance_km"] for row in rows]
+        assert values[25:] == [None] * 25
+        assert values[:25] == sorted(values[:25], reverse=descending)
+
+
+def test_jump_key_matches_walk():
+    conn = _fitness_logs()
+    query = KeysetQuery("fitness_logs", sort_column="distance_km")
+    rows = _walk(conn, query)
+    for offset in (3, 24, 25, 40):
+        sql, params = query.key_at_sql(offset)
+        key = conn.execute(sql, params).fetchone()
+        assert (key["sort_value"], key["id"]) == query.key_of(rows[offset])
@@ -0,0 +1,58 @@
+"""
+WAL connection pool (database.pool).
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+from database.migrations import migrate
+from database.pool import ConnectionPool
+
+
+def _pool():
+    pool = ConnectionPool(os.path.join(tempfile.mkdtemp(), "pool.db"))
+    migrate(pool.writer)
+    return pool
+
+
+def test_writer_runs_in_wal_and_readers_are_read_only():
+    pool = _pool()
+    assert pool.writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with pytest.raises(sqlite3.OperationalError):
+        pool.reader().execute("DELETE FROM transactions")
+    pool.close()
+
+
+def test_each_thread_gets_its_own_reader():
+    pool = _pool()
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(pool.reader()))
+    worker.start()
+    worker.join()
+    assert seen[0] is not pool.reader()
+    assert pool.reader() is pool.reader()
+    pool.close()
+
+
+def test_reads_proceed_while_a_write_transaction_is_open():
+    pool = _pool()
+    pool.execute("INSERT INTO budgets (category, monthly_limit) VALUES ('Food', 100)")
+    with pool.write_transaction(["budgets"]) as conn:
+        conn.execute("UPDATE budgets SET monthly_limit = 250")
+        # readers see the last committed snapshot instead of waiting for the lock
+        assert pool.fetch_one("SELECT monthly_limit FROM budgets")["monthly_limit"] == 100
+    assert pool.fetch_one("SELECT monthly_limit FROM budgets")["monthly_limit"] == 250
+    pool.close()
+
+
+def test_failed_write_transaction_rolls_back():
+    pool = _pool()
+    with pytest.raises(RuntimeError):
+        with pool.write_transaction(["budgets"]) as conn:
+            conn.execute("INSERT INTO budgets (category, monthly_limit) VALUES ('Food', 100)")
+            raise RuntimeError("form validation failed")
+    assert pool.fetch_all("SELECT * FROM budgets") == []
+    pool.close()
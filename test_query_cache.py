@@ -0,0 +1,115 @@
+"""
+The pooled result cache (database.cache, database.pool)
+"""
+import os
+import tempfile
+import threading
+
+from database.cache import QueryCache, tables_read
+from database.migrations import migrate
+from database.pool import ConnectionPool
+
+
+def _pool():
+    # Migrated after construction, the way db_stress_check.py sets it up
+    pool = ConnectionPool(os.path.join(tempfile.mkdtemp(), "cache.db"), cache_size=64)
+    migrate(pool.writer)
+    return pool
+
+
+def _add_transaction(pool, category="Food", amount=10.0):
+    pool.execute(
+        "INSERT INTO transactions (date, amount, category, type, description) VALUES (?, ?, ?, 'EXPENSE', '')",
+        ("2025-01-15", amount, category),
+    )
+
+
+def test_trigger_tables_invalidated_after_late_migrate():
+    pool = _pool()
+    query = "SELECT SUM(total) AS total FROM transaction_monthly_totals"
+    assert pool.fetch_one(query)["total"] is None
+    _add_transaction(pool)
+    assert pool.fetch_one(query)["total"] == 10.0
+    pool.close()
+
+
+def test_views_expand_to_base_tables():
+    pool = _pool()
+    query = "SELECT COUNT(*) AS n FROM goals_progress"
+    assert pool.fetch_one(query)["n"] == 0
+    pool.execute("INSERT INTO goals (name, type, target_value) VALUES ('Run', 'HABIT', 10)")
+    assert pool.fetch_one(query)["n"] == 1
+    pool.close()
+
+
+def test_view_over_a_trigger_maintained_table_invalidated():
+    pool = _pool()
+    goal_id = pool.execute("INSERT INTO goals (name, type, target_value) VALUES ('Read', 'HABIT', 10)")
+    query = "SELECT log_total FROM goals_progress WHERE id = ?"
+    assert pool.fetch_one(query, (goal_id,))["log_total"] == 0
+    # goal_logs is not read by the query: only its triggers reach goal_progress under the view
+    pool.execute("INSERT INTO goal_logs (goal_id, value, date) VALUES (?, 3, '2025-01-15')", (goal_id,))
+    assert pool.fetch_one(query, (goal_id,))["log_total"] == 3
+    pool.close()
+
+
+def test_invalidation_follows_trigger_and_view_dependencies():
+    cache = QueryCache()
+    cache.set_dependencies({"logs": {"summary"}}, {"report": {"summary", "names"}})
+    key = QueryCache.make_key("SELECT * FROM report", ())
+    cache.put(key, [{"n": 1}])
+    cache.invalidate("unrelated")
+    assert cache.get(key) == [{"n": 1}]
+    cache.invalidate("logs")
+    assert cache.get(key) is None
+
+
+def test_comma_join_invalidated():
+    pool = _pool()
+    query = "SELECT t.id FROM transactions t, budgets b WHERE b.category = t.category"
+    assert pool.fetch_all(query) == []
+    _add_transaction(pool)
+    assert pool.fetch_all(query) == []
+    pool.execute("INSERT INTO budgets (category, monthly_limit) VALUES ('Food', 100)")
+    assert len(pool.fetch_all(query)) == 1
+    pool.close()
+
+
+def test_named_params_keyed_by_value():
+    pool = _pool()
+    _add_transaction(pool, "Food", 1.0)
+    _add_transaction(pool, "Rent", 2.0)
+    query = "SELECT SUM(amount) AS total FROM transactions WHERE category = :c"
+    assert pool.fetch_one(query, {"c": "Food"})["total"] == 1.0
+    assert pool.fetch_one(query, {"c": "Rent"})["total"] == 2.0
+    pool.close()
+
+
+def test_unattributable_reads_not_cached():
+    assert tables_read('SELECT * FROM "transactions"') is None
+    assert tables_read("SELECT * FROM main.transactions") is None
+    assert tables_read("SELECT * FROM a x, b AS y JOIN c ON c.id = x.id") == {"a", "b", "c"}
+    assert tables_read("WITH m AS (SELECT * FROM a) SELECT * FROM m") == {"a"}
+    pool = _pool()
+    pool.fetch_all("SELECT * FROM json_each('[1, 2]')")
+    assert pool.cache_stats()["entries"] == 0
+    pool.close()
+
+
+def test_rows_read_across_an_invalidation_are_not_cached():
+    cache = QueryCache()
+    key = QueryCache.make_key("SELECT * FROM transactions", ())
+    stamp = cache.stamp(key[0])
+    cache.invalidate("transactions")
+    cache.put(key, [{"id": 1}], stamp)
+    assert cache.get(key) is None
+    assert cache.stats()["discarded"] == 1
+
+
+def test_reader_closed_when_thread_exits():
+    pool = _pool()
+    worker = threading.Thread(target=pool.fetch_all, args=("SELECT 1 FROM transactions",))
+    worker.start()
+    worker.join()
+    assert pool._readers == []
+    pool.close()
@@ -0,0 +1,52 @@
+"""
+The recurring transaction catch-up (database.recurring)
+"""
+import os
+import sqlite3
+import tempfile
+from datetime import date
+
+import pytest
+
+from database import fixtures, recurring
+
+
+def _rule(conn, name, frequency, start_date="2025-01-01"):
+    with conn:
+        conn.execute(
+            """INSERT INTO recurring_transactions (name, amount, category, type, frequency, start_date)
+               VALUES (?, 10, 'Bills', 'EXPENSE', ?, ?)""",
+            (name, frequency, start_date),
+        )
+
+
+def test_unknown_frequency_is_skipped_not_fatal():
+    conn = fixtures.clone()
+    _rule(conn, "Mystery", "fortnightly-ish")
+    _rule(conn, "Rent", "monthly")
+    result = recurring.process_recurring(conn, date(2025, 3, 1))
+    assert result == {"transactions": 3, "rules": 1, "skipped": 1}
+    assert recurring.process_recurring(conn, date(2025, 3, 1))["transactions"] == 0
+
+
+def test_rules_are_read_under_the_write_lock():
+    path = os.path.join(tempfile.mkdtemp(), "recurring.db")
+    conn = fixtures.load_into(sqlite3.connect(path))
+    _rule(conn, "Rent", "monthly")
+    other = sqlite3.connect(path, timeout=0)
+    plan_catch_up = recurring.plan_catch_up
+
+    def racing(rules, today=None, skipped=None):
+        # A second run starting while the first is planning must wait for it
+        with pytest.raises(sqlite3.OperationalError):
+            recurring.process_recurring(other, today)
+        return plan_catch_up(rules, today, skipped)
+
+    recurring.plan_catch_up = racing
+    try:
+        assert recurring.process_recurring(conn, date(2025, 3, 1))["transactions"] == 3
+    finally:
+        recurring.plan_catch_up = plan_catch_up
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 3
+    other.close()
+    conn.close()
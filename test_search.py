@@ -0,0 +1,47 @@
+"""
+Global full-text search (database.search, ui.components.global_search)
+"""
+import os
+import sqlite3
+import tempfile
+
+from database import fixtures, search
+
+
+def _note(conn, title, content):
+    with conn:
+        conn.execute("INSERT INTO notes (title, content) VALUES (?, ?)", (title, content))
+
+
+def test_snippet_falls_back_to_title_when_only_title_matched():
+    conn = fixtures.clone()
+    _note(conn, "Passport renewal", "Bring two photos and the old one")
+    _note(conn, "Groceries", "Renewal of the cheese subscription")
+    by_title = {m["title"]: m["snippet"] for m in search.search(conn, "renewal")}
+    assert by_title["Passport renewal"] == "Passport [renewal]"
+    assert "[Renewal]" in by_title["Groceries"]
+
+
+def test_search_box_queries_off_the_ui_thread():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    from database.pool import ConnectionPool
+    from ui.components.data_loader import DataLoader
+    from ui.components.global_search import GlobalSearchBox
+
+    app = QApplication.instance() or QApplication([])
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    conn = fixtures.load_into(sqlite3.connect(path))
+    _note(conn, "Passport renewal", "Bring two photos")
+    conn.close()
+    pool = ConnectionPool(path)
+    loader = DataLoader()
+    box = GlobalSearchBox(pool, loader=loader)
+    box.input.setText("passport")
+    box.run_search()
+    assert box.results.count() == 0  # nothing painted until the worker reports back
+    loader.wait()
+    app.processEvents()
+    assert box.results.count() == 1
+    pool.close()
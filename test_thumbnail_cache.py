@@ -0,0 +1,29 @@
+"""
+ThumbnailCache disk accounting.
+"""
+import os
+import tempfile
+
+
+def test_regenerated_thumbnail_replaces_its_bytes():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QCoreApplication
+    from PyQt6.QtGui import QColor, QImage
+
+    from ui.components.thumbnail_cache import ThumbnailCache
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    folder = tempfile.mkdtemp()
+    source = os.path.join(folder, "scan.png")
+    image = QImage(640, 480, QImage.Format.Format_RGB32)
+    image.fill(QColor("white"))
+    image.save(source, "PNG")
+
+    cache = ThumbnailCache(cache_dir=os.path.join(folder, "thumbs"))
+    with open(cache.cache_path("abc"), "wb") as f:
+        f.write(b"\0" * 5000)   # unreadable leftover: regenerated over the same file
+    cache = ThumbnailCache(cache_dir=cache.cache_dir)
+    assert cache.thumbnail("abc", source) is None
+    cache.wait()
+    app.processEvents()
+    assert cache._disk_bytes == os.path.getsize(cache.cache_path("abc"))
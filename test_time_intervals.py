@@ -0,0 +1,75 @@
+"""
+The time log interval index and rollups (database.time_intervals)
+"""
+import random
+
+from database import fixtures, time_intervals
+
+
+def _log(conn, day, start, end, category="Work"):
+    with conn:
+        return conn.execute(
+            "INSERT INTO time_logs (activity, category, date, start_time, end_time) VALUES ('Task', ?, ?, ?, ?)",
+            (category, day, start, end),
+        ).lastrowid
+
+
+def _rollups(conn):
+    return {
+        table: sorted(conn.execute(f"SELECT * FROM {table}").fetchall())
+        for table in ("time_rollup_hourly", "time_rollup_daily", "time_rollup_weekhour")
+    }
+
+
+def test_zero_length_log_is_empty():
+    conn = fixtures.clone()
+    _log(conn, "2025-03-03", "09:00", "09:00")
+    assert time_intervals.overlapping(conn, "2025-03-02", "2025-03-05") == []
+    assert time_intervals.category_totals(conn) == {}
+    assert sum(map(sum, time_intervals.heatmap(conn))) == 0
+
+
+def test_overnight_log_spans_midnight():
+    conn = fixtures.clone()
+    _log(conn, "2025-03-03", "23:00", "01:00")
+    totals = time_intervals.daily_totals(conn, "2025-03-03", "2025-03-04")
+    assert totals == [("2025-03-03", "Work", 60.0), ("2025-03-04", "Work", 60.0)]
+
+
+def test_deleted_and_recategorised_logs_leave_no_rows():
+    conn = fixtures.clone()
+    log_id = _log(conn, "2025-03-03", "09:00", "10:30")
+    with conn:
+        conn.execute("UPDATE time_logs SET category = 'Study' WHERE id = ?", (log_id,))
+    assert {row[2] for row in _rollups(conn)["time_rollup_weekhour"]} == {"Study"}
+    with conn:
+        conn.execute("DELETE FROM time_logs WHERE id = ?", (log_id,))
+    assert _rollups(conn) == {table: [] for table in _rollups(conn)}
+
+
+def test_incremental_rollups_match_rebuild():
+    conn = fixtures.clone()
+    rng = random.Random(7)
+    ids = []
+    for _ in range(300):
+        day = f"2025-03-{rng.randint(1, 14):02d}"
+        start = f"{rng.randint(0, 23):02d}:{rng.choice(['00', '15', '30', '45'])}"
+        end = f"{rng.randint(0, 23):02d}:{rng.choice(['00', '15', '30', '45'])}"
+        action = rng.random()
+        if ids and action < 0.2:
+            with conn:
+                conn.execute("DELETE FROM time_logs WHERE id = ?", (ids.pop(rng.randrange(len(ids))),))
+        elif ids and action < 0.4:
+            with conn:
+                conn.execute("UPDATE time_logs SET end_time = ?, category = ? WHERE id = ?",
+                             (end, rng.choice(["Work", "Study"]), rng.choice(ids)))
+        else:
+            ids.append(_log(conn, day, start, end, rng.choice(["Work", "Study", "Rest"])))
+    incremental = _rollups(conn)
+    time_intervals.rebuild(conn)
+    rebuilt = _rollups(conn)
+    for table, rows in rebuilt.items():
+        assert len(rows) == len(incremental[table])
+        for got, want in zip(incremental[table], rows):
+            for a, b in zip(got, want):
+                assert abs(a - b) < 1e-6 if isinstance(b, float) else a == b
@@ -0,0 +1,29 @@
+"""
+Typed health series and chart downsampling (database.timeseries)
+"""
+from database import fixtures, timeseries
+
+
+def _metrics(conn, rows):
+    with conn:
+        conn.executemany("INSERT INTO health_metrics (date, type, value) VALUES (?, ?, ?)", rows)
+
+
+def test_non_numeric_readings_are_left_out():
+    conn = fixtures.clone()
+    _metrics(conn, [("2025-02-01", "Mood", "n/a"), ("2025-02-02", "Mood", 7),
+                    ("2025-02-01", "Blood Pressure", "120/80"), ("2025-02-02", "Blood Pressure", "?/80")])
+    assert timeseries.get_series(conn, "Mood") == [("2025-02-02", 7.0)]
+    assert timeseries.get_series(conn, "Blood Pressure", "systolic") == [("2025-02-01", 120.0)]
+    assert len(timeseries.get_series(conn, "Blood Pressure", "diastolic")) == 2
+
+
+def test_minmax_keeps_row_dates_within_max_points():
+    conn = fixtures.clone()
+    _metrics(conn, [(f"2025-01-{day:02d}", "Weight", 70 + (day - 1) * 7 % 5) for day in range(1, 31)])
+    points = timeseries.get_series(conn, "Weight", max_points=6, method="minmax")
+    assert len(points) <= 6
+    assert points == sorted(points)
+    stored = set(conn.execute("SELECT date, value FROM health_series WHERE type = 'Weight'").fetchall())
+    assert set(points) <= stored
+    assert {value for _date, value in points} == {70.0, 74.0}
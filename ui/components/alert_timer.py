@@ -0,0 +1,67 @@
+"""
+Qt driver for database.alerts.AlertScheduler.
+
+A single-shot QTimer is armed for the day the earliest pending alert fires
+(capped at a few hours so sleep/resume and date changes are picked up)
+instead of polling every source table. Alerts are written through the
+ConnectionPool's writer, so they take the writer lock, evict cached reads of
+system_alerts and reach the pool's write listeners (a ChangeBus connected
+with connect_pool() then refreshes the dashboard). When a ChangeBus is given,
+writes to any table feeding upcoming_items rebuild the heap.
+"""
+from datetime import date, datetime, time, timedelta
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from database.alerts import SOURCES, AlertScheduler
+
+
+WATCHED_TABLES = frozenset([source[0] for source in SOURCES] + ["contacts"])
+MAX_SLEEP_MS = 4 * 60 * 60 * 1000
+
+
+class AlertTimer(QObject):
+    alertsCreated = pyqtSignal(int)
+
+    def __init__(self, pool, bus=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.bus = bus
+        self.scheduler = AlertScheduler()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.check)
+        if bus is not None:
+            bus.tablesChanged.connect(self._on_tables_changed)
+
+    def start(self):
+        self.scheduler.reload(self.pool.reader())
+        self.check()
+
+    def check(self):
+        """Fire everything due today, then sleep until the next deadline."""
+        if self.scheduler.has_due():
+            with self.pool.write_transaction(["system_alerts"]) as conn:
+                created = self.scheduler.fire_due(conn, in_transaction=True)
+            if created:
+                self.alertsCreated.emit(created)
+        self._arm()
+
+    def _arm(self):
+        next_due = self.scheduler.next_due()
+        if next_due is None:
+            self._timer.stop()
+            return
+        fire_at = datetime.combine(max(next_due, date.today()), time.min)
+        wait_ms = int((fire_at - datetime.now()) / timedelta(milliseconds=1))
+        self._timer.start(min(max(wait_ms, 0), MAX_SLEEP_MS))
+
+    def _on_tables_changed(self, tables):
+        if tables is None or tables & WATCHED_TABLES:
+            self.scheduler.reload(self.pool.reader())
+            self.check()
+
+    def stop(self):
+        self._timer.stop()
+        if self.bus is not None:
+            self.bus.tablesChanged.disconnect(self._on_tables_changed)
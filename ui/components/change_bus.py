@@ -0,0 +1,124 @@
+"""
+Table-level change notifications for views.
+
+Every committed write publishes the set of tables it changed (see
+ConnectionPool.add_write_listener). The bus collects those sets for a short
+window and then emits one tablesChanged with their union, so a burst of
+writes (an import, a form saving several rows) costs a single refresh.
+
+Views declare the tables they show in a DEPENDS_ON class attribute and are
+registered with the bus. Only views depending on a changed table are
+refreshed; hidden ones are just marked stale and refreshed when shown again,
+so adding a fitness log never re-runs finance or digital-life queries.
+"""
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+
+class ChangeBus(QObject):
+    tablesChanged = pyqtSignal(object)   # frozenset of table names, or None for "everything"
+    _published = pyqtSignal(object)
+
+    def __init__(self, parent=None, window_ms=50):
+        super().__init__(parent)
+        self._pending = set()
+        self._everything = False
+        self._views = {}    # view -> frozenset of tables (empty = refresh on any change)
+        self._stale = set()
+        self.refreshes = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(window_ms)
+        self._timer.timeout.connect(self._flush)
+        # Writes can commit on worker threads: hop to the bus' thread first
+        self._published.connect(self._collect, Qt.ConnectionType.QueuedConnection)
+
+    # ----- publishing -----
+
+    def publish(self, tables):
+        """Thread-safe. `tables` is an iterable of names, or None for everything."""
+        self._published.emit(None if tables is None else frozenset(t.lower() for t in tables))
+
+    def connect_pool(self, pool):
+        pool.add_write_listener(self.publish)
+
+    def _collect(self, tables):
+        if tables is None:
+            self._everything = True
+        else:
+            self._pending.update(tables)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Deliver pending changes now instead of waiting for the window."""
+        self._timer.stop()
+        self._flush()
+
+    def _flush(self):
+        if not self._pending and not self._everything:
+            return
+        changed = None if self._everything else frozenset(self._pending)
+        self._pending = set()
+        self._everything = False
+        self.tablesChanged.emit(changed)
+        for view, depends_on in list(self._views.items()):
+            if changed is None or not depends_on or depends_on & changed:
+                self._refresh_or_mark(view)
+
+    # ----- views -----
+
+    def register_view(self, view, tables=None):
+        """
+        Refresh `view` when one of `tables` (default: view.DEPENDS_ON) changes.
+        Views declaring nothing are refreshed on every change.
+        """
+        depends_on = tables if tables is not None else getattr(view, "DEPENDS_ON", ())
+        self._views[view] = frozenset(t.lower() for t in depends_on)
+        view.destroyed.connect(lambda _obj=None, v=view: self.unregister_view(v))
+
+    def unregister_view(self, view):
+        self._views.pop(view, None)
+        self._stale.discard(view)
+
+    def is_stale(self, view):
+        return view in self._stale
+
+    def refresh_if_stale(self, view, refresh=None):
+        """
+        Call when a view becomes visible; returns True if it was refreshed.
+        `refresh` overrides the view's own refresh_data/load_data.
+        """
+        if view not in self._stale:
+            return False
+        if refresh is not None:
+            self._stale.discard(view)
+            self.refreshes += 1
+            refresh()
+        else:
+            self._refresh(view)
+        return True
+
+    def _refresh_or_mark(self, view):
+        if view.isVisible():
+            self._refresh(view)
+        else:
+            self._stale.add(view)
+
+    def _refresh(self, view):
+        self._stale.discard(view)
+        refresh = getattr(view, "refresh_data", None) or getattr(view, "load_data", None)
+        if refresh is not None:
+            self.refreshes += 1
+            refresh()
+
+
+_shared = None
+
+
+def shared_bus():
+    """The application-wide bus; create it after the QApplication."""
+    global _shared
+    if _shared is None:
+        _shared = ChangeBus()
+    return _shared
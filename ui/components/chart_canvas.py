@@ -0,0 +1,136 @@
+"""
+Reusable matplotlib canvas for dashboard and insight charts.
+
+The figure and axes are created once per chart. Refreshing a view updates the
+existing artists' data in place (line data, bar heights) instead of clearing
+and rebuilding the figure, and redraws are skipped while the chart's tab is
+hidden: the chart is marked dirty and drawn when it is next shown.
+
+Hover crosshairs are drawn with blitting: the static background is cached
+after each full draw and only the overlay artists are repainted on mouse move.
+"""
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+
+class ChartCanvas(FigureCanvasQTAgg):
+    def __init__(self, parent=None, width=5, height=3, dpi=100, facecolor=None):
+        self.figure = Figure(figsize=(width, height), dpi=dpi, facecolor=facecolor)
+        super().__init__(self.figure)
+        self.setParent(parent)
+        self.ax = self.figure.add_subplot(111)
+        self._lines = {}
+        self._bars = {}
+        self._dirty = False
+        self._background = None
+        self._overlay = []
+        self._crosshair = None
+        self.draw_count = 0
+        self.mpl_connect("draw_event", self._on_draw)
+
+    # ----- data updates -----
+
+    def set_line(self, key, xs, ys, **style):
+        """Create the line `key` on first use, afterwards only swap its data."""
+        line = self._lines.get(key)
+        if line is None:
+            (line,) = self.ax.plot(xs, ys, **style)
+            self._lines[key] = line
+        else:
+            line.set_data(xs, ys)
+        self._dirty = True
+        return line
+
+    def set_bars(self, key, labels, heights, **style):
+        """
+        Bar series `key`. Heights are updated in place while the bar count
+        stays the same; a different count rebuilds just this series.
+        """
+        container = self._bars.get(key)
+        labels = list(labels)
+        heights = list(heights)
+        if container is not None and len(container.patches) == len(heights):
+            for rect, height in zip(container.patches, heights):
+                rect.set_height(height)
+        else:
+            if container is not None:
+                container.remove()
+            container = self.ax.bar(range(len(heights)), heights, **style)
+            self._bars[key] = container
+        self.ax.set_xticks(range(len(labels)))
+        self.ax.set_xticklabels(labels)
+        self._dirty = True
+        return container
+
+    def remove_series(self, key):
+        line = self._lines.pop(key, None)
+        if line is not None:
+            line.remove()
+        bars = self._bars.pop(key, None)
+        if bars is not None:
+            bars.remove()
+        self._dirty = True
+
+    # ----- redraw -----
+
+    def refresh(self, force=False):
+        """
+        Rescale and redraw if something changed. Hidden charts only stay
+        marked dirty and are drawn on their next showEvent.
+        """
+        if not self._dirty and not force:
+            return False
+        if not self.isVisible() and not force:
+            return False
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.draw_idle()
+        self._dirty = False
+        return True
+
+    def is_dirty(self):
+        return self._dirty
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._dirty:
+            self.refresh()
+
+    # ----- blitted overlays -----
+
+    def enable_crosshair(self, color="#888888"):
+        """Vertical hover line drawn with blitting instead of full redraws."""
+        if self._crosshair is not None:
+            return
+        self._crosshair = self.ax.axvline(0, color=color, linewidth=0.8, animated=True, visible=False)
+        self._overlay.append(self._crosshair)
+        self.mpl_connect("motion_notify_event", self._on_motion)
+        self.mpl_connect("axes_leave_event", self._on_leave)
+
+    def _on_draw(self, _event):
+        self.draw_count += 1
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        for artist in self._overlay:
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+
+    def _blit_overlay(self):
+        if self._background is None:
+            return
+        self.restore_region(self._background)
+        for artist in self._overlay:
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+        self.blit(self.figure.bbox)
+
+    def _on_motion(self, event):
+        if event.inaxes is not self.ax or self._crosshair is None:
+            return
+        self._crosshair.set_xdata([event.xdata, event.xdata])
+        self._crosshair.set_visible(True)
+        self._blit_overlay()
+
+    def _on_leave(self, _event):
+        if self._crosshair is not None and self._crosshair.get_visible():
+            self._crosshair.set_visible(False)
+            self._blit_overlay()
@@ -0,0 +1,128 @@
+"""
+Background data loading for views.
+
+Views hand their query/aggregation function to the shared DataLoader under a
+key (usually the view name). The function runs on a QThreadPool worker and the
+result comes back through a Qt signal on the main thread, where the view fills
+its widgets. Issuing a new request for the same key supersedes the previous
+one: a queued task is pulled from the pool and a running one has its result
+dropped, so switching tabs or filters quickly never paints stale data.
+
+Loader functions must not touch widgets; they should only query and compute.
+"""
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(str, int, object)
+    failed = pyqtSignal(str, int, str)
+
+
+class _LoadTask(QRunnable):
+    def __init__(self, key, generation, fn, args, kwargs, signals, loader):
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals
+        self.loader = loader
+        self.setAutoDelete(False)
+
+    def is_current(self):
+        return self.loader.generation(self.key) == self.generation
+
+    def run(self):
+        if not self.is_current():
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception:
+            self.signals.failed.emit(self.key, self.generation, traceback.format_exc())
+        else:
+            self.signals.finished.emit(self.key, self.generation, result)
+
+
+class DataLoader(QObject):
+    """Runs view loaders off the main thread, one live request per key."""
+
+    loaded = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, max_threads=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._generations = {}
+        self._tasks = {}
+        self._callbacks = {}
+        self._signals = _TaskSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def generation(self, key):
+        return self._generations.get(key, 0)
+
+    def request(self, key, fn, *args, on_result=None, on_error=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the background for `key`.
+
+        on_result(result) / on_error(traceback_str) are called on the main
+        thread, only if no newer request for the same key was made meanwhile.
+        """
+        self.cancel(key)
+        generation = self.generation(key) + 1
+        self._generations[key] = generation
+        self._callbacks[key] = (on_result, on_error)
+        task = _LoadTask(key, generation, fn, args, kwargs, self._signals, self)
+        self._tasks[key] = task
+        self.pool.start(task)
+        return generation
+
+    def cancel(self, key):
+        """Drop any pending or running request for `key`."""
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            self.pool.tryTake(task)
+        self._callbacks.pop(key, None)
+        self._generations[key] = self.generation(key) + 1
+
+    def is_loading(self, key):
+        return key in self._tasks
+
+    def wait(self, msecs=-1):
+        """Block until all queued work is done (tests and headless scripts)."""
+        return self.pool.waitForDone(msecs)
+
+    def _on_finished(self, key, generation, result):
+        if generation != self.generation(key):
+            return
+        self._tasks.pop(key, None)
+        on_result, _on_error = self._callbacks.pop(key, (None, None))
+        if on_result is not None:
+            on_result(result)
+        self.loaded.emit(key, result)
+
+    def _on_failed(self, key, generation, error):
+        if generation != self.generation(key):
+            return
+        self._tasks.pop(key, None)
+        _on_result, on_error = self._callbacks.pop(key, (None, None))
+        if on_error is not None:
+            on_error(error)
+        self.failed.emit(key, error)
+
+
+_shared_loader = None
+
+
+def shared_loader():
+    """The application-wide loader, created on first use on the main thread."""
+    global _shared_loader
+    if _shared_loader is None:
+        _shared_loader = DataLoader()
+    return _shared_loader
@@ -0,0 +1,105 @@
+"""
+Diagnostics section for SettingsView.
+
+Shows the shared QueryStats: view refresh times, the most expensive
+statements and the slow-query log with each captured query plan. The slow
+threshold can be changed live and everything can be exported as JSON.
+"""
+from PyQt6.QtWidgets import (
+    QDoubleSpinBox, QFileDialog, QGroupBox, QHBoxLayout, QLabel, QPlainTextEdit,
+    QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout,
+)
+
+from database.diagnostics import shared_stats
+
+
+def _fill(table, headers, rows):
+    table.clear()
+    table.setColumnCount(len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.setRowCount(len(rows))
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            text = f"{value:.1f}" if isinstance(value, float) else str(value)
+            table.setItem(r, c, QTableWidgetItem(text))
+    table.resizeColumnsToContents()
+
+
+class DiagnosticsPanel(QGroupBox):
+    def __init__(self, stats=None, parent=None, statement_limit=50):
+        super().__init__("Diagnostics", parent)
+        self.stats = stats or shared_stats()
+        self.statement_limit = statement_limit
+
+        self.threshold = QDoubleSpinBox()
+        self.threshold.setRange(1, 10000)
+        self.threshold.setSuffix(" ms")
+        self.threshold.setValue(self.stats.slow_ms)
+        self.threshold.valueChanged.connect(self._set_threshold)
+
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self._reset)
+        export_btn = QPushButton("Export JSON...")
+        export_btn.clicked.connect(self.export)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Slow query threshold:"))
+        controls.addWidget(self.threshold)
+        controls.addStretch()
+        controls.addWidget(refresh_btn)
+        controls.addWidget(reset_btn)
+        controls.addWidget(export_btn)
+
+        self.views_table = QTableWidget()
+        self.statements_table = QTableWidget()
+        self.slow_table = QTableWidget()
+        self.slow_table.itemSelectionChanged.connect(self._show_plan)
+        self.plan = QPlainTextEdit()
+        self.plan.setReadOnly(True)
+        self.plan.setMaximumHeight(100)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(controls)
+        layout.addWidget(QLabel("View refreshes"))
+        layout.addWidget(self.views_table)
+        layout.addWidget(QLabel("Statements"))
+        layout.addWidget(self.statements_table)
+        layout.addWidget(QLabel("Slow queries"))
+        layout.addWidget(self.slow_table)
+        layout.addWidget(self.plan)
+
+        self._slow = []
+        self.refresh()
+
+    def refresh(self):
+        _fill(self.views_table, ["View", "Last ms", "Avg ms", "Max ms", "Count"], [
+            (v["view"], v["last_ms"], v["avg_ms"], v["max_ms"], v["count"]) for v in self.stats.views()
+        ])
+        _fill(self.statements_table, ["SQL", "Count", "Total ms", "Avg ms", "Max ms", "Rows"], [
+            (s["sql"], s["count"], s["total_ms"], s["avg_ms"], s["max_ms"], s["rows"])
+            for s in self.stats.statements(limit=self.statement_limit)
+        ])
+        self._slow = list(reversed(self.stats.slow_queries()))
+        _fill(self.slow_table, ["At", "ms", "Rows", "SQL"], [
+            (q["at"], q["ms"], q["rows"], q["sql"]) for q in self._slow
+        ])
+        self.plan.clear()
+
+    def _show_plan(self):
+        row = self.slow_table.currentRow()
+        if 0 <= row < len(self._slow):
+            self.plan.setPlainText("\n".join(self._slow[row]["plan"]) or "(no plan captured)")
+
+    def _set_threshold(self, value):
+        self.stats.slow_ms = value
+
+    def _reset(self):
+        self.stats.reset()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Diagnostics", "diagnostics.json", "JSON (*.json)")
+        if path:
+            self.stats.export_json(path)
@@ -0,0 +1,79 @@
+"""
+Global search box.
+
+A line edit with a results list underneath. Typing is debounced and each
+query goes through database.search, so results cover every indexed table.
+Queries run on the shared DataLoader, so a slow search never blocks typing,
+and a newer query supersedes one still in flight. `db` is therefore used
+from worker threads: pass a ConnectionPool (one reader per thread).
+Activating a result emits resultActivated(source_table, source_id) for the
+main window to navigate to the right view and row.
+"""
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout, QWidget
+
+from database.search import search
+from ui.components.data_loader import shared_loader
+
+
+SOURCE_LABELS = {
+    "transactions": "Transaction",
+    "notes": "Note",
+    "contacts": "Contact",
+    "books": "Book",
+    "recipes": "Recipe",
+    "documents": "Document",
+    "digital_accounts": "Account",
+}
+
+
+class GlobalSearchBox(QWidget):
+    resultActivated = pyqtSignal(str, int)
+
+    def __init__(self, db, parent=None, limit=30, debounce_ms=150, loader=None):
+        super().__init__(parent)
+        self.db = db
+        self.limit = limit
+        self.loader = loader or shared_loader()
+        self._load_key = f"global_search:{id(self)}"
+
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("Search everything...")
+        self.input.setClearButtonEnabled(True)
+        self.results = QListWidget()
+        self.results.hide()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.input)
+        layout.addWidget(self.results)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.run_search)
+        self.input.textChanged.connect(self._timer.start)
+        self.input.returnPressed.connect(self.run_search)
+        self.results.itemActivated.connect(self._on_activated)
+
+    def run_search(self):
+        text = self.input.text().strip()
+        if not text:
+            self.loader.cancel(self._load_key)
+            self._show_results([])
+            return
+        self.loader.request(self._load_key, search, self.db, text, limit=self.limit,
+                            on_result=self._show_results, on_error=lambda _error: self._show_results([]))
+
+    def _show_results(self, matches):
+        self.results.clear()
+        for match in matches:
+            label = SOURCE_LABELS.get(match["source_table"], match["source_table"])
+            item = QListWidgetItem(f"{label}: {match['title']}\n{match['snippet']}")
+            item.setData(Qt.ItemDataRole.UserRole, (match["source_table"], match["source_id"]))
+            self.results.addItem(item)
+        self.results.setVisible(self.results.count() > 0)
+
+    def _on_activated(self, item):
+        source_table, source_id = item.data(Qt.ItemDataRole.UserRole)
+        self.resultActivated.emit(source_table, source_id)
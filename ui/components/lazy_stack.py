@@ -0,0 +1,97 @@
+"""
+Stacked widget that builds its pages on first navigation.
+
+MainWindow registers each view by name with the dotted path of its class
+("ui.views.finance_view:FinanceView") instead of an instance. The module is
+imported and the view constructed only when the page is first shown, so
+startup does not pay for every view's imports (matplotlib, pandas, numpy)
+before the first frame.
+
+With a diagnostics.QueryStats as `stats`, building a view and every
+refresh_view() are recorded as view refresh timings. With a ChangeBus as
+`bus`, built views are registered for change notifications and a view made
+stale while hidden is refreshed when it is shown.
+"""
+import importlib
+
+from PyQt6.QtWidgets import QStackedWidget, QWidget
+
+
+def load_class(path):
+    """Import 'package.module:ClassName' and return the class."""
+    module_name, _, class_name = path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+class LazyStackedWidget(QStackedWidget):
+    """QStackedWidget whose pages are created the first time they are shown."""
+
+    def __init__(self, *view_args, parent=None, stats=None, bus=None):
+        super().__init__(parent)
+        self._view_args = view_args      # e.g. (db,) passed to every view
+        self.stats = stats
+        self.bus = bus
+        self._factories = {}
+        self._placeholders = {}
+        self._views = {}
+
+    def add_lazy_view(self, name, factory):
+        """
+        Register a page. `factory` is a dotted 'module:Class' path or a callable
+        taking the view args; either way nothing is built until show_view().
+        """
+        placeholder = QWidget()
+        self._factories[name] = factory
+        self._placeholders[name] = placeholder
+        self.addWidget(placeholder)
+
+    def view(self, name):
+        """The constructed view, or None if it has not been shown yet."""
+        return self._views.get(name)
+
+    def views(self):
+        return dict(self._views)
+
+    def ensure_view(self, name):
+        view = self._views.get(name)
+        if view is not None:
+            return view
+
+        factory = self._factories[name]
+        if isinstance(factory, str):
+            factory = load_class(factory)
+        if self.stats is not None:
+            with self.stats.time_view(f"{name} (build)"):
+                view = factory(*self._view_args)
+        else:
+            view = factory(*self._view_args)
+
+        placeholder = self._placeholders.pop(name)
+        index = self.indexOf(placeholder)
+        self.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.insertWidget(index, view)
+        self._views[name] = view
+        if self.bus is not None:
+            self.bus.register_view(view)
+        return view
+
+    def refresh_view(self, name):
+        """Reload a built view's data through refresh_data() or load_data()."""
+        view = self._views.get(name)
+        refresh = getattr(view, "refresh_data", None) or getattr(view, "load_data", None)
+        if refresh is None:
+            return
+        if self.stats is not None:
+            with self.stats.time_view(name):
+                refresh()
+        else:
+            refresh()
+
+    def show_view(self, name):
+        view = self.ensure_view(name)
+        self.setCurrentWidget(view)
+        if self.bus is not None:
+            self.bus.refresh_if_stale(view, lambda: self.refresh_view(name))
+        return view
@@ -0,0 +1,44 @@
+"""
+Qt driver for database.networth.take_snapshot.
+
+Listens on a ChangeBus and records a net-worth snapshot whenever a write to
+one of networth.WATCHED_TABLES is published, so the history grows as values
+change instead of on a schedule. The bus already coalesces bursts (an
+import, a form saving several rows) into one notification, and the check
+runs on the pool's reader, so the writer lock is only taken when some
+component actually moved. Snapshots are written through the ConnectionPool,
+which evicts cached net_worth_snapshots reads and notifies its write
+listeners (the bus, when connected with connect_pool()).
+"""
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from database.networth import WATCHED_TABLES, snapshot_due, take_snapshot
+
+
+class NetWorthRecorder(QObject):
+    snapshotTaken = pyqtSignal()
+
+    def __init__(self, pool, bus, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.bus = bus
+        bus.tablesChanged.connect(self._on_tables_changed)
+
+    def start(self):
+        """Record today's values once, e.g. right after startup."""
+        self.record()
+
+    def record(self):
+        if not snapshot_due(self.pool.reader()):
+            return
+        with self.pool.write_transaction(["net_worth_snapshots"]) as conn:
+            taken = take_snapshot(conn, in_transaction=True)
+        if taken:
+            self.snapshotTaken.emit()
+
+    def _on_tables_changed(self, tables):
+        if tables is None or tables & WATCHED_TABLES:
+            self.record()
+
+    def stop(self):
+        self.bus.tablesChanged.disconnect(self._on_tables_changed)
@@ -0,0 +1,133 @@
+"""
+Virtualized table model over a ledger table.
+
+KeysetTableModel only knows the total row count up front. Rows are fetched
+in pages when the view asks for them, using keyset pagination on
+(sort column, id), and at most `max_pages` pages are kept in memory. Sorting
+and filtering are pushed down to SQLite, so a decade of transactions scrolls
+like a month's worth.
+
+Works with any table described in database.paging.TABLES (transactions,
+health_metrics, fitness_logs, time_logs) given a ConnectionPool.
+"""
+from collections import OrderedDict
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from database.paging import KeysetQuery
+
+
+class KeysetTableModel(QAbstractTableModel):
+    def __init__(self, pool, table, headers=None, page_size=200, max_pages=8, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.table = table
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._query = KeysetQuery(table)
+        self._headers = headers or [c.replace("_", " ").title() for c in self._query.columns]
+        self._filters = {}
+        self._row_count = 0
+        self._pages = OrderedDict()   # page index -> list of row dicts
+        self._page_keys = {0: None}   # page index -> key of the last row before it
+        self.reload()
+
+    # ----- configuration -----
+
+    def set_filters(self, equals=None, date_from=None, date_to=None, search=None):
+        """Replace the active filters; everything is evaluated in SQLite."""
+        self._filters = {
+            "equals": equals, "date_from": date_from, "date_to": date_to, "search": search,
+        }
+        self._rebuild_query(self._query.sort_column, self._query.descending)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not 0 <= column < len(self._query.columns):
+            return
+        self._rebuild_query(
+            self._query.columns[column], order == Qt.SortOrder.DescendingOrder
+        )
+
+    def _rebuild_query(self, sort_column, descending):
+        self._query = KeysetQuery(
+            self.table, columns=self._query.columns, sort_column=sort_column,
+            descending=descending, **{k: v for k, v in self._filters.items() if v},
+        )
+        self.reload()
+
+    def reload(self):
+        """Drop cached pages and re-count; call after writes to the table."""
+        self.beginResetModel()
+        sql, params = self._query.count_sql()
+        self._row_count = self.pool.fetch_one(sql, params)["n"]
+        self._pages.clear()
+        self._page_keys = {0: None}
+        self.endResetModel()
+
+    # ----- paging -----
+
+    def _key_before(self, page):
+        if page in self._page_keys:
+            return self._page_keys[page]
+        # Jumped ahead (scrollbar drag): look up the boundary key directly
+        # instead of walking every page in between.
+        sql, params = self._query.key_at_sql(page * self.page_size - 1)
+        row = self.pool.fetch_one(sql, params)
+        key = (row["sort_value"], row["id"]) if row else None
+        self._page_keys[page] = key
+        return key
+
+    def _page(self, page):
+        rows = self._pages.get(page)
+        if rows is not None:
+            self._pages.move_to_end(page)
+            return rows
+        sql, params = self._query.page_sql(self._key_before(page), self.page_size)
+        rows = self.pool.fetch_all(sql, params)
+        if rows:
+            self._page_keys[page + 1] = self._query.key_of(rows[-1])
+        self._pages[page] = rows
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+    def row(self, row):
+        """The row dict at `row`, fetching its page if needed."""
+        page, offset = divmod(row, self.page_size)
+        rows = self._page(page)
+        return rows[offset] if offset < len(rows) else None
+
+    # ----- QAbstractTableModel -----
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._query.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.row(index.row())
+        if record is None:
+            return None
+        value = record[self._query.columns[index.column()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if isinstance(value, float):
+                return f"{value:,.2f}"
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            return value
+        if role == Qt.ItemDataRole.TextAlignmentRole and isinstance(value, (int, float)):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal and section < len(self._headers):
+            return self._headers[section]
+        return None
+
+    def cached_pages(self):
+        return len(self._pages)
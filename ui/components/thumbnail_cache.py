@@ -0,0 +1,146 @@
+"""
+Lazy thumbnails for attachments and document scans.
+
+thumbnail() answers from an in-memory LRU or the on-disk cache when it can
+and otherwise returns None and queues the image on a background QThreadPool.
+Workers decode straight to thumbnail size with QImageReader.setScaledSize,
+which lets JPEG skip most of the full-size decode, save the result in the
+disk cache and announce it with thumbnailReady(key, QImage). The vault and
+receipt views can therefore show a list of thousands of scans immediately
+and fill in pictures as they arrive.
+
+Thumbnails are keyed by blob digest (see database.attachment_store), so
+duplicated uploads share one thumbnail. The disk cache is trimmed to
+max_bytes, least recently used first.
+"""
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QRunnable, Qt, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader
+
+
+DEFAULT_CACHE_DIR = "thumbnail_cache"
+DEFAULT_SIZE = 160
+
+
+class _Signals(QObject):
+    done = pyqtSignal(str, object, object)   # key, image or None, change in cache bytes
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, key, source_path, cache_path, size, signals):
+        super().__init__()
+        self.key = key
+        self.source_path = source_path
+        self.cache_path = cache_path
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        reader = QImageReader(self.source_path)
+        reader.setAutoTransform(True)
+        original = reader.size()
+        if original.isValid():
+            reader.setScaledSize(original.scaled(self.size, self.size, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            self.signals.done.emit(self.key, None, 0)
+            return
+        # A regenerated thumbnail replaces the old file: only the difference counts
+        old_size = os.path.getsize(self.cache_path) if os.path.exists(self.cache_path) else 0
+        tmp = self.cache_path + ".part"
+        if not image.save(tmp, "PNG"):
+            self.signals.done.emit(self.key, image, 0)
+            return
+        os.replace(tmp, self.cache_path)
+        self.signals.done.emit(self.key, image, os.path.getsize(self.cache_path) - old_size)
+
+
+class ThumbnailCache(QObject):
+    thumbnailReady = pyqtSignal(str, QImage)
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, size=DEFAULT_SIZE, max_bytes=200 * 1024 * 1024,
+                 memory_items=500, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.size = size
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._signals = _Signals()
+        self._signals.done.connect(self._on_done)
+        self._memory = OrderedDict()
+        self._pending = set()
+        self._failed = set()
+        self._disk_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(cache_dir) if entry.name.endswith(".png")
+        )
+
+    def cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}_{self.size}.png")
+
+    def thumbnail(self, key, source_path):
+        """
+        The thumbnail for `key` if it is available now, else None; in that
+        case it is generated in the background and thumbnailReady follows.
+        """
+        image = self._memory.get(key)
+        if image is not None:
+            self._memory.move_to_end(key)
+            return image
+        cached = self.cache_path(key)
+        if os.path.exists(cached):
+            image = QImage(cached)
+            if not image.isNull():
+                os.utime(cached)   # mtime doubles as the disk LRU clock
+                self._remember(key, image)
+                return image
+        if key not in self._pending and key not in self._failed and source_path:
+            self._pending.add(key)
+            self.pool.start(_ThumbnailTask(key, source_path, cached, self.size, self._signals))
+        return None
+
+    def prefetch(self, items):
+        """Queue thumbnails for [(key, source_path)], e.g. the rows about to scroll in."""
+        for key, source_path in items:
+            self.thumbnail(key, source_path)
+
+    def _remember(self, key, image):
+        self._memory[key] = image
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _on_done(self, key, image, added_bytes):
+        self._pending.discard(key)
+        if image is None:
+            self._failed.add(key)   # not an image (PDF, corrupt scan): don't retry every paint
+            return
+        self._remember(key, image)
+        self._disk_bytes += added_bytes
+        if self._disk_bytes > self.max_bytes:
+            self.trim()
+        self.thumbnailReady.emit(key, image)
+
+    def trim(self):
+        """Delete least recently used thumbnails until the cache fits max_bytes."""
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".png")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        total = sum(entry.stat().st_size for entry in entries)
+        target = self.max_bytes * 0.9   # leave headroom so every new thumbnail doesn't trim again
+        for entry in entries:
+            if total <= target:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+        self._disk_bytes = total
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)